@@ -0,0 +1,491 @@
+# ALMACEN_HISTORIAL.PY - HISTORIAL PERSISTENTE DE CÁLCULOS EN SQLITE
+#
+# Guarda cada cálculo (de la interfaz gráfica o de un lote) en una base SQLite
+# en modo WAL, con índices por proyecto, usuario, fecha, tipo de equipo y
+# cumplimiento de la caída de tensión. La comparten calculosint (historial de
+# la sesión) e historial.HistorialVentana (consulta de cálculos guardados).
+# Se guardan los mismos campos que historial_compacto.EntradaHistorial; los
+# textos largos se regeneran al leer, salvo las advertencias, que se guardan
+# para la búsqueda de texto. La búsqueda usa un índice FTS5 (calculos_fts) sobre
+# proyecto, cliente, tipo de equipo, calibre, advertencias y notas, que se
+# actualiza en la misma transacción; si SQLite no tiene FTS5 se busca con LIKE.
+
+import os
+import sqlite3
+from collections import Counter
+from collections.abc import Sequence
+from datetime import datetime
+from itertools import islice
+
+from historial_compacto import EntradaHistorial
+from motor_calculo import ResultadoCalculo
+from tablas_nom import REGISTRO
+
+# Campos de EntradaHistorial guardados como columnas (en el orden de su constructor)
+CAMPOS_ENTRADA = (
+    'tipo_circuito', 'tipo_carga', 'valor_potencia', 'unidad_potencia', 'corriente', 'corriente_para_proteccion',
+    'corriente_interruptor', 'voltaje', 'calibre', 'material', 'longitud', 'num_conductores', 'canalizacion', 'z',
+    'factor_potencia', 'tipo_equipo', 'caida_v', 'caida_p', 'ampacidad_calibre', 'corriente_por_conductor_final',
+    'temp_conductor', 'fuente_tabla', 'tipo_instalacion', 'calibre_tierra', 'eficiencia',
+)
+COLUMNAS = (('proyecto', 'cliente', 'usuario', 'fecha', 'notas', 'advertencia', 'limite_caida', 'cumple')
+            + CAMPOS_ENTRADA)
+
+# Columnas de la búsqueda de texto (filtro 'texto')
+COLUMNAS_TEXTO = ('proyecto', 'cliente', 'tipo_equipo', 'calibre', 'advertencia', 'notas')
+
+# Filtros aceptados por consultar() y contar(): nombre → condición SQL
+FILTROS = {
+    'proyecto': "proyecto = ?",
+    'usuario': "usuario = ?",
+    'tipo_equipo': "tipo_equipo = ?",
+    'cumple': "cumple = ?",
+    'desde': "fecha >= ?",
+    'hasta': "fecha <= ?",
+    'texto': "id IN (SELECT rowid FROM calculos_fts WHERE calculos_fts MATCH ?)",
+}
+
+_ESQUEMA = f"""
+CREATE TABLE IF NOT EXISTS calculos (
+    id INTEGER PRIMARY KEY,
+    proyecto TEXT NOT NULL DEFAULT '',
+    cliente TEXT NOT NULL DEFAULT '',
+    usuario TEXT NOT NULL DEFAULT '',
+    fecha TEXT NOT NULL,
+    notas TEXT NOT NULL DEFAULT '',
+    advertencia TEXT NOT NULL DEFAULT '',
+    limite_caida REAL,
+    cumple INTEGER,
+    {", ".join(CAMPOS_ENTRADA)}
+);
+CREATE INDEX IF NOT EXISTS calculos_proyecto ON calculos (proyecto, fecha);
+CREATE INDEX IF NOT EXISTS calculos_usuario ON calculos (usuario, fecha);
+CREATE INDEX IF NOT EXISTS calculos_fecha ON calculos (fecha);
+CREATE INDEX IF NOT EXISTS calculos_tipo_equipo ON calculos (tipo_equipo, fecha);
+CREATE INDEX IF NOT EXISTS calculos_cumple ON calculos (cumple, fecha);
+CREATE INDEX IF NOT EXISTS calculos_voltaje ON calculos (voltaje);
+CREATE INDEX IF NOT EXISTS calculos_interruptor ON calculos (corriente_interruptor);
+CREATE INDEX IF NOT EXISTS calculos_calibre ON calculos (calibre);
+CREATE INDEX IF NOT EXISTS calculos_resumen
+    ON calculos (proyecto, tipo_equipo, tipo_carga, limite_caida, cumple, calibre);
+"""
+
+# Índice de texto con contenido externo (la tabla calculos); '/' forma parte de las palabras (calibres 1/0 a 4/0).
+# Las inserciones se indexan por lote en _insertar (un disparador por fila es varias veces más lento);
+# los borrados y cambios, con disparadores.
+# Sentencias separadas: se ejecutan en una sola transacción con el bloqueo de escritura tomado
+_ESQUEMA_FTS = (
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS calculos_fts USING fts5(
+        {", ".join(COLUMNAS_TEXTO)}, content='calculos', content_rowid='id',
+        tokenize="unicode61 remove_diacritics 2 tokenchars '/'", prefix='2 3'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS calculos_fts_eliminar AFTER DELETE ON calculos BEGIN
+        INSERT INTO calculos_fts (calculos_fts, rowid, {", ".join(COLUMNAS_TEXTO)})
+        VALUES ('delete', old.id, {", ".join("old." + c for c in COLUMNAS_TEXTO)});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS calculos_fts_actualizar AFTER UPDATE ON calculos BEGIN
+        INSERT INTO calculos_fts (calculos_fts, rowid, {", ".join(COLUMNAS_TEXTO)})
+        VALUES ('delete', old.id, {", ".join("old." + c for c in COLUMNAS_TEXTO)});
+        INSERT INTO calculos_fts (rowid, {", ".join(COLUMNAS_TEXTO)})
+        VALUES (new.id, {", ".join("new." + c for c in COLUMNAS_TEXTO)});
+    END""",
+    "INSERT INTO calculos_fts (calculos_fts) VALUES ('rebuild')",
+)
+_INDEXAR = (f"INSERT INTO calculos_fts (rowid, {', '.join(COLUMNAS_TEXTO)}) "
+            f"SELECT id, {', '.join(COLUMNAS_TEXTO)} FROM calculos WHERE id > ?")
+
+_INSERTAR = f"INSERT INTO calculos ({', '.join(COLUMNAS)}) VALUES ({', '.join('?' * len(COLUMNAS))})"
+
+# Parámetros por consulta (SQLite admite al menos 999)
+_MAX_PARAMETROS = 900
+
+
+def ruta_historial_predeterminada():
+    """Archivo del historial compartido por la interfaz gráfica, la ventana de historial y los lotes."""
+    return os.environ.get("CALCULOSINT_HISTORIAL") or os.path.join(os.path.expanduser("~"), ".calculosint",
+                                                                   "historial.sqlite")
+
+
+def _fecha_actual():
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _entrada(elemento):
+    """EntradaHistorial de un ResultadoCalculo, de un EntradaHistorial o de un diccionario del historial."""
+    if isinstance(elemento, EntradaHistorial):
+        return elemento
+    if isinstance(elemento, ResultadoCalculo):
+        return EntradaHistorial.desde_resultado(elemento)
+    return EntradaHistorial(**{campo: elemento[campo] for campo in CAMPOS_ENTRADA if campo in elemento})
+
+
+def _advertencias(entrada):
+    """Advertencia de ampacidad y, si la hay, la del interruptor."""
+    return " ".join(filter(None, (entrada.mensaje_advertencia, entrada.interruptor_info['advertencia'])))
+
+
+def _limite_caida(tipo_carga):
+    return REGISTRO.limites_caida.get(tipo_carga, REGISTRO.limites_caida['derivado'])
+
+
+def _valores(entrada, proyecto, usuario, fecha, notas, cliente):
+    limite = _limite_caida(entrada.tipo_carga)
+    return ((proyecto, cliente, usuario, fecha, notas, _advertencias(entrada), limite, entrada.caida_p <= limite)
+            + tuple(getattr(entrada, campo) for campo in CAMPOS_ENTRADA))
+
+
+def _escapar_like(termino):
+    return termino.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def consulta_fts(texto):
+    """Consulta FTS5 para el texto escrito: todas las palabras, cada una como prefijo."""
+    return " ".join('"' + termino.replace('"', '""') + '"*' for termino in texto.split())
+
+
+class ResumenHistorial:
+    """Conteos del resumen de la memoria técnica: por equipo, tipo de carga, calibre y límite de caída."""
+
+    def __init__(self):
+        self.total = 0
+        self.equipos = Counter()
+        self.tipos_carga = Counter()
+        self.calibres = Counter()
+        # límite de caída (%) → Counter con 'cumple' y 'no_cumple'
+        self.cumplimiento = {}
+
+    def agregar(self, tipo_equipo, tipo_carga, calibre, limite, cumple, cantidad=1):
+        self.total += cantidad
+        self.equipos[tipo_equipo] += cantidad
+        self.tipos_carga[tipo_carga] += cantidad
+        self.calibres[calibre] += cantidad
+        self.cumplimiento.setdefault(limite, Counter())['cumple' if cumple else 'no_cumple'] += cantidad
+
+    @property
+    def cumple(self):
+        return sum(conteo['cumple'] for conteo in self.cumplimiento.values())
+
+    @property
+    def no_cumple(self):
+        return sum(conteo['no_cumple'] for conteo in self.cumplimiento.values())
+
+
+def resumen_historial(calculos):
+    """ResumenHistorial de una lista de cálculos del historial (diccionarios o EntradaHistorial)."""
+    resumen = getattr(calculos, 'resumen', None)
+    if resumen is not None:
+        return resumen()
+    resultado = ResumenHistorial()
+    for calculo in calculos:
+        limite = _limite_caida(calculo.get('tipo_carga'))
+        resultado.agregar(calculo.get('tipo_equipo', 'N/A'), calculo.get('tipo_carga', 'derivado'),
+                          calculo.get('calibre', 'N/A'), limite, calculo.get('caida_p', 0) <= limite)
+    return resultado
+
+
+class AlmacenHistorial:
+    """Historial de cálculos en SQLite (modo WAL)."""
+
+    def __init__(self, ruta=None):
+        self.ruta = ruta or ruta_historial_predeterminada()
+        directorio = os.path.dirname(self.ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        self.conexion = sqlite3.connect(self.ruta, timeout=30)
+        self.conexion.row_factory = sqlite3.Row
+        self.conexion.execute("PRAGMA journal_mode=WAL")
+        self.conexion.execute("PRAGMA synchronous=NORMAL")
+        with self.conexion:
+            self.conexion.executescript(_ESQUEMA)
+            self._actualizar_esquema()
+        self.busqueda_indexada = self._crear_indice_texto()
+
+    def _actualizar_esquema(self):
+        """Agrega a un historial de una versión anterior las columnas cliente y advertencia."""
+        existentes = {fila['name'] for fila in self.conexion.execute("PRAGMA table_info(calculos)")}
+        for columna in ('cliente', 'advertencia'):
+            if columna not in existentes:
+                self.conexion.execute(f"ALTER TABLE calculos ADD COLUMN {columna} TEXT NOT NULL DEFAULT ''")
+        if 'advertencia' not in existentes:
+            filas = self.conexion.execute("SELECT * FROM calculos").fetchall()
+            self.conexion.executemany("UPDATE calculos SET advertencia = ? WHERE id = ?",
+                                      [(_advertencias(entrada_desde_fila(fila)), fila['id']) for fila in filas])
+
+    def _crear_indice_texto(self):
+        """Crea el índice FTS5 si falta; False solo si SQLite no tiene el módulo FTS5."""
+        consulta = "SELECT 1 FROM sqlite_master WHERE name = 'calculos_fts'"
+        if self.conexion.execute(consulta).fetchone():
+            return True
+        try:
+            with self.conexion:
+                # Otro proceso puede estar creándolo: se vuelve a revisar con el bloqueo de escritura tomado
+                self.conexion.execute("BEGIN IMMEDIATE")
+                if not self.conexion.execute(consulta).fetchone():
+                    for sentencia in _ESQUEMA_FTS:
+                        self.conexion.execute(sentencia)
+        except sqlite3.OperationalError as e:
+            if "no such module" in str(e):
+                return False
+            raise
+        return True
+
+    def agregar(self, entrada, proyecto="", usuario="", fecha=None, notas="", cliente=""):
+        """Guarda un cálculo (EntradaHistorial, ResultadoCalculo o diccionario); devuelve su id."""
+        return self._insertar([_valores(_entrada(entrada), proyecto, usuario, fecha or _fecha_actual(), notas,
+                                        cliente)])
+
+    def agregar_muchos(self, entradas, proyecto="", usuario="", fecha=None, notas="", tamano_lote=5000, cliente=""):
+        """Guarda muchos cálculos con inserciones por lotes; devuelve cuántos se guardaron."""
+        fecha = fecha or _fecha_actual()
+        iterador = iter(entradas)
+        total = 0
+        while True:
+            lote = [_valores(_entrada(elemento), proyecto, usuario, fecha, notas, cliente)
+                    for elemento in islice(iterador, tamano_lote)]
+            if not lote:
+                return total
+            self._insertar(lote)
+            total += len(lote)
+
+    def _insertar(self, lote):
+        """Inserta las filas y las agrega al índice de texto en una transacción; devuelve el id de la última."""
+        with self.conexion:
+            # Bloqueo de escritura desde el inicio: los ids nuevos son los siguientes al máximo actual
+            self.conexion.execute("BEGIN IMMEDIATE")
+            anterior = self.conexion.execute("SELECT COALESCE(MAX(id), 0) FROM calculos").fetchone()[0]
+            self.conexion.executemany(_INSERTAR, lote)
+            if self.busqueda_indexada:
+                self.conexion.execute(_INDEXAR, (anterior,))
+        return anterior + len(lote)
+
+    def _condiciones(self, filtros):
+        desconocidos = set(filtros) - set(FILTROS)
+        if desconocidos:
+            raise ValueError(f"Filtros no válidos: {', '.join(sorted(desconocidos))}")
+        condiciones = []
+        parametros = []
+        for nombre, valor in filtros.items():
+            if valor is None:
+                continue
+            if nombre == 'texto':
+                if valor.split():
+                    condicion, valores = self._condicion_texto(valor)
+                    condiciones.append(condicion)
+                    parametros.extend(valores)
+                continue
+            condiciones.append(FILTROS[nombre])
+            parametros.append(int(valor) if nombre == 'cumple' else valor)
+        return (" WHERE " + " AND ".join(condiciones) if condiciones else ""), parametros
+
+    def _condicion_texto(self, texto):
+        if self.busqueda_indexada:
+            return FILTROS['texto'], [consulta_fts(texto)]
+        # Sin FTS5: cada palabra debe aparecer en alguna de las columnas de texto (% y _ literales)
+        por_termino = "(" + " OR ".join(f"{columna} LIKE ? ESCAPE '\\'" for columna in COLUMNAS_TEXTO) + ")"
+        terminos = [_escapar_like(termino) for termino in texto.split()]
+        return (" AND ".join([por_termino] * len(terminos)),
+                [f"%{termino}%" for termino in terminos for _ in COLUMNAS_TEXTO])
+
+    def consultar(self, limite=None, desplazamiento=0, orden="fecha DESC, id DESC", despues=None, antes=None,
+                  **filtros):
+        """Filas guardadas (sqlite3.Row) que cumplen los filtros de FILTROS, en el orden indicado.
+
+        El filtro texto busca todas sus palabras (como prefijo) en las columnas de COLUMNAS_TEXTO.
+        orden es una lista de columnas separadas por comas, cada una con ASC o DESC opcional.
+        despues / antes es una fila ya leída con el mismo orden: se devuelven las 'limite' filas que
+        la siguen o la preceden (paginación por clave, sin desplazamiento). La lectura empieza en la
+        fila ancla dentro del índice del orden, sin recorrer las anteriores como haría desplazamiento.
+        """
+        terminos = _terminos_orden(orden)
+        where, parametros = self._condiciones(filtros)
+        texto = bool(filtros.get('texto'))
+        ancla = despues if despues is not None else antes
+        if ancla is None:
+            return self._leer(where, parametros, terminos, limite, desplazamiento, texto)
+        if desplazamiento:
+            raise ValueError("desplazamiento no se combina con despues / antes")
+        if 'id' not in (columna for columna, _ in terminos):
+            # El id desempata filas con los mismos valores de orden
+            terminos.append(('id', terminos[-1][1]))
+        if antes is not None:
+            # Las filas anteriores se leen en orden inverso desde el ancla
+            terminos = [(columna, not descendente) for columna, descendente in terminos]
+        # (c1, c2, c3) > (v1, v2, v3) se parte en c1 = v1 AND c2 = v2 AND c3 > v3, luego
+        # c1 = v1 AND c2 > v2 y por último c1 > v1: cada parte es un rango simple del índice
+        # (una comparación de tuplas solo usaría c1 y recorrería los empates de v1)
+        filas = []
+        for nivel in range(len(terminos) - 1, -1, -1):
+            condiciones = [f"{columna} = ?" for columna, _ in terminos[:nivel]]
+            columna, descendente = terminos[nivel]
+            condiciones.append(f"{columna} {'<' if descendente else '>'} ?")
+            valores = [ancla[columna] for columna, _ in terminos[:nivel + 1]]
+            restantes = None if limite is None else limite - len(filas)
+            filas += self._leer((where + " AND " if where else " WHERE ") + " AND ".join(condiciones),
+                                parametros + valores, terminos, restantes, 0, texto)
+            if limite is not None and len(filas) >= limite:
+                break
+        if antes is not None:
+            filas.reverse()
+        return filas
+
+    def _leer(self, where, parametros, terminos, limite, desplazamiento, texto):
+        orden = ", ".join(f"{columna} {'DESC' if descendente else 'ASC'}" for columna, descendente in terminos)
+        if limite is None:
+            return self.conexion.execute(f"SELECT * FROM calculos{where} ORDER BY {orden}", parametros).fetchall()
+        parametros = parametros + [limite, desplazamiento]
+        if texto:
+            # Una búsqueda puede coincidir con muchas filas: se ordenan solo los ids y se leen las de la página
+            sql = (f"SELECT * FROM calculos WHERE id IN (SELECT id FROM calculos{where} ORDER BY {orden} "
+                   f"LIMIT ? OFFSET ?) ORDER BY {orden}")
+        else:
+            sql = f"SELECT * FROM calculos{where} ORDER BY {orden} LIMIT ? OFFSET ?"
+        return self.conexion.execute(sql, parametros).fetchall()
+
+    def contar(self, **filtros):
+        texto = filtros.get('texto')
+        if self.busqueda_indexada and texto and texto.split() and all(
+                valor is None for nombre, valor in filtros.items() if nombre != 'texto'):
+            # Solo búsqueda de texto: se cuenta en el índice, sin leer la tabla
+            return self.conexion.execute("SELECT COUNT(*) FROM calculos_fts WHERE calculos_fts MATCH ?",
+                                         (consulta_fts(texto),)).fetchone()[0]
+        where, parametros = self._condiciones(filtros)
+        return self.conexion.execute(f"SELECT COUNT(*) FROM calculos{where}", parametros).fetchone()[0]
+
+    def resumen(self, **filtros):
+        """ResumenHistorial de los cálculos que cumplen los filtros, con una consulta agrupada.
+
+        Con el filtro proyecto (o sin filtros) la consulta solo recorre el índice calculos_resumen;
+        se agrupa también por proyecto para seguir el orden del índice (los grupos se suman).
+        """
+        where, parametros = self._condiciones(filtros)
+        resultado = ResumenHistorial()
+        consulta = (f"SELECT tipo_equipo, tipo_carga, calibre, limite_caida, cumple, COUNT(*) FROM calculos{where} "
+                    "GROUP BY proyecto, tipo_equipo, tipo_carga, limite_caida, cumple, calibre")
+        for tipo_equipo, tipo_carga, calibre, limite, cumple, cantidad in self.conexion.execute(consulta, parametros):
+            resultado.agregar(tipo_equipo, tipo_carga, calibre, limite, cumple, cantidad)
+        return resultado
+
+    def obtener(self, ids):
+        """EntradaHistorial de cada id, en el mismo orden."""
+        ids = list(ids)
+        filas = {}
+        for inicio in range(0, len(ids), _MAX_PARAMETROS):
+            parte = ids[inicio:inicio + _MAX_PARAMETROS]
+            consulta = f"SELECT * FROM calculos WHERE id IN ({', '.join('?' * len(parte))})"
+            filas.update((fila['id'], fila) for fila in self.conexion.execute(consulta, parte))
+        return [entrada_desde_fila(filas[i]) for i in ids]
+
+    def eliminar(self, **filtros):
+        """Borra los cálculos que cumplen los filtros (todos si no se indica ninguno); devuelve cuántos."""
+        where, parametros = self._condiciones(filtros)
+        with self.conexion:
+            return self.conexion.execute(f"DELETE FROM calculos{where}", parametros).rowcount
+
+    def cerrar(self):
+        self.conexion.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        self.cerrar()
+
+    def __len__(self):
+        return self.contar()
+
+
+def _terminos_orden(orden):
+    """[(columna, descendente)] de una lista de orden SQL; solo se aceptan columnas de la tabla."""
+    terminos = []
+    for termino in orden.split(","):
+        partes = termino.split()
+        if not (1 <= len(partes) <= 2 and partes[0] in ('id',) + COLUMNAS
+                and (len(partes) == 1 or partes[1].upper() in ("ASC", "DESC"))):
+            raise ValueError(f"Orden no válido: {orden}")
+        terminos.append((partes[0], len(partes) == 2 and partes[1].upper() == "DESC"))
+    return terminos
+
+
+def invertir_orden(orden):
+    """La misma lista de orden en sentido contrario (para leer desde el final)."""
+    return ", ".join(f"{columna} {'ASC' if descendente else 'DESC'}" for columna, descendente in _terminos_orden(orden))
+
+
+def entrada_desde_fila(fila):
+    """EntradaHistorial de una fila de la tabla calculos (la hora se toma de la fecha)."""
+    return EntradaHistorial(timestamp=fila['fecha'][11:19], **{campo: fila[campo] for campo in CAMPOS_ENTRADA})
+
+
+class RegistradorLote:
+    """Guarda en el historial los resultados de un lote conforme se calculan, por inserciones agrupadas.
+
+    Se pasa como al_calcular a cuadro_cargas.escribir_resultados_csv o
+    exportador_columnar.escribir_resultados_columnar; las filas con error no se guardan.
+    """
+
+    def __init__(self, almacen, proyecto="", usuario="", tamano_lote=5000, cliente=""):
+        self.almacen = almacen
+        self.proyecto = proyecto
+        self.usuario = usuario
+        self.cliente = cliente
+        self.tamano_lote = tamano_lote
+        self.fecha = _fecha_actual()
+        self.guardados = 0
+        self._pendientes = []
+
+    def __call__(self, fila, resultado, error):
+        if resultado is not None:
+            self._pendientes.append(resultado)
+            if len(self._pendientes) >= self.tamano_lote:
+                self.vaciar()
+
+    def vaciar(self):
+        if self._pendientes:
+            self.guardados += self.almacen.agregar_muchos(self._pendientes, self.proyecto, self.usuario, self.fecha,
+                                                          tamano_lote=self.tamano_lote, cliente=self.cliente)
+            self._pendientes = []
+
+
+class SesionHistorial(Sequence):
+    """Historial de la sesión de calculosint: lista de ids guardados en el almacén.
+
+    Se usa como la lista Calculos.historial (append, len, índices y rebanadas);
+    las entradas se leen del almacén al consultarlas. Los conteos del resumen
+    se actualizan en cada append, sin volver a leer la sesión.
+    """
+
+    def __init__(self, almacen, proyecto="", usuario="", cliente=""):
+        self.almacen = almacen
+        self.proyecto = proyecto
+        self.usuario = usuario
+        self.cliente = cliente
+        self._ids = []
+        self._resumen = ResumenHistorial()
+
+    def append(self, entrada):
+        entrada = _entrada(entrada)
+        self._ids.append(self.almacen.agregar(entrada, self.proyecto, self.usuario, cliente=self.cliente))
+        limite = _limite_caida(entrada.tipo_carga)
+        self._resumen.agregar(entrada.tipo_equipo, entrada.tipo_carga, entrada.calibre, limite,
+                              entrada.caida_p <= limite)
+
+    def clear(self):
+        """Vacía el historial de la sesión; los cálculos siguen guardados en el almacén."""
+        self._ids.clear()
+        self._resumen = ResumenHistorial()
+
+    def resumen(self):
+        """ResumenHistorial de la sesión (conteos mantenidos en append)."""
+        return self._resumen
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return self.almacen.obtener(self._ids[indice])
+        return self.almacen.obtener([self._ids[indice]])[0]
+
+    def __iter__(self):
+        for inicio in range(0, len(self._ids), _MAX_PARAMETROS):
+            yield from self.almacen.obtener(self._ids[inicio:inicio + _MAX_PARAMETROS])
+
+    def __len__(self):
+        return len(self._ids)
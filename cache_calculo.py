@@ -0,0 +1,105 @@
+# CACHE_CALCULO.PY - CACHE DE RESULTADOS PARA CIRCUITOS REPETIDOS
+#
+# Los cuadros de cargas repiten muchas veces el mismo circuito (mismo motor,
+# tensión, longitud, material y canalización). Este módulo memoriza los
+# resultados de motor_calculo.calcular_circuito con política LRU.
+
+from collections import OrderedDict
+from functools import partial
+
+from motor_calculo import calcular_circuito
+from tablas_nom import REGISTRO
+
+
+def clave_circuito(datos, version_tablas=None):
+    """Tupla normalizada de entrada + versión de tablas que identifica un cálculo."""
+    return (
+        version_tablas or REGISTRO.version,
+        datos.tipo_circuito,
+        datos.tipo_carga,
+        datos.tipo_equipo,
+        str(datos.valor_potencia).strip(),
+        datos.unidad_potencia,
+        float(datos.voltaje),
+        float(datos.longitud),
+        float(datos.factor_potencia),
+        datos.material,
+        int(datos.num_conductores),
+        datos.canalizacion,
+        datos.temp_conductor,
+        float(datos.eficiencia),
+    )
+
+
+def describir_funcion(funcion):
+    """Identificador estable de la función de cálculo (incluye los argumentos de un partial).
+
+    Las caches (CacheCalculos, CacheDisco) se describen por la función que envuelven.
+    """
+    if isinstance(funcion, partial):
+        # explicar solo decide si los textos se arman de inmediato: el resultado es el mismo
+        argumentos = tuple(sorted((k, v) for k, v in funcion.keywords.items() if k != "explicar"))
+        return (describir_funcion(funcion.func), funcion.args, argumentos)
+    envuelta = getattr(funcion, "funcion_calculo", None)
+    if envuelta is not None:
+        return describir_funcion(envuelta)
+    nombre = getattr(funcion, "__qualname__", None) or type(funcion).__qualname__
+    return f"{getattr(funcion, '__module__', None) or type(funcion).__module__}.{nombre}"
+
+
+class CacheCalculos:
+    """Cache LRU de ResultadoCalculo con contadores de aciertos, fallos y desalojos.
+
+    Los resultados se comparten entre todas las filas con la misma clave, por lo
+    que deben tratarse como de solo lectura.
+    """
+
+    def __init__(self, max_entradas=4096, funcion_calculo=calcular_circuito):
+        if max_entradas < 1:
+            raise ValueError("max_entradas debe ser al menos 1")
+        self.max_entradas = max_entradas
+        self.funcion_calculo = funcion_calculo
+        self._entradas = OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+
+    def calcular(self, datos):
+        """Devuelve el resultado del circuito, calculándolo solo si no está en cache."""
+        clave = clave_circuito(datos)
+        resultado = self._entradas.get(clave)
+        if resultado is not None:
+            self._entradas.move_to_end(clave)
+            self.aciertos += 1
+            return resultado
+
+        self.fallos += 1
+        resultado = self.funcion_calculo(datos)
+        self._entradas[clave] = resultado
+        if len(self._entradas) > self.max_entradas:
+            self._entradas.popitem(last=False)
+            self.desalojos += 1
+        return resultado
+
+    def limpiar(self):
+        self._entradas.clear()
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+
+    def estadisticas(self):
+        total = self.aciertos + self.fallos
+        return {
+            'entradas': len(self._entradas),
+            'max_entradas': self.max_entradas,
+            'aciertos': self.aciertos,
+            'fallos': self.fallos,
+            'desalojos': self.desalojos,
+            'tasa_aciertos': self.aciertos / total if total else 0.0,
+        }
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def __contains__(self, datos):
+        return clave_circuito(datos) in self._entradas
@@ -0,0 +1,201 @@
+# CACHE_DISCO.PY - CACHE PERSISTENTE DE RESULTADOS ENTRE SESIONES
+#
+# Guarda en una base SQLite los resultados de motor_calculo, con la misma
+# clave normalizada que cache_calculo (incluye la versión de las tablas NOM)
+# más la función y configuración de cálculo. La comparten la interfaz gráfica,
+# el modo por lotes y el modo JSON Lines, por lo que los circuitos tipo que se
+# repiten entre proyectos no se vuelven a calcular. El tamaño se limita con
+# desalojo LRU (por fecha de último uso).
+#
+# Una instancia de CacheDisco se usa como funcion_calculo: puede enviarse a los
+# procesos de lote_paralelo (cada proceso abre su propia conexión).
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+from cache_calculo import clave_circuito, describir_funcion
+from motor_calculo import calcular_circuito
+from proyecto import resultado_a_dict, resultado_desde_dict
+
+# Cambia si cambia el formato guardado de los resultados (2: incluye limite_caida y cumple_caida)
+VERSION_FORMATO = 2
+
+# Escrituras pendientes (o segundos desde la última confirmación) antes de confirmar la transacción
+_MAX_PENDIENTES = 500
+_MAX_SEGUNDOS_PENDIENTES = 2.0
+
+
+def ruta_cache_predeterminada():
+    """Archivo de cache compartido por la interfaz gráfica y la línea de comandos."""
+    return os.environ.get("CALCULOSINT_CACHE") or os.path.join(os.path.expanduser("~"), ".calculosint",
+                                                                "cache_resultados.sqlite")
+
+
+class CacheDisco:
+    """Cache SQLite de ResultadoCalculo con límite de entradas y desalojo LRU.
+
+    Se llama como la función de cálculo: cache(datos) devuelve el resultado
+    guardado o lo calcula y lo guarda. Los errores de cálculo no se guardan.
+    Solo se guarda el texto serializado: cada llamada devuelve un
+    ResultadoCalculo propio, esté la entrada pendiente de escribir o no.
+    """
+
+    def __init__(self, ruta=None, max_entradas=200000, funcion_calculo=calcular_circuito, configuracion=""):
+        if max_entradas < 1:
+            raise ValueError("max_entradas debe ser al menos 1")
+        self.ruta = ruta or ruta_cache_predeterminada()
+        self.max_entradas = max_entradas
+        self.funcion_calculo = funcion_calculo
+        self.configuracion = configuracion
+        self._prefijo = (VERSION_FORMATO, describir_funcion(funcion_calculo), configuracion)
+        self._reiniciar_estado()
+
+    def _reiniciar_estado(self):
+        self._conexion = None
+        self._nuevos = {}
+        self._usados = {}
+        self._ultima_confirmacion = time.monotonic()
+        self._entradas = 0
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+
+    def __getstate__(self):
+        # La conexión no se comparte entre procesos; cada uno abre la suya
+        return {'ruta': self.ruta, 'max_entradas': self.max_entradas, 'funcion_calculo': self.funcion_calculo,
+                'configuracion': self.configuracion, '_prefijo': self._prefijo}
+
+    def __setstate__(self, estado):
+        self.__dict__.update(estado)
+        self._reiniciar_estado()
+
+    def abrir(self):
+        """Abre (o crea) la base de la cache; devuelve la conexión."""
+        if self._conexion is None:
+            directorio = os.path.dirname(self.ruta)
+            if directorio:
+                os.makedirs(directorio, exist_ok=True)
+            self._conexion = sqlite3.connect(self.ruta, timeout=30)
+            self._conexion.execute("PRAGMA journal_mode=WAL")
+            self._conexion.execute("PRAGMA synchronous=NORMAL")
+            self._conexion.execute("CREATE TABLE IF NOT EXISTS resultados ("
+                                   "clave TEXT PRIMARY KEY, resultado TEXT NOT NULL, ultimo_uso REAL NOT NULL)")
+            self._conexion.execute("CREATE INDEX IF NOT EXISTS resultados_ultimo_uso ON resultados (ultimo_uso)")
+            self._conexion.commit()
+            self._entradas = self._conexion.execute("SELECT COUNT(*) FROM resultados").fetchone()[0]
+        return self._conexion
+
+    def clave(self, datos):
+        contenido = repr(self._prefijo + clave_circuito(datos))
+        return hashlib.sha256(contenido.encode("utf-8")).hexdigest()
+
+    def __call__(self, datos):
+        return self.calcular(datos)
+
+    def calcular(self, datos):
+        """Devuelve el resultado del circuito, calculándolo solo si no está en la cache."""
+        conexion = self.abrir()
+        clave = self.clave(datos)
+        if clave in self._nuevos:
+            # Aún no escrito: se reconstruye desde el texto, igual que al leerlo de la base
+            self.aciertos += 1
+            return resultado_desde_dict(json.loads(self._nuevos[clave][0]))
+        fila = conexion.execute("SELECT resultado FROM resultados WHERE clave = ?", (clave,)).fetchone()
+        if fila is not None:
+            try:
+                resultado = resultado_desde_dict(json.loads(fila[0]))
+            except (TypeError, ValueError, KeyError):
+                resultado = None
+            if resultado is not None:
+                self.aciertos += 1
+                self._usados[clave] = time.time()
+                self._confirmar_si_toca()
+                return resultado
+
+        self.fallos += 1
+        resultado = self.funcion_calculo(datos)
+        self._nuevos[clave] = (json.dumps(resultado_a_dict(resultado), ensure_ascii=False), time.time())
+        self._confirmar_si_toca()
+        return resultado
+
+    def _confirmar_si_toca(self):
+        if (len(self._nuevos) + len(self._usados) >= _MAX_PENDIENTES
+                or time.monotonic() - self._ultima_confirmacion >= _MAX_SEGUNDOS_PENDIENTES):
+            self.vaciar()
+
+    def vaciar(self):
+        """Escribe los resultados nuevos y las fechas de uso pendientes; desaloja si se excede el límite."""
+        if self._conexion is None or not (self._nuevos or self._usados):
+            return
+        with self._conexion:
+            self._conexion.executemany("INSERT OR REPLACE INTO resultados VALUES (?, ?, ?)",
+                                       [(clave, texto, uso) for clave, (texto, uso) in self._nuevos.items()])
+            self._conexion.executemany("UPDATE resultados SET ultimo_uso = ? WHERE clave = ?",
+                                       [(uso, clave) for clave, uso in self._usados.items()])
+            self._entradas += len(self._nuevos)
+            if self._entradas > self.max_entradas:
+                self._desalojar()
+        self._nuevos = {}
+        self._usados = {}
+        self._ultima_confirmacion = time.monotonic()
+
+    def _desalojar(self):
+        # Otros procesos pueden haber agregado entradas: se cuenta de nuevo
+        self._entradas = self._conexion.execute("SELECT COUNT(*) FROM resultados").fetchone()[0]
+        exceso = self._entradas - self.max_entradas
+        if exceso <= 0:
+            return
+        # Se deja un margen del 10 % para no desalojar en cada escritura
+        exceso += self.max_entradas // 10
+        self._conexion.execute("DELETE FROM resultados WHERE clave IN "
+                               "(SELECT clave FROM resultados ORDER BY ultimo_uso LIMIT ?)", (exceso,))
+        self._entradas = max(self._entradas - exceso, 0)
+        self.desalojos += exceso
+
+    def limpiar(self):
+        """Borra todos los resultados guardados."""
+        conexion = self.abrir()
+        self._nuevos = {}
+        self._usados = {}
+        with conexion:
+            conexion.execute("DELETE FROM resultados")
+        self._entradas = 0
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+
+    def cerrar(self):
+        if self._conexion is not None:
+            self.vaciar()
+            self._conexion.close()
+            self._conexion = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        self.cerrar()
+
+    def estadisticas(self):
+        total = self.aciertos + self.fallos
+        return {
+            'entradas': self._entradas + len(self._nuevos),
+            'max_entradas': self.max_entradas,
+            'aciertos': self.aciertos,
+            'fallos': self.fallos,
+            'desalojos': self.desalojos,
+            'tasa_aciertos': self.aciertos / total if total else 0.0,
+        }
+
+    def __len__(self):
+        self.abrir()
+        return self._entradas + len(self._nuevos)
+
+    def __contains__(self, datos):
+        clave = self.clave(datos)
+        if clave in self._nuevos:
+            return True
+        return self.abrir().execute("SELECT 1 FROM resultados WHERE clave = ?", (clave,)).fetchone() is not None
@@ -0,0 +1,521 @@
+# CALCULO_LOTE.PY - DIMENSIONAMIENTO VECTORIZADO DE CUADROS DE CARGAS
+#
+# Aplica la misma metodología que motor_calculo.calcular_circuito a N circuitos
+# a la vez, usando arreglos de NumPy y np.searchsorted sobre las tablas NOM.
+# Los resultados son idénticos a los del cálculo circuito por circuito.
+
+import math
+
+from motor_calculo import MENSAJE_POTENCIA_INVALIDA, MENSAJE_VOLTAJE_INVALIDO, costos_por_calibre
+from tablas_nom import REGISTRO
+
+# Importar numpy para el cálculo vectorizado
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+RAIZ_3 = math.sqrt(3)
+
+# Tablas de ampacidad compiladas: (nombre, fuente)
+TABLAS_AMPACIDAD = [
+    ("cobre_60", "Tabla 310-15(b)(16) - Conduit"),
+    ("cobre_75", "Tabla 310-15(b)(16) - Conduit"),
+    ("cobre_90", "Tabla 310-15(b)(16) - Conduit"),
+    ("aluminio", "Tabla 310-15(b)(16) - Conduit"),
+    ("charola_cobre_75", "Tabla 310-15(b)(20) - Charola"),
+    ("charola_cobre_90", "Tabla 310-15(b)(20) - Charola"),
+    ("charola_aluminio_75", "Tabla 310-15(b)(20) - Charola"),
+    ("charola_aluminio_90", "Tabla 310-15(b)(20) - Charola"),
+]
+
+
+# Canalizaciones con tabla de impedancias propia (otras se tratan como PVC)
+CANALIZACIONES = ("PVC", "Acero", "Charola")
+
+
+def _compilar_tablas():
+    """Convierte las tablas del registro NOM en arreglos de NumPy indexados por calibre.
+
+    Todas las tablas se alinean con REGISTRO.calibres_ordenados (índice global
+    de calibre); los calibres que no existen en una tabla quedan en NaN.
+    """
+    calibres = np.array(REGISTRO.calibres_ordenados, dtype=object)
+    indice_calibre = REGISTRO.indice_calibre
+    n_calibres = len(calibres)
+
+    ampacidades = np.full((len(TABLAS_AMPACIDAD), n_calibres), np.nan)
+    compactas = []
+    for t, (nombre, _) in enumerate(TABLAS_AMPACIDAD):
+        tabla = getattr(REGISTRO, f"ampacidades_{nombre}")
+        globales = np.array([indice_calibre[c] for c in tabla.claves])
+        ampacidades[t, globales] = tabla.valores
+        compactas.append((globales, np.array(tabla.valores, dtype=float)))
+
+    # Impedancias por combinación (tabla de ampacidad, canalización): fila t * 3 + canal
+    impedancias = np.full((len(TABLAS_AMPACIDAD) * len(CANALIZACIONES), n_calibres), np.nan)
+    impedancias_compactas = {}
+    for t, (nombre, _) in enumerate(TABLAS_AMPACIDAD):
+        material = "aluminio" if "aluminio" in nombre else "cobre"
+        if nombre.startswith("charola"):
+            fuentes = {"Charola": getattr(REGISTRO, f"impedancia_charola_{material}")}
+        else:
+            fuentes = getattr(REGISTRO, f"impedancia_{material}")
+        for canal, canalizacion in enumerate(CANALIZACIONES):
+            if canalizacion not in fuentes:
+                continue
+            tabla_z = fuentes[canalizacion]
+            globales = np.array([indice_calibre[c] for c in tabla_z.claves])
+            combinacion = t * len(CANALIZACIONES) + canal
+            impedancias[combinacion, globales] = tabla_z.valores
+            impedancias_compactas[combinacion] = (globales, np.array(tabla_z.negativos, dtype=float))
+
+    interruptores = np.array(REGISTRO.indice_interruptores.limites, dtype=float)
+    indice_tierra = REGISTRO.indice_tierra_fisica
+    limites_tierra = np.array(indice_tierra.limites, dtype=float)
+    calibres_tierra = np.array(indice_tierra.valores + (indice_tierra.valor_excedido,), dtype=object)
+    return (calibres, ampacidades, compactas, impedancias, impedancias_compactas,
+            interruptores, limites_tierra, calibres_tierra)
+
+
+if NUMPY_AVAILABLE:
+    (_CALIBRES, _AMPACIDADES, _AMPACIDADES_COMPACTAS, _IMPEDANCIAS, _IMPEDANCIAS_COMPACTAS,
+     _INTERRUPTORES, _LIMITES_TIERRA, _CALIBRES_TIERRA) = _compilar_tablas()
+
+
+def _columna(valor, n, dtype=None):
+    arreglo = np.asarray(valor, dtype=dtype)
+    if arreglo.ndim == 0:
+        arreglo = np.full(n, arreglo.item(), dtype=dtype if dtype is not None else arreglo.dtype)
+    return arreglo
+
+
+def _numeros(valor, n, error):
+    """Columna de números convertida elemento por elemento.
+
+    Los elementos que no se pueden convertir quedan en NaN y su fila recibe en
+    'error' el mismo mensaje que el cálculo circuito por circuito.
+    """
+    arreglo = _columna(valor, n)
+    if arreglo.dtype.kind in "biuf":
+        return arreglo.astype(float)
+    numeros = np.full(n, np.nan)
+    for i, elemento in enumerate(arreglo):
+        try:
+            numeros[i] = float(elemento)
+        except (TypeError, ValueError) as e:
+            if error[i] == "":
+                error[i] = f"Error en valores ingresados: {e}"
+    return numeros
+
+
+def columnas_desde_datos(lista_datos):
+    """Convierte una lista de DatosCircuito en las columnas que recibe calcular_lote."""
+    campos = ["tipo_equipo", "valor_potencia", "unidad_potencia", "voltaje", "longitud", "tipo_circuito",
+              "tipo_carga", "factor_potencia", "material", "canalizacion", "temp_conductor",
+              "num_conductores", "eficiencia"]
+    columnas = {campo: [getattr(d, campo) for d in lista_datos] for campo in campos}
+    columnas["valor"] = columnas.pop("valor_potencia")
+    columnas["unidad"] = columnas.pop("unidad_potencia")
+    return columnas
+
+
+def _tablas_por_fila(material, canalizacion, temp_conductor):
+    """Tabla de ampacidad, combinación de impedancias y fuente normativa de cada fila."""
+    es_cobre = material == "cobre"
+    es_charola = canalizacion == "Charola"
+    temp_60 = temp_conductor == "60 °C"
+    temp_75 = temp_conductor == "75 °C"
+    temp_90 = temp_conductor == "90 °C"
+    selecciones = [
+        ~es_charola & es_cobre & temp_60,
+        ~es_charola & es_cobre & temp_75,
+        ~es_charola & es_cobre & ~temp_60 & ~temp_75,
+        ~es_charola & ~es_cobre,
+        es_charola & es_cobre & ~temp_90,
+        es_charola & es_cobre & temp_90,
+        es_charola & ~es_cobre & ~temp_90,
+        es_charola & ~es_cobre & temp_90,
+    ]
+    tabla_fila = np.select(selecciones, np.arange(len(TABLAS_AMPACIDAD)))
+    fuente_tabla = np.array([fuente for _, fuente in TABLAS_AMPACIDAD], dtype=object)[tabla_fila]
+    fuente_tabla[es_charola & ~temp_75 & ~temp_90] = "Tabla 310-15(b)(20) - Charola (60°C no disponible, usando 75°C)"
+    canal_fila = np.where(es_charola, 2, np.where(canalizacion == "Acero", 1, 0))
+    return tabla_fila, tabla_fila * len(CANALIZACIONES) + canal_fila, fuente_tabla
+
+
+def calcular_lote(tipo_equipo, valor, unidad, voltaje, longitud, tipo_circuito="monofasico",
+                  tipo_carga="derivado", factor_potencia=0.9, material="cobre", canalizacion="PVC",
+                  temp_conductor="75 °C", num_conductores=1, eficiencia=0.90,
+                  ajustar_caida=False, max_conductores=None, limite_caida=None, calibre_minimo=None):
+    """Dimensiona N circuitos a la vez.
+
+    Cada argumento puede ser un escalar o un arreglo de longitud N. Devuelve un
+    diccionario de arreglos; las filas con datos inválidos quedan con 'valido' en
+    False, valores NaN y el motivo en 'error'.
+
+    Con ajustar_caida=True se aplica por fila la misma búsqueda que
+    motor_calculo.dimensionar_por_caida (aumentar calibre y, hasta
+    max_conductores, conductores por fase hasta cumplir la caída).
+    calibre_minimo ("" = sin mínimo) equivale al de motor_calculo.calcular_circuito.
+    """
+    if not NUMPY_AVAILABLE:
+        raise ImportError("Para el cálculo por lotes se requiere la biblioteca 'numpy'.\n\n"
+                          "Instale con: pip install numpy")
+
+    longitudes = [np.size(x) for x in (tipo_equipo, valor, unidad, voltaje, longitud, tipo_circuito, tipo_carga,
+                                        factor_potencia, material, canalizacion, temp_conductor, num_conductores,
+                                        eficiencia, max_conductores, limite_caida, calibre_minimo)
+                  if x is not None]
+    n = max(longitudes)
+
+    tipo_equipo = _columna(tipo_equipo, n).astype(str)
+    unidad = _columna(unidad, n).astype(str)
+    tipo_circuito = _columna(tipo_circuito, n).astype(str)
+    tipo_carga = _columna(tipo_carga, n).astype(str)
+    material = _columna(material, n).astype(str)
+    canalizacion = _columna(canalizacion, n).astype(str)
+    temp_conductor = _columna(temp_conductor, n).astype(str)
+    longitud = _columna(longitud, n, float)
+    factor_potencia = _columna(factor_potencia, n, float)
+    num_conductores = _columna(num_conductores, n).astype(int)
+    eficiencia = _columna(eficiencia, n, float)
+
+    error = np.full(n, "", dtype=object)
+
+    es_motor = tipo_equipo == "Motor"
+    es_trafo = tipo_equipo == "Transformador"
+    es_capacitor = tipo_equipo == "Capacitor"
+    es_generador = tipo_equipo == "Generador"
+    es_mono = tipo_circuito == "monofasico"
+    es_alimentador = tipo_carga == "alimentador"
+    es_charola = canalizacion == "Charola"
+    en_amperes = unidad == "A"
+
+    error[num_conductores < 1] = "El número de conductores por fase debe ser al menos 1"
+    num_conductores = np.maximum(num_conductores, 1)
+
+    # Potencia y voltaje: números finitos y mayores que cero (como motor_calculo.calcular_circuito)
+    valor = _numeros(valor, n, error)
+    voltaje = _numeros(voltaje, n, error)
+    potencia_invalida = ~(np.isfinite(valor) & (valor > 0)) & (error == "")
+    error[potencia_invalida] = f"Error en valores ingresados: {MENSAJE_POTENCIA_INVALIDA}"
+    voltaje_invalido = ~(np.isfinite(voltaje) & (voltaje > 0)) & (error == "")
+    error[voltaje_invalido] = f"Error en valores ingresados: {MENSAJE_VOLTAJE_INVALIDO}"
+
+    # Factor de potencia (1.0 cuando la entrada es A o kVAR)
+    sin_fp = en_amperes | (unidad == "kVAR")
+    fp = np.where(sin_fp, 1.0, factor_potencia)
+    fp_invalido = ~sin_fp & ~((fp >= 0.1) & (fp <= 1.0))
+    error[fp_invalido & (error == "")] = "Factor de potencia debe estar entre 0.1 y 1.0"
+
+    # Unidades no válidas por tipo de equipo
+    unidad_invalida_motor = es_motor & ~en_amperes & ~np.isin(unidad, ["HP", "W", "kW"])
+    unidad_invalida_trafo = es_trafo & ~en_amperes & ~np.isin(unidad, ["kVA", "W", "kW"])
+    unidad_invalida_capacitor = es_capacitor & ~en_amperes & (unidad != "kVAR")
+    error[unidad_invalida_motor & (error == "")] = "Para motores use W, kW, HP o A como unidad"
+    error[unidad_invalida_trafo & (error == "")] = "Para transformadores use W, kW, kVA o A como unidad"
+    error[unidad_invalida_capacitor & (error == "")] = "Para capacitores use únicamente kVAR o A como unidad"
+
+    # Factor de demanda (Art. 220-11)
+    factor_demanda = np.where(es_alimentador, np.where(es_motor, 0.75, np.where(es_trafo, 0.85, 0.80)), 1.0)
+
+    # Corriente por tipo de equipo
+    multiplicador = np.where(unidad == "kW", 1000.0, 1.0)
+    multiplicador = np.where(es_motor & (unidad == "HP"), 746.0, multiplicador)
+    multiplicador = np.where((es_trafo & (unidad == "kVA")) | (es_capacitor & (unidad == "kVAR")), 1000.0, multiplicador)
+    divisor_eficiencia = np.where(es_motor & (unidad == "HP"), eficiencia, 1.0)
+    potencia = valor * multiplicador / divisor_eficiencia * factor_demanda
+
+    fp_formula = np.where((es_trafo & (unidad == "kVA")) | (es_capacitor & (unidad == "kVAR")), 1.0, fp)
+    denominador = np.where(es_mono, voltaje, RAIZ_3 * voltaje) * fp_formula
+    # Las filas con error no se dividen (quedan en NaN y se descartan al final)
+    denominador = np.where(error == "", denominador, np.nan)
+    corriente = np.where(en_amperes, valor, potencia / denominador)
+
+    # Factor normativo de protección
+    factor_proteccion = np.where(es_capacitor, 1.35, np.where(es_generador, 1.15, 1.25))
+    corriente_para_proteccion = corriente * factor_proteccion
+
+    # Interruptor comercial
+    corriente_interruptor = np.where(
+        es_motor, np.where(corriente <= 30, corriente * 2.5, corriente * 1.75),
+        np.where(es_trafo, np.where(corriente <= 9, corriente * 1.67, corriente * 1.25),
+                 np.where(es_capacitor, corriente * 1.65,
+                          np.where(es_generador, corriente * 1.15, corriente_para_proteccion))))
+    indice_interruptor = np.minimum(np.searchsorted(_INTERRUPTORES, corriente_interruptor, side="left"),
+                                    len(_INTERRUPTORES) - 1)
+    interruptor = _INTERRUPTORES[indice_interruptor]
+
+    # Tabla de ampacidad y de impedancias de cada fila
+    tabla_fila, combinacion_fila, fuente_tabla = _tablas_por_fila(material, canalizacion, temp_conductor)
+    canal_fila = combinacion_fila % len(CANALIZACIONES)
+    limite_normativo = np.where(es_alimentador, REGISTRO.limites_caida["alimentador"], REGISTRO.limites_caida["derivado"])
+
+    def calibre_por_ampacidad(filas, conductores):
+        """Índice global del calibre por ampacidad (búsqueda binaria en cada tabla)."""
+        indice = np.empty(len(filas), dtype=int)
+        corriente_conductor = interruptor[filas] / conductores
+        for t in np.unique(tabla_fila[filas]):
+            sub = tabla_fila[filas] == t
+            globales, valores = _AMPACIDADES_COMPACTAS[t]
+            posicion = np.minimum(np.searchsorted(valores, corriente_conductor[sub], side="left"), len(valores) - 1)
+            indice[sub] = globales[posicion]
+        return indice
+
+    def caida_porcentual(filas, indice, conductores):
+        z_filas = _IMPEDANCIAS[combinacion_fila[filas], indice]
+        base = np.where(es_mono[filas], 2 * z_filas, RAIZ_3 * z_filas)
+        caida = base * corriente[filas] * longitud[filas] / 1000 / conductores
+        return (caida / voltaje[filas]) * 100, z_filas
+
+    todas = np.arange(n)
+    indice_ampacidad = calibre_por_ampacidad(todas, num_conductores)
+    indice_calibre = indice_ampacidad.copy()
+    if calibre_minimo is not None:
+        calibre_minimo = _columna(calibre_minimo, n).astype(str)
+        indice_minimo = np.array([REGISTRO.indice_calibre.get(c, -1) for c in calibre_minimo])
+        for i in np.flatnonzero((indice_minimo < 0) & (calibre_minimo != "") & (error == "")):
+            error[i] = f"Calibre {calibre_minimo[i]} no disponible en {fuente_tabla[i]}."
+        indice_calibre = np.maximum(indice_calibre, indice_minimo)
+    conductores_finales = num_conductores.copy()
+
+    limite_caida = limite_normativo if limite_caida is None else _columna(limite_caida, n, float)
+
+    if ajustar_caida:
+        n_maximo = np.maximum(num_conductores, num_conductores if max_conductores is None
+                              else _columna(max_conductores, n).astype(int))
+        caida_inicial, _ = caida_porcentual(todas, indice_calibre, num_conductores)
+        pendientes = np.flatnonzero((error == "") & (caida_inicial > limite_caida))
+        conductores = num_conductores[pendientes]
+        while len(pendientes):
+            base_indice = calibre_por_ampacidad(pendientes, conductores)
+            caida_base, z_base = caida_porcentual(pendientes, base_indice, conductores)
+            resueltas = caida_base <= limite_caida[pendientes]
+            indice_calibre[pendientes[resueltas]] = base_indice[resueltas]
+            indice_ampacidad[pendientes] = base_indice
+            if calibre_minimo is not None:
+                base_indice = np.maximum(base_indice, indice_minimo[pendientes])
+            conductores_finales[pendientes[resueltas]] = conductores[resueltas]
+
+            # Bisección en la tabla de impedancias: primer calibre con Z ≤ Z_máx
+            buscar = ~resueltas
+            posicion = np.zeros(len(pendientes), dtype=int)
+            longitud_tabla = np.zeros(len(pendientes), dtype=int)
+            z_maxima = z_base * limite_caida[pendientes] / caida_base
+            for combinacion in np.unique(combinacion_fila[pendientes[buscar]]):
+                sub = buscar & (combinacion_fila[pendientes] == combinacion)
+                globales, negativos = _IMPEDANCIAS_COMPACTAS[combinacion]
+                posicion[sub] = np.searchsorted(negativos, -z_maxima[sub], side="left")
+                longitud_tabla[sub] = len(globales)
+
+            activas = buscar & (posicion < longitud_tabla)
+            while activas.any():
+                candidato = np.empty(len(pendientes), dtype=int)
+                for combinacion in np.unique(combinacion_fila[pendientes[activas]]):
+                    sub = activas & (combinacion_fila[pendientes] == combinacion)
+                    candidato[sub] = _IMPEDANCIAS_COMPACTAS[combinacion][0][posicion[sub]]
+                filas = np.flatnonzero(activas)
+                candidato = np.maximum(candidato[filas], base_indice[filas])
+                caida_candidato, _ = caida_porcentual(pendientes[filas], candidato, conductores[filas])
+                cumple = caida_candidato <= limite_caida[pendientes[filas]]
+                indice_calibre[pendientes[filas[cumple]]] = candidato[cumple]
+                conductores_finales[pendientes[filas[cumple]]] = conductores[filas[cumple]]
+                resueltas[filas[cumple]] = True
+                activas[filas[cumple]] = False
+                posicion[filas[~cumple]] += 1
+                activas &= posicion < longitud_tabla
+
+            # Sin solución con estos conductores: probar uno más por fase o quedarse con la menor caída
+            sin_solucion = ~resueltas
+            agotadas = sin_solucion & (conductores >= n_maximo[pendientes])
+            for i in np.flatnonzero(agotadas):
+                fila = pendientes[i]
+                ultimo = _IMPEDANCIAS_COMPACTAS[combinacion_fila[fila]][0][-1]
+                indice_calibre[fila] = max(ultimo, base_indice[i])
+                conductores_finales[fila] = conductores[i]
+            siguen = sin_solucion & ~agotadas
+            pendientes = pendientes[siguen]
+            conductores = conductores[siguen] + 1
+
+    # Calibre final, ampacidad e impedancia
+    calibre = _CALIBRES[indice_calibre]
+    ampacidad = _AMPACIDADES[tabla_fila, indice_calibre]
+    z = _IMPEDANCIAS[combinacion_fila, indice_calibre]
+    corriente_por_conductor = interruptor / conductores_finales
+
+    sin_ampacidad = np.isnan(ampacidad) & (error == "")
+    for i in np.flatnonzero(sin_ampacidad):
+        error[i] = f"Calibre {calibre[i]} no disponible en {fuente_tabla[i]}."
+    sin_impedancia = np.isnan(z) & (error == "")
+    for i in np.flatnonzero(sin_impedancia):
+        if es_charola[i]:
+            error[i] = f"Calibre {calibre[i]} no disponible para charola en Tabla 310-15(b)(20)."
+        else:
+            error[i] = f"Calibre {calibre[i]} no encontrado para {material[i].capitalize()} en {CANALIZACIONES[canal_fila[i]]}."
+
+    # Caída de tensión
+    caida_v = np.where(es_mono, 2 * z * corriente * longitud / 1000, RAIZ_3 * z * corriente * longitud / 1000) / conductores_finales
+    caida_p = (caida_v / voltaje) * 100
+    margen_seguridad = ((ampacidad - corriente_por_conductor) / corriente_por_conductor) * 100
+
+    # Tierra física (Tabla 250-122)
+    calibre_tierra = _CALIBRES_TIERRA[np.searchsorted(_LIMITES_TIERRA, interruptor, side="left")]
+
+    valido = error == ""
+
+    resultado = {
+        'corriente': corriente,
+        'factor_demanda': factor_demanda,
+        'corriente_para_proteccion': corriente_para_proteccion,
+        'corriente_proteccion': corriente_interruptor,
+        'interruptor': interruptor,
+        'calibre': calibre,
+        'indice_calibre': indice_calibre,
+        'calibre_por_ampacidad': _CALIBRES[indice_ampacidad],
+        'num_conductores': conductores_finales,
+        'ampacidad_calibre': ampacidad,
+        'corriente_por_conductor_final': corriente_por_conductor,
+        'fuente_tabla': fuente_tabla,
+        'z': z,
+        'caida_v': caida_v,
+        'caida_p': caida_p,
+        'margen_seguridad': margen_seguridad,
+        'calibre_tierra': calibre_tierra,
+        'limite_caida': limite_caida,
+        'cumple_caida': valido & (caida_p <= limite_caida),
+        'valido': valido,
+        'error': error,
+    }
+    for clave in ('corriente', 'corriente_para_proteccion', 'corriente_proteccion', 'interruptor',
+                  'ampacidad_calibre', 'corriente_por_conductor_final', 'z', 'caida_v', 'caida_p',
+                  'margen_seguridad'):
+        resultado[clave] = np.where(valido, resultado[clave], np.nan)
+    for clave in ('calibre', 'calibre_por_ampacidad', 'fuente_tabla', 'calibre_tierra'):
+        resultado[clave] = np.where(valido, resultado[clave], "")
+    return resultado
+
+
+def _costos_por_combinacion(precios):
+    """Menor costo unitario desde cada calibre hacia arriba, por combinación de tablas.
+
+    Devuelve (costo, indice): para la combinación c y el calibre g, el calibre
+    más barato disponible con índice ≥ g y su costo (inf si no hay ninguno).
+    """
+    costos = costos_por_calibre(precios)
+    costo_calibre = np.array([float(costos.get(c, np.inf)) for c in _CALIBRES])
+    tablas = np.arange(len(_IMPEDANCIAS)) // len(CANALIZACIONES)
+    disponible = ~np.isnan(_AMPACIDADES[tablas]) & ~np.isnan(_IMPEDANCIAS)
+    costo = np.where(disponible, costo_calibre, np.inf)
+
+    indice = np.empty(costo.shape, dtype=int)
+    indice[:, -1] = len(_CALIBRES) - 1
+    for g in range(len(_CALIBRES) - 2, -1, -1):
+        # En empate se conserva el calibre menor, igual que min() en el cálculo escalar
+        menor = costo[:, g] <= costo[:, g + 1]
+        indice[:, g] = np.where(menor, g, indice[:, g + 1])
+        costo[:, g] = np.minimum(costo[:, g], costo[:, g + 1])
+    return costo, indice
+
+
+def optimizar_lote(columnas, max_conductores=4, precios=None, limite_caida=None):
+    """Versión vectorizada de motor_calculo.optimizar_conductores.
+
+    'columnas' son los argumentos de calcular_lote (por ejemplo, los de
+    columnas_desde_datos); num_conductores se ignora. Devuelve el diccionario de
+    calcular_lote de la combinación elegida más 'costo' (NaN si ninguna cumple)
+    y 'optimizado'.
+    """
+    if not NUMPY_AVAILABLE:
+        raise ImportError("Para el cálculo por lotes se requiere la biblioteca 'numpy'.\n\n"
+                          "Instale con: pip install numpy")
+
+    columnas = {clave: valor for clave, valor in columnas.items() if clave != "num_conductores"}
+    if limite_caida is not None:
+        columnas["limite_caida"] = limite_caida
+    n = max(np.size(valor) for valor in columnas.values())
+    columnas = {clave: _columna(valor, n) for clave, valor in columnas.items()}
+
+    _, combinacion_fila, _ = _tablas_por_fila(
+        _columna(columnas.get("material", "cobre"), n).astype(str),
+        _columna(columnas.get("canalizacion", "PVC"), n).astype(str),
+        _columna(columnas.get("temp_conductor", "75 °C"), n).astype(str),
+    )
+    costo_sufijo, indice_sufijo = _costos_por_combinacion(precios)
+    minimo_paralelo = REGISTRO.indice_calibre[REGISTRO.calibre_minimo_paralelo]
+
+    mejor_costo = np.full(n, np.inf)
+    mejor_conductores = np.ones(n, dtype=int)
+    mejor_indice = np.zeros(n, dtype=int)
+    for conductores in range(1, max_conductores + 1):
+        # Poda: solo las filas que aún pueden mejorar con el calibre más barato
+        filas = np.flatnonzero(conductores * costo_sufijo[combinacion_fila, 0] < mejor_costo)
+        if not len(filas):
+            break
+        parcial = calcular_lote(**{clave: valor[filas] for clave, valor in columnas.items()},
+                                num_conductores=conductores, ajustar_caida=True)
+        factible = parcial['cumple_caida'] & (parcial['ampacidad_calibre'] >= parcial['corriente_por_conductor_final'])
+        minimo = parcial['indice_calibre']
+        if conductores > 1:
+            minimo = np.maximum(minimo, minimo_paralelo)
+        combinacion = combinacion_fila[filas]
+        costo = conductores * costo_sufijo[combinacion, minimo]
+        mejora = factible & (costo < mejor_costo[filas])
+        mejor_costo[filas[mejora]] = costo[mejora]
+        mejor_conductores[filas[mejora]] = conductores
+        mejor_indice[filas[mejora]] = indice_sufijo[combinacion[mejora], minimo[mejora]]
+
+    optimizado = np.isfinite(mejor_costo)
+    resultado = calcular_lote(**columnas, num_conductores=mejor_conductores,
+                              calibre_minimo=np.where(optimizado, _CALIBRES[mejor_indice], ""))
+
+    # Sin combinación válida: menor caída posible, como dimensionar_por_caida
+    sin_solucion = np.flatnonzero(~optimizado)
+    if len(sin_solucion):
+        respaldo = calcular_lote(**{clave: valor[sin_solucion] for clave, valor in columnas.items()},
+                                 num_conductores=1, ajustar_caida=True, max_conductores=max_conductores)
+        for clave, valores in respaldo.items():
+            resultado[clave][sin_solucion] = valores
+
+    resultado['costo'] = np.where(optimizado, mejor_costo, np.nan)
+    resultado['optimizado'] = optimizado
+    return resultado
+
+
+def barrido_parametrico(longitudes, voltajes, factores_potencia, valores, tipo_equipo="Motor", unidad="W",
+                        **fijos):
+    """Estudio de sensibilidad sobre la malla longitud × voltaje × fp × valor de carga.
+
+    Cada eje es un escalar o una secuencia (por ejemplo np.linspace); el resto
+    de los datos del circuito se pasan como en calcular_lote y son comunes a
+    toda la malla. Devuelve arreglos con forma (longitudes, voltajes, fp,
+    valores): 'indice_calibre' (posición en REGISTRO.calibres_ordenados, -1 si
+    la combinación no es válida), 'interruptor', 'caida_p', 'margen_seguridad',
+    'cumple_caida' y 'valido', además de 'ejes'.
+    """
+    if not NUMPY_AVAILABLE:
+        raise ImportError("Para el cálculo por lotes se requiere la biblioteca 'numpy'.\n\n"
+                          "Instale con: pip install numpy")
+
+    ejes = {
+        'longitud': np.atleast_1d(np.asarray(longitudes, dtype=float)),
+        'voltaje': np.atleast_1d(np.asarray(voltajes, dtype=float)),
+        'factor_potencia': np.atleast_1d(np.asarray(factores_potencia, dtype=float)),
+        'valor': np.atleast_1d(np.asarray(valores, dtype=float)),
+    }
+    forma = tuple(len(eje) for eje in ejes.values())
+    malla = np.meshgrid(*ejes.values(), indexing='ij')
+
+    resultado = calcular_lote(tipo_equipo, malla[3].ravel(), unidad, malla[1].ravel(), malla[0].ravel(),
+                              factor_potencia=malla[2].ravel(), **fijos)
+    valido = resultado['valido']
+    return {
+        'indice_calibre': np.where(valido, resultado['indice_calibre'], -1).reshape(forma),
+        'interruptor': resultado['interruptor'].reshape(forma),
+        'caida_p': resultado['caida_p'].reshape(forma),
+        'margen_seguridad': resultado['margen_seguridad'].reshape(forma),
+        'cumple_caida': resultado['cumple_caida'].reshape(forma),
+        'valido': valido.reshape(forma),
+        'ejes': ejes,
+    }
@@ -1,7 +1,19 @@
+# Con argumentos se ejecuta la línea de comandos (batch, jsonl, watch), que no requiere tkinter:
+# se despacha antes de importar la interfaz para que funcione en servidores sin Tk
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) > 1:
+        from linea_comandos import main as main_linea_comandos
+        sys.exit(main_linea_comandos(sys.argv[1:]))
+
 import tkinter as tk
-from tkinter import ttk, messagebox
-import math
-from datetime import datetime
+from tkinter import ttk, messagebox, simpledialog
+import getpass
+from collections import deque
+import motor_calculo
+from historial_compacto import EntradaHistorial
+from longitud_maxima import tabla_longitud_maxima
+from tablas_nom import REGISTRO
 
 #Cambio
 class Calculos:
@@ -28,166 +40,46 @@ class Calculos:
         self.root.configure(bg='#f0f0f0')
         
    
-        self.ampacidades_cobre_75 = {
-            "14": 20, "12": 25, "10": 35, "8": 50, "6": 65,
-            "4": 85, "3": 100, "2": 115, "1": 130,
-            "1/0": 150, "2/0": 175, "3/0": 200, "4/0": 230,
-            "250": 255, "300": 285, "350": 310, "400": 335,
-            "500": 380, "600": 420, "750": 475, "1000": 545,
-            "1250": 590, "1500": 625, "1750": 650, "2000": 665
-        }
+        # Tablas NOM compartidas por todas las ventanas (tablas_nom.py)
+        self.ampacidades_cobre_75 = REGISTRO.ampacidades_cobre_75
+        self.ampacidades_cobre_60 = REGISTRO.ampacidades_cobre_60
+        self.ampacidades_cobre_90 = REGISTRO.ampacidades_cobre_90
+        self.ampacidades_aluminio = REGISTRO.ampacidades_aluminio
+        self.ampacidades_charola_cobre_75 = REGISTRO.ampacidades_charola_cobre_75
+        self.ampacidades_charola_cobre_90 = REGISTRO.ampacidades_charola_cobre_90
+        self.ampacidades_charola_aluminio_75 = REGISTRO.ampacidades_charola_aluminio_75
+        self.ampacidades_charola_aluminio_90 = REGISTRO.ampacidades_charola_aluminio_90
+        self.calibre_tierra_fisica = REGISTRO.calibre_tierra_fisica
+        self.interruptores_comerciales = REGISTRO.interruptores_comerciales
+        self.impedancia_cobre = REGISTRO.impedancia_cobre
+        self.impedancia_aluminio = REGISTRO.impedancia_aluminio
+        self.impedancia_charola_cobre = REGISTRO.impedancia_charola_cobre
+        self.impedancia_charola_aluminio = REGISTRO.impedancia_charola_aluminio
 
-        self.ampacidades_cobre_60 = {
-            "14": 15, "12": 20, "10": 30, "8": 40, "6": 55,
-            "4": 70, "3": 85, "2": 95, "1": 110,
-            "1/0": 125, "2/0": 145, "3/0": 165, "4/0": 195,
-            "250": 215, "300": 240, "350": 260, "400": 280,
-            "500": 320, "600": 355, "750": 400, "1000": 455,
-            "1250": 495, "1500": 520, "1750": 545, "2000": 560
-        }
-
-        self.ampacidades_cobre_90 = {
-            "14": 25, "12": 30, "10": 40, "8": 55, "6": 75,
-            "4": 95, "3": 110, "2": 130, "1": 150,
-            "1/0": 170, "2/0": 195, "3/0": 225, "4/0": 260,
-            "250": 290, "300": 320, "350": 350, "400": 380,
-            "500": 430, "600": 475, "750": 535, "1000": 615,
-            "1250": 665, "1500": 700, "1750": 735, "2000": 750
-        }
+        self.historial = self.abrir_historial()
+        self._panel_historial_listo = False
 
-        self.ampacidades_aluminio = {
-            "12": 20, "10": 25, "8": 30, "6": 40, "4": 55, "3": 65, 
-            "2": 75, "1": 85, "1/0": 100, "2/0": 115, "3/0": 130, 
-            "4/0": 150, "250": 170, "300": 190, "350": 210, 
-            "400": 225, "500": 260, "600": 285, "750": 320, "1000": 375,
-            "1250": 405, "1500": 435, "1750": 455, "2000": 470
-        }
-        
-        self.ampacidades_charola_cobre_75 = {
-            "8": 57, "6": 76, "4": 101, "3": 118, "2": 135, "1": 158,
-            "1/0": 183, "2/0": 212, "3/0": 245, "4/0": 287,
-            "250": 320, "300": 359, "350": 397, "400": 430,
-            "500": 496, "600": 553, "700": 610, "750": 638,
-            "800": 660, "900": 704, "1000": 750, "1250": 834,
-            "1500": 909, "1750": 980, "2000": 1042
-        }
+        self.calcular_circuito = self.abrir_cache_resultados()
         
-        self.ampacidades_charola_cobre_90 = {
-            "8": 66, "6": 89, "4": 117, "3": 138, "2": 158, "1": 185,
-            "1/0": 214, "2/0": 247, "3/0": 287, "4/0": 335,
-            "250": 374, "300": 419, "350": 464, "400": 503,
-            "500": 580, "600": 647, "700": 714, "750": 747,
-            "800": 773, "900": 826, "1000": 877, "1250": 975,
-            "1500": 1063, "1750": 1146, "2000": 1219
-        }
-        
-        self.ampacidades_charola_aluminio_75 = {
-            "6": 59, "4": 78, "3": 92, "2": 106, "1": 123,
-            "1/0": 143, "2/0": 165, "3/0": 192, "4/0": 224,
-            "250": 251, "300": 282, "350": 312, "400": 339,
-            "500": 392, "600": 440, "700": 488, "750": 512,
-            "800": 532, "900": 568, "1000": 603, "1250": 669,
-            "1500": 729, "1750": 787, "2000": 837
-        }
-        
-        self.ampacidades_charola_aluminio_90 = {
-            "6": 69, "4": 91, "3": 107, "2": 123, "1": 144,
-            "1/0": 167, "2/0": 193, "3/0": 224, "4/0": 262,
-            "250": 292, "300": 328, "350": 364, "400": 395,
-            "500": 458, "600": 514, "700": 570, "750": 598,
-            "800": 622, "900": 664, "1000": 705, "1250": 782,
-            "1500": 852, "1750": 920, "2000": 979
-        }
-
-        self.calibre_tierra_fisica = {
-            15: "14", 20: "12", 30: "10", 40: "10", 60: "10", 
-            100: "8", 200: "6", 300: "4", 400: "3", 600: "2", 
-            800: "1/0", 1000: "1/0", 1200: "2/0", 1600: "3/0", 
-            2000: "4/0", 2500: "250", 3000: "250", 4000: "350", 
-            5000: "400", 6000: "500"
-        }
-
-        self.historial = []
-        
-        self.interruptores_comerciales = [
-            15, 20, 25, 30, 40, 50, 60, 70, 80, 90, 100, 110, 125, 150, 
-            175, 200, 225, 250, 300, 350, 400, 450, 500, 600, 700, 800, 
-            1000, 1200, 1600, 2000, 2500, 3000, 4000, 5000, 6000
-        ]
+        self.setup_ui()
 
-        self.impedancia_cobre = {
-            "PVC": {
-                "14": 8.9, "12": 5.6, "10": 3.6, "8": 2.26, "6": 1.44,
-                "4": 0.95, "3": 0.75, "2": 0.62, "1": 0.52,
-                "1/0": 0.43, "2/0": 0.36, "3/0": 0.29, "4/0": 0.24,
-                "250": 0.217, "300": 0.194, "350": 0.174, "400": 0.161,
-                "500": 0.141, "600": 0.131, "750": 0.118, "1000": 0.105,
-                "1250": 0.094, "1500": 0.087, "1750": 0.082, "2000": 0.079
-            },
-            "Aluminio": {
-                "14": 9.1, "12": 5.7, "10": 3.7, "8": 2.32, "6": 1.48,
-                "4": 0.97, "3": 0.79, "2": 0.64, "1": 0.54,
-                "1/0": 0.44, "2/0": 0.37, "3/0": 0.302, "4/0": 0.256,
-                "250": 0.23, "300": 0.207, "350": 0.19, "400": 0.174,
-                "500": 0.157, "600": 0.144, "750": 0.131, "1000": 0.118,
-                "1250": 0.108, "1500": 0.101, "1750": 0.096, "2000": 0.093
-            },
-            "Acero": {
-                "14": 9.3, "12": 5.9, "10": 3.8, "8": 2.38, "6": 1.52,
-                "4": 1.01, "3": 0.82, "2": 0.68, "1": 0.56,
-                "1/0": 0.46, "2/0": 0.39, "3/0": 0.315, "4/0": 0.268,
-                "250": 0.24, "300": 0.213, "350": 0.197, "400": 0.184,
-                "500": 0.164, "600": 0.154, "750": 0.141, "1000": 0.131,
-                "1250": 0.124, "1500": 0.119, "1750": 0.116, "2000": 0.114
-            }
-        }
+    def abrir_historial(self):
+        """Historial de la sesión guardado en el almacén SQLite (si no se puede abrir, solo en memoria)."""
+        try:
+            from almacen_historial import AlmacenHistorial, SesionHistorial
+            return SesionHistorial(AlmacenHistorial(), usuario=getpass.getuser())
+        except Exception:
+            return []
 
-        self.impedancia_aluminio = {
-            "PVC": {
-                "12": 5.6, "10": 3.6, "8": 2.26, "6": 1.54,
-                "4": 0.95, "3": 0.82, "2": 0.66, "1": 0.56,
-                "1/0": 0.48, "2/0": 0.40, "3/0": 0.34, "4/0": 0.29,
-                "250": 0.263, "300": 0.239, "350": 0.219, "400": 0.204,
-                "500": 0.183, "600": 0.170, "750": 0.156, "1000": 0.140,
-                "1250": 0.131, "1500": 0.125, "1750": 0.121, "2000": 0.119
-            },
-            "Aluminio": {
-                "12": 5.7, "10": 3.7, "8": 2.32, "6": 1.58,
-                "4": 0.98, "3": 0.85, "2": 0.68, "1": 0.58,
-                "1/0": 0.50, "2/0": 0.42, "3/0": 0.35, "4/0": 0.30,
-                "250": 0.270, "300": 0.245, "350": 0.225, "400": 0.210,
-                "500": 0.188, "600": 0.175, "750": 0.161, "1000": 0.145,
-                "1250": 0.136, "1500": 0.130, "1750": 0.126, "2000": 0.124
-            },
-            "Acero": {
-                "12": 5.9, "10": 3.8, "8": 2.38, "6": 1.62,
-                "4": 1.02, "3": 0.88, "2": 0.72, "1": 0.61,
-                "1/0": 0.53, "2/0": 0.44, "3/0": 0.37, "4/0": 0.32,
-                "250": 0.278, "300": 0.252, "350": 0.232, "400": 0.218,
-                "500": 0.195, "600": 0.185, "750": 0.173, "1000": 0.156,
-                "1250": 0.148, "1500": 0.143, "1750": 0.140, "2000": 0.138
-            }
-        }
-        
-        self.impedancia_charola_cobre = {
-            "8": 2.0, "6": 1.3, "4": 0.85, "3": 0.68, "2": 0.56, "1": 0.47,
-            "1/0": 0.39, "2/0": 0.33, "3/0": 0.26, "4/0": 0.22,
-            "250": 0.195, "300": 0.175, "350": 0.157, "400": 0.145,
-            "500": 0.127, "600": 0.118, "700": 0.109, "750": 0.106,
-            "800": 0.103, "900": 0.098, "1000": 0.095, "1250": 0.085,
-            "1500": 0.078, "1750": 0.074, "2000": 0.071
-        }
-        
-        self.impedancia_charola_aluminio = {
-            "6": 1.42, "4": 0.88, "3": 0.74, "2": 0.60, "1": 0.51,
-            "1/0": 0.44, "2/0": 0.37, "3/0": 0.31, "4/0": 0.26,
-            "250": 0.238, "300": 0.216, "350": 0.198, "400": 0.185,
-            "500": 0.165, "600": 0.153, "700": 0.141, "750": 0.138,
-            "800": 0.135, "900": 0.129, "1000": 0.126, "1250": 0.115,
-            "1500": 0.108, "1750": 0.103, "2000": 0.100
-        }
-        
-        self.setup_ui()
+    def abrir_cache_resultados(self):
+        """Cálculo con la cache en disco compartida con la línea de comandos (si no se puede abrir, sin cache)."""
+        try:
+            from cache_disco import CacheDisco
+            cache = CacheDisco()
+            cache.abrir()
+            return cache
+        except Exception:
+            return motor_calculo.calcular_circuito
     
     def setup_ui(self):
        
@@ -378,6 +270,19 @@ class Calculos:
         self.historial_text.pack(side='left', fill='both', expand=True)
         historial_scrollbar.pack(side='right', fill='y')
         
+        # Referencias rápidas: widget propio, fijo, que no se redibuja con cada cálculo
+        referencias_frame = tk.Frame(historial_frame)
+        referencias_frame.pack(fill='x', pady=(10, 0))
+        
+        self.referencias_text = tk.Text(referencias_frame, font=self.font_small, height=12,
+                                        bg='#f8f9fa', wrap=tk.WORD, state='disabled',
+                                        relief='sunken', bd=2)
+        referencias_scrollbar = tk.Scrollbar(referencias_frame, command=self.referencias_text.yview)
+        self.referencias_text.config(yscrollcommand=referencias_scrollbar.set)
+        
+        self.referencias_text.pack(side='left', fill='both', expand=True)
+        referencias_scrollbar.pack(side='right', fill='y')
+        
        
         historial_btn_frame = tk.Frame(historial_frame, bg='#f0f0f0')
         historial_btn_frame.pack(fill='x', pady=(10, 0))
@@ -403,6 +308,7 @@ class Calculos:
         
         
         self.actualizar_historial_completo()
+        self.mostrar_referencias_rapidas()
         self.mostrar_normativa_inicial()
 
     def setup_formulario_principal(self, parent):
@@ -555,6 +461,12 @@ class Calculos:
                                        bg='#f39c12', fg='white', relief='raised', bd=2,
                                        cursor='hand2')
         calcular_charola_btn.pack(side='left', fill='x', expand=True, padx=2)
+        
+        longitud_maxima_btn = tk.Button(tertiary_buttons, text="📏 Long. máx.", 
+                                      command=self.consultar_longitud_maxima, font=self.font_normal,
+                                      bg='#2980b9', fg='white', relief='raised', bd=2,
+                                      cursor='hand2')
+        longitud_maxima_btn.pack(side='left', fill='x', expand=True, padx=(2, 0))
 
     def mostrar_normativa_inicial(self):
         """Muestra la normativa aplicada en el panel de información."""
@@ -576,33 +488,7 @@ class Calculos:
         return canalizacion == "Charola"
 
     def obtener_ampacidades_correctas(self, material, temp_conductor):
-        es_charola = self.es_instalacion_charola()
-        
-        if es_charola:
-            if material == "cobre":
-                if temp_conductor == "75 °C":
-                    return self.ampacidades_charola_cobre_75, "Tabla 310-15(b)(20) - Charola"
-                elif temp_conductor == "90 °C":
-                    return self.ampacidades_charola_cobre_90, "Tabla 310-15(b)(20) - Charola"
-                else:
-                    return self.ampacidades_charola_cobre_75, "Tabla 310-15(b)(20) - Charola (60°C no disponible, usando 75°C)"
-            else:
-                if temp_conductor == "75 °C":
-                    return self.ampacidades_charola_aluminio_75, "Tabla 310-15(b)(20) - Charola"
-                elif temp_conductor == "90 °C":
-                    return self.ampacidades_charola_aluminio_90, "Tabla 310-15(b)(20) - Charola"
-                else:
-                    return self.ampacidades_charola_aluminio_75, "Tabla 310-15(b)(20) - Charola (60°C no disponible, usando 75°C)"
-        else:
-            if material == "cobre":
-                if temp_conductor == "60 °C":
-                    return self.ampacidades_cobre_60, "Tabla 310-15(b)(16) - Conduit"
-                elif temp_conductor == "75 °C":
-                    return self.ampacidades_cobre_75, "Tabla 310-15(b)(16) - Conduit"
-                else:
-                    return self.ampacidades_cobre_90, "Tabla 310-15(b)(16) - Conduit"
-            else:
-                return self.ampacidades_aluminio, "Tabla 310-15(b)(16) - Conduit"
+        return motor_calculo.obtener_ampacidades_correctas(material, temp_conductor, self.es_instalacion_charola())
 
     def obtener_impedancias_correctas(self, material, canalizacion):
         es_charola = self.es_instalacion_charola()
@@ -619,10 +505,7 @@ class Calculos:
                 return self.impedancia_aluminio[canalizacion], f"Conduit {canalizacion}"
 
     def seleccionar_tierra_fisica(self, corriente_interruptor):
-        for limite in sorted(self.calibre_tierra_fisica.keys()):
-            if corriente_interruptor <= limite:
-                return self.calibre_tierra_fisica[limite]
-        return "500"
+        return motor_calculo.seleccionar_tierra_fisica(corriente_interruptor)
 
     def actualizar_factores(self, event=None):
         tipo = self.tipo_equipo_var.get()
@@ -693,391 +576,74 @@ class Calculos:
             self.fp_entry.config(state='normal')
 
     def calcular_corriente_por_equipo(self, tipo_equipo, valor, unidad, voltaje, tipo_circuito, factor_potencia):
-        if unidad == "A":
-            return float(valor), f"Corriente ingresada directamente: {valor} A"
-        
         eficiencia = float(self.eficiencia_var.get()) if hasattr(self, 'eficiencia_var') else 0.90
-        valor = float(valor)
-        
-        # Aplicar factor de demanda para alimentadores
-        factor_demanda = self.obtener_factor_demanda()
-        
-        if tipo_equipo == "Motor":
-            if unidad == "HP":
-                potencia_mecanica = valor * 746
-                potencia_electrica = potencia_mecanica / eficiencia
-                formula = f"Motor: P_eléctrica = (HP × 746) / η = ({valor} × 746) / {eficiencia} = {potencia_electrica:.0f} W"
-            elif unidad in ["W", "kW"]:
-                potencia_electrica = valor * (1000 if unidad == "kW" else 1)
-                formula = f"Motor: P_eléctrica = {valor} {unidad} = {potencia_electrica:.0f} W"
-            
-            # Aplicar factor de demanda si es alimentador
-            if factor_demanda < 1.0:
-                potencia_electrica *= factor_demanda
-                formula += f"\nFactor de demanda aplicado: {factor_demanda} (Alimentador)"
-                formula += f"\nP_demanda = {potencia_electrica:.0f} W"
-            
-            if tipo_circuito == "monofasico":
-                corriente = potencia_electrica / (voltaje * factor_potencia)
-                formula += f"\nI = P / (V × cos φ) = {potencia_electrica:.0f} / ({voltaje} × {factor_potencia}) = {corriente:.2f} A"
-            else:
-                corriente = potencia_electrica / (math.sqrt(3) * voltaje * factor_potencia)
-                formula += f"\nI = P / (√3 × V × cos φ) = {potencia_electrica:.0f} / (√3 × {voltaje} × {factor_potencia}) = {corriente:.2f} A"
-            
-            return corriente, formula
-            
-        elif tipo_equipo == "Transformador":
-            if unidad == "kVA":
-                potencia_aparente = valor * 1000
-                
-                # Aplicar factor de demanda si es alimentador
-                if factor_demanda < 1.0:
-                    potencia_aparente *= factor_demanda
-                    formula = f"Transformador: S = {valor} kVA × {factor_demanda} (Factor demanda) = {potencia_aparente:.0f} VA"
-                else:
-                    formula = f"Transformador: S = {valor} kVA = {potencia_aparente:.0f} VA"
-                
-                if tipo_circuito == "monofasico":
-                    corriente = potencia_aparente / voltaje
-                    formula += f"\nI = S / V = {potencia_aparente:.0f} / {voltaje} = {corriente:.2f} A"
-                else:
-                    corriente = potencia_aparente / (math.sqrt(3) * voltaje)
-                    formula += f"\nI = S / (√3 × V) = {potencia_aparente:.0f} / (√3 × {voltaje}) = {corriente:.2f} A"
-            elif unidad in ["W", "kW"]:
-                potencia_activa = valor * (1000 if unidad == "kW" else 1)
-                
-                # Aplicar factor de demanda si es alimentador
-                if factor_demanda < 1.0:
-                    potencia_activa *= factor_demanda
-                    formula = f"Transformador: P = {valor} {unidad} × {factor_demanda} (Factor demanda) = {potencia_activa:.0f} W"
-                else:
-                    formula = f"Transformador: P = {valor} {unidad} = {potencia_activa:.0f} W"
-                
-                if tipo_circuito == "monofasico":
-                    corriente = potencia_activa / (voltaje * factor_potencia)
-                    formula += f"\nI = P / (V × cos φ) = {potencia_activa:.0f} / ({voltaje} × {factor_potencia}) = {corriente:.2f} A"
-                else:
-                    corriente = potencia_activa / (math.sqrt(3) * voltaje * factor_potencia)
-                    formula += f"\nI = P / (√3 × V × cos φ) = {potencia_activa:.0f} / (√3 × {voltaje} × {factor_potencia}) = {corriente:.2f} A"
-            
-            return corriente, formula
-        elif tipo_equipo == "Capacitor":
-            # IMPLEMENTACIÓN ESPECÍFICA PARA CAPACITORES
-            if unidad == "kVAR":
-                potencia_reactiva = valor * 1000  # Convertir kVAR a VAR
-                
-                # Aplicar factor de demanda si es alimentador
-                if factor_demanda < 1.0:
-                    potencia_reactiva *= factor_demanda
-                    formula = f"Capacitor: Q = {valor} kVAR × {factor_demanda} (Factor demanda) = {potencia_reactiva:.0f} VAR"
-                else:
-                    formula = f"Capacitor: Q = {valor} kVAR = {potencia_reactiva:.0f} VAR"
-                
-                if tipo_circuito == "monofasico":
-                    corriente = potencia_reactiva / voltaje
-                    formula += f"\nI = Q / V = {potencia_reactiva:.0f} / {voltaje} = {corriente:.2f} A"
-                else:
-                    corriente = potencia_reactiva / (math.sqrt(3) * voltaje)
-                    formula += f"\nI = Q / (√3 × V) = {potencia_reactiva:.0f} / (√3 × {voltaje}) = {corriente:.2f} A"
-                
-                return corriente, formula
-                
-            elif unidad == "A":
-                return float(valor), f"Corriente ingresada directamente: {valor} A"
-            else:
-                raise ValueError("Para capacitores use únicamente kVAR o A como unidad")
-        else:
-            # CARGAS GENÉRICAS (Potencia, Generador, etc.)
-            potencia = valor * (1000 if unidad == "kW" else 1)
-            
-            # Aplicar factor de demanda si es alimentador
-            if factor_demanda < 1.0:
-                potencia *= factor_demanda
-                formula = f"Carga: P = {valor} {unidad} × {factor_demanda} (Factor demanda) = {potencia:.0f} W"
-            else:
-                formula = f"Carga: P = {valor} {unidad} = {potencia:.0f} W"
-            
-            if tipo_circuito == "monofasico":
-                corriente = potencia / (voltaje * factor_potencia)
-                formula += f"\nI = P / (V × cos φ) = {potencia:.0f} / ({voltaje} × {factor_potencia}) = {corriente:.2f} A"
-            else:
-                corriente = potencia / (math.sqrt(3) * voltaje * factor_potencia)
-                formula += f"\nI = P / (√3 × V × cos φ) = {potencia:.0f} / (√3 × {voltaje} × {factor_potencia}) = {corriente:.2f} A"
-            
-            return corriente, formula
+        return motor_calculo.calcular_corriente_por_equipo(
+            tipo_equipo, valor, unidad, voltaje, tipo_circuito, factor_potencia,
+            eficiencia, self.obtener_factor_demanda()
+        )
+
     def obtener_factor_demanda(self):
         """Obtiene el factor de demanda según el tipo de carga y equipo."""
-        tipo_carga = self.tipo_carga_var.get()
-        tipo_equipo = self.tipo_equipo_var.get()
-        
-        if tipo_carga == "alimentador":
-            # Factores de demanda según Art. 220-11 y Tabla 220-11
-            if tipo_equipo == "Motor":
-                return 0.75  # Factor típico para múltiples motores
-            elif tipo_equipo == "Transformador":
-                return 0.85  # Factor para cargas diversas en alimentadores
-            else:
-                return 0.80  # Factor general para alimentadores
-        else:
-            return 1.0  # Sin factor de demanda para circuitos derivados
+        return motor_calculo.obtener_factor_demanda(self.tipo_carga_var.get(), self.tipo_equipo_var.get())
 
     def recomendar_calibre(self, corriente, material, num_conductores=1, temp_conductor="75 °C", es_corriente_directa=False, tipo_equipo="Motor", es_corriente_interruptor=False):
-        ampacidades, fuente_tabla = self.obtener_ampacidades_correctas(material, temp_conductor)
-
-        if not es_corriente_interruptor:
-            if tipo_equipo == "Motor":
-                factor = 1.25
-                factor_aplicado = "1.25 (Art. 430-22 NOM - OBLIGATORIO para motores)"
-            elif tipo_equipo == "Transformador":
-                factor = 1.25
-                factor_aplicado = "1.25 (Art. 450-3 NOM - OBLIGATORIO para transformadores)"
-            elif tipo_equipo == "Capacitor":
-                factor = 1.35
-                factor_aplicado = "1.35 (Art. 460-8 NOM - OBLIGATORIO para capacitores)"
-            elif tipo_equipo == "Generador":
-                factor = 1.15
-                factor_aplicado = "1.15 (Art. 445-5 NOM - OBLIGATORIO para generadores)"
-            else:
-                factor = 1.25
-                factor_aplicado = "1.25 (OBLIGATORIO para cargas generales)"
-            
-            corriente_para_calibre = corriente * factor
-        else:
-            factor = 1.0
-            factor_aplicado = "N/A (ya considerado en interruptor)"
-            corriente_para_calibre = corriente
-
-        corriente_por_conductor = corriente_para_calibre / num_conductores
-
-        calibres_ordenados = [
-            "14", "12", "10", "8", "6", "4", "3", "2", "1",
-            "1/0", "2/0", "3/0", "4/0", "250", "300", "350",
-            "400", "500", "600", "700", "750", "800", "900", "1000", "1250", "1500", "1750", "2000"
-        ]
-
-        for calibre in calibres_ordenados:
-            if calibre in ampacidades and ampacidades[calibre] >= corriente_por_conductor:
-                return calibre, ampacidades[calibre], corriente_por_conductor, corriente_para_calibre, factor_aplicado, fuente_tabla
-
-        calibre_maximo = max(ampacidades.keys(), key=lambda x: ampacidades[x])
-        return calibre_maximo, ampacidades[calibre_maximo], corriente_por_conductor, corriente_para_calibre, factor_aplicado, fuente_tabla
+        return motor_calculo.recomendar_calibre(
+            corriente, material, num_conductores, temp_conductor, tipo_equipo,
+            es_corriente_interruptor, self.es_instalacion_charola()
+        )
 
     def seleccionar_interruptor(self, corriente, tipo_equipo, corriente_para_calibre):
-        if tipo_equipo == "Motor":
-            if corriente <= 30:
-                corriente_interruptor = corriente * 2.5
-                tipo_proteccion = "Termomagnético Tipo D"
-                curva_caracteristica = "Tipo D (arranque de motores)"
-                factor_aplicado = "250% de I_motor (Art. 430-52)"
-            else:
-                corriente_interruptor = corriente * 1.75
-                tipo_proteccion = "Termomagnético Tipo C"
-                curva_caracteristica = "Tipo C (motores grandes)"
-                factor_aplicado = "175% de I_motor (Art. 430-52)"
-                
-        elif tipo_equipo == "Transformador":
-            if corriente <= 9:
-                corriente_interruptor = corriente * 1.67
-                factor_aplicado = "167% de I_trafo (Art. 450-3)"
-            else:
-                corriente_interruptor = corriente * 1.25
-                factor_aplicado = "125% de I_trafo (Art. 450-3)"
-            tipo_proteccion = "Termomagnético Tipo C"
-            curva_caracteristica = "Tipo C (cargas resistivas)"
-            
-        elif tipo_equipo == "Capacitor":
-            corriente_interruptor = corriente * 1.65
-            tipo_proteccion = "Termomagnético Tipo C"
-            curva_caracteristica = "Tipo C (cargas capacitivas)"
-            factor_aplicado = "165% de I_capacitor (Art. 460-8)"
-            
-        elif tipo_equipo == "Generador":
-            corriente_interruptor = corriente * 1.15
-            tipo_proteccion = "Termomagnético Tipo C"
-            curva_caracteristica = "Tipo C (fuente de alimentación)"
-            factor_aplicado = "115% de I_generador (Art. 445-4)"
-            
-        else:
-            corriente_interruptor = corriente_para_calibre
-            tipo_proteccion = "Termomagnético Tipo C"
-            curva_caracteristica = "Tipo C (uso general)"
-            factor_aplicado = "125% de I_carga (aplicado en calibre)"
+        tipo_circuito = self.tipo_circuito_var.get() if hasattr(self, 'tipo_circuito_var') else "trifasico"
+        return motor_calculo.seleccionar_interruptor(corriente, tipo_equipo, corriente_para_calibre, tipo_circuito)
 
-        interruptor_seleccionado = None
-        for capacidad in self.interruptores_comerciales:
-            if capacidad >= corriente_interruptor:
-                interruptor_seleccionado = capacidad
-                break
-        
-        if interruptor_seleccionado is None:
-            interruptor_seleccionado = self.interruptores_comerciales[-1]
-        
-        num_polos = "1P" if hasattr(self, 'tipo_circuito_var') and self.tipo_circuito_var.get() == "monofasico" else "3P"
-        
-        advertencia_interruptor = ""
-        if interruptor_seleccionado < corriente_interruptor:
-            advertencia_interruptor = "⚠️ ADVERTENCIA: No hay interruptor comercial suficiente para la protección requerida"
-        elif tipo_equipo == "Motor" and interruptor_seleccionado > corriente * 3:
-            advertencia_interruptor = "⚠️ NOTA: Verificar coordinación con protección de sobrecarga del motor"
-        
-        return {
-            'capacidad': interruptor_seleccionado,
-            'tipo_proteccion': tipo_proteccion,
-            'curva_caracteristica': curva_caracteristica,
-            'num_polos': num_polos,
-            'corriente_proteccion': corriente_interruptor,
-            'factor_aplicado': factor_aplicado,
-            'advertencia': advertencia_interruptor
-        }
+    def leer_datos_circuito(self):
+        """Construye un DatosCircuito a partir de los campos del formulario."""
+        unidad_potencia = self.unidad_potencia_var.get()
+        if unidad_potencia not in ["A", "kVAR"]:
+            factor_potencia = float(self.fp_var.get()) if self.fp_var.get() else 0.9
+        else:
+            factor_potencia = 1.0
+        
+        return motor_calculo.DatosCircuito(
+            valor_potencia=self.potencia_var.get().strip(),
+            voltaje=float(self.voltaje_var.get()),
+            longitud=float(self.longitud_var.get()),
+            tipo_circuito=self.tipo_circuito_var.get(),
+            tipo_carga=self.tipo_carga_var.get(),
+            tipo_equipo=self.tipo_equipo_var.get(),
+            unidad_potencia=unidad_potencia,
+            factor_potencia=factor_potencia,
+            material=self.material_var.get(),
+            num_conductores=int(self.num_conductores_var.get()),
+            canalizacion=self.canalizacion_var.get(),
+            temp_conductor=self.temperatura_conductor_var.get(),
+            eficiencia=float(self.eficiencia_var.get()) if hasattr(self, 'eficiencia_var') else 0.90
+        )
 
     def calcular(self):
         try:
-            tipo_circuito = self.tipo_circuito_var.get()
-            tipo_carga = self.tipo_carga_var.get()
-            tipo_equipo = self.tipo_equipo_var.get()
-            valor_potencia = self.potencia_var.get().strip()
-            unidad_potencia = self.unidad_potencia_var.get()
-            voltaje = float(self.voltaje_var.get())
-            material = self.material_var.get()
-            longitud = float(self.longitud_var.get())
-            num_conductores = int(self.num_conductores_var.get())
-            canalizacion = self.canalizacion_var.get()
-            temp_conductor = self.temperatura_conductor_var.get()
+            datos = self.leer_datos_circuito()
             
-            if not all([valor_potencia, self.voltaje_var.get(), 
+            if not all([datos.valor_potencia, self.voltaje_var.get(), 
                     self.longitud_var.get(), self.num_conductores_var.get()]):
                 messagebox.showerror("Error", "Por favor, complete todos los campos.")
                 return
             
-            if unidad_potencia not in ["A", "kVAR"]:
-                factor_potencia = float(self.fp_var.get()) if self.fp_var.get() else 0.9
-                if not (0.1 <= factor_potencia <= 1.0):
-                    messagebox.showerror("Error", "Factor de potencia debe estar entre 0.1 y 1.0")
-                    return
-            else:
-                factor_potencia = 1.0
-            
-            corriente, formula_corriente = self.calcular_corriente_por_equipo(
-                tipo_equipo, valor_potencia, unidad_potencia, voltaje, tipo_circuito, factor_potencia
-            )
-            
-            es_corriente_directa = unidad_potencia == "A"
-            
-            # PASO 1: Calcular factor normativo para protección
-            if tipo_equipo == "Motor":
-                factor_proteccion = 1.25
-                factor_aplicado_texto = "1.25 (Art. 430-22 NOM - OBLIGATORIO para motores)"
-            elif tipo_equipo == "Transformador":
-                factor_proteccion = 1.25
-                factor_aplicado_texto = "1.25 (Art. 450-3 NOM - OBLIGATORIO para transformadores)"
-            elif tipo_equipo == "Capacitor":
-                factor_proteccion = 1.35
-                factor_aplicado_texto = "1.35 (Art. 460-8 NOM - OBLIGATORIO para capacitores)"
-            elif tipo_equipo == "Generador":
-                factor_proteccion = 1.15
-                factor_aplicado_texto = "1.15 (Art. 445-5 NOM - OBLIGATORIO para generadores)"
-            else:
-                factor_proteccion = 1.25
-                factor_aplicado_texto = "1.25 (OBLIGATORIO para cargas generales)"
-            
-            corriente_para_proteccion = corriente * factor_proteccion
-            
-            # PASO 2: Seleccionar interruptor basado en corriente con factor
-            interruptor_info = self.seleccionar_interruptor(corriente, tipo_equipo, corriente_para_proteccion)
-            
-            # PASO 3: Usar corriente del interruptor para calcular calibre (SIN volver a aplicar factor)
-            corriente_interruptor = interruptor_info['capacidad']
-            corriente_por_conductor_final = corriente_interruptor / num_conductores
-            
-            # PASO 4: Seleccionar calibre basado en corriente del interruptor
-            calibre_recomendado, ampacidad_calibre, corriente_por_conductor, _, factor_aplicado, fuente_tabla = self.recomendar_calibre(
-                corriente=corriente_interruptor,
-                material=material,
-                num_conductores=num_conductores,
-                temp_conductor=temp_conductor,
-                es_corriente_directa=False,
-                tipo_equipo=tipo_equipo,
-                es_corriente_interruptor=True
-            )
-
-            es_charola = self.es_instalacion_charola()
-            
-            if es_charola:
-                if material == "cobre":
-                    tabla_impedancias = self.impedancia_charola_cobre
-                    tipo_instalacion = "Charola Portacables (Tabla 310-15(b)(20))"
-                else:
-                    tabla_impedancias = self.impedancia_charola_aluminio
-                    tipo_instalacion = "Charola Portacables (Tabla 310-15(b)(20))"
-                
-                if calibre_recomendado not in tabla_impedancias:
-                    messagebox.showerror("Error", f"Calibre {calibre_recomendado} no disponible para charola en Tabla 310-15(b)(20).")
-                    return
-                
-                z_individual = tabla_impedancias[calibre_recomendado]
-            else:
-                canalizacion_clave = canalizacion
-                if canalizacion not in ["PVC", "Acero"]:
-                    canalizacion_clave = "PVC"
-                    
-                if material == "cobre":
-                    if canalizacion_clave in self.impedancia_cobre:
-                        tabla_impedancias = self.impedancia_cobre[canalizacion_clave]
-                        tipo_instalacion = f"Conduit {canalizacion_clave} (Tabla 310-15(b)(16))"
-                    else:
-                        messagebox.showerror("Error", f"Tipo de canalización '{canalizacion_clave}' no encontrado para cobre.")
-                        return
-                else:
-                    if canalizacion_clave in self.impedancia_aluminio:
-                        tabla_impedancias = self.impedancia_aluminio[canalizacion_clave]
-                        tipo_instalacion = f"Conduit {canalizacion_clave} (Tabla 310-15(b)(16))"
-                    else:
-                        messagebox.showerror("Error", f"Tipo de canalización '{canalizacion_clave}' no encontrado para aluminio.")
-                        return
-                
-                if calibre_recomendado not in tabla_impedancias:
-                    messagebox.showerror("Error", f"Calibre {calibre_recomendado} no encontrado para {material.capitalize()} en {canalizacion_clave}.")
-                    return
-                
-                z_individual = tabla_impedancias[calibre_recomendado]
-                
-            if tipo_circuito == "monofasico":
-                caida_v = (2 * z_individual * corriente * longitud / 1000) / num_conductores
-                formula_caida = f"Monofásico: ΔV = (2 × Z × I × L / 1000) / n"
-                calculo_caida = f"ΔV = (2 × {z_individual} × {corriente:.2f} × {longitud} / 1000) / {num_conductores}"
-            else:
-                caida_v = (math.sqrt(3) * z_individual * corriente * longitud / 1000) / num_conductores
-                formula_caida = f"Trifásico: ΔV = (√3 × Z × I × L / 1000) / n"
-                calculo_caida = f"ΔV = (√3 × {z_individual} × {corriente:.2f} × {longitud} / 1000) / {num_conductores}"
-            
-            caida_p = (caida_v / voltaje) * 100
-            
-            mensaje_advertencia = ""
-            margen_seguridad = ((ampacidad_calibre - corriente_por_conductor_final) / corriente_por_conductor_final) * 100
-            
-            if corriente_por_conductor_final > ampacidad_calibre:
-                mensaje_advertencia = "❌ ERROR CRÍTICO: El calibre es INSUFICIENTE para la corriente requerida"
-            elif margen_seguridad < 5:
-                mensaje_advertencia = "⚠️ ADVERTENCIA: El calibre está muy cerca del límite de ampacidad"
-            elif margen_seguridad < 15:
-                mensaje_advertencia = "⚠️ PRECAUCIÓN: Margen de seguridad mínimo"
-            else:
-                mensaje_advertencia = f"✅ CORRECTO: Margen de seguridad del {margen_seguridad:.1f}%"
-            
-            # Calcular calibre de tierra física y mostrar resultados
-            calibre_tierra = self.seleccionar_tierra_fisica(interruptor_info['capacidad'])
+            r = self.calcular_circuito(datos)
             
             # Actualizar labels de tipo de carga e instalación
-            self.actualizar_tipo_instalacion_info(tipo_equipo, tipo_circuito, tipo_carga, canalizacion)
+            self.actualizar_tipo_instalacion_info(datos.tipo_equipo, datos.tipo_circuito, datos.tipo_carga, datos.canalizacion)
             
-            self.mostrar_resultados_completos(caida_p, caida_v, tipo_carga, valor_potencia, unidad_potencia,
-                                    corriente, corriente_para_proteccion, voltaje, calibre_recomendado, 
-                                    material, longitud, num_conductores, canalizacion, tipo_circuito, z_individual, 
-                                    factor_potencia, tipo_equipo, formula_corriente, 
-                                    formula_caida, calculo_caida, ampacidad_calibre,
-                                    corriente_por_conductor_final, mensaje_advertencia, temp_conductor, 
-                                    es_corriente_directa, factor_aplicado_texto, interruptor_info, fuente_tabla, tipo_instalacion, es_charola, calibre_tierra)
+            self.mostrar_resultados_completos(r.caida_p, r.caida_v, datos.tipo_carga, datos.valor_potencia, datos.unidad_potencia,
+                                    r.corriente, r.corriente_para_proteccion, datos.voltaje, r.calibre, 
+                                    datos.material, datos.longitud, datos.num_conductores, datos.canalizacion, datos.tipo_circuito, r.z_individual, 
+                                    r.factor_potencia, datos.tipo_equipo, r.formula_corriente, 
+                                    r.formula_caida, r.calculo_caida, r.ampacidad_calibre,
+                                    r.corriente_por_conductor_final, r.mensaje_advertencia, datos.temp_conductor, 
+                                    r.es_corriente_directa, r.factor_aplicado_texto, r.interruptor_info, r.fuente_tabla, r.tipo_instalacion, r.es_charola, r.calibre_tierra)
             
+        except motor_calculo.ErrorCalculo as e:
+            messagebox.showerror("Error", str(e))
         except ValueError as e:
             messagebox.showerror("Error", f"Error en valores ingresados: {str(e)}")
         except Exception as e:
@@ -1128,7 +694,7 @@ class Calculos:
         resultado += f"CAÍDA DE TENSIÓN: {caida_p:.2f}% ({caida_v:.3f} V)"
         
         # Evaluación normativa CON LÍMITES CORRECTOS
-        limite = 2 if tipo_carga == "alimentador" else 3
+        limite = REGISTRO.limites_caida.get(tipo_carga, REGISTRO.limites_caida["derivado"])
         normativa_ref = "Art. 215-2 FPN 2" if tipo_carga == "alimentador" else "Art. 210-19 FPN 4"
         
         if caida_p <= limite:
@@ -1255,145 +821,180 @@ class Calculos:
                          corriente_por_conductor_final, mensaje_advertencia, temp_conductor, factor_aplicado_texto, 
                          interruptor_info, fuente_tabla, tipo_instalacion, es_charola, calibre_tierra):
         
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        corriente_interruptor = interruptor_info['capacidad']
-        
-        entrada_historial = {
-            'timestamp': timestamp,
-            'tipo_circuito': tipo_circuito,
-            'tipo_carga': tipo_carga,
-            'valor_potencia': valor_potencia,
-            'unidad_potencia': unidad_potencia,
-            'corriente': corriente,
-            'corriente_para_proteccion': corriente_para_proteccion,
-            'corriente_interruptor': corriente_interruptor,
-            'voltaje': voltaje,
-            'calibre': calibre_recomendado,
-            'material': material,
-            'longitud': longitud,
-            'num_conductores': num_conductores,
-            'canalizacion': canalizacion,
-            'z': z_individual,
-            'factor_potencia': factor_potencia,
-            'tipo_equipo': tipo_equipo,
-            'formula_corriente': formula_corriente,
-            'formula_caida': formula_caida,
-            'calculo_caida': calculo_caida,
-            'caida_v': caida_v,
-            'caida_p': caida_p,
-            'ampacidad_calibre': ampacidad_calibre,
-            'corriente_por_conductor_final': corriente_por_conductor_final,
-            'mensaje_advertencia': mensaje_advertencia,
-            'temp_conductor': temp_conductor,
-            'factor_aplicado_texto': factor_aplicado_texto,
-            'interruptor_info': interruptor_info,
-            'fuente_tabla': fuente_tabla,
-            'tipo_instalacion': tipo_instalacion,
-            'es_charola': es_charola,
-            'calibre_tierra': calibre_tierra
-        }
+        # Registro compacto: los textos largos (fórmulas, advertencia, interruptor) se regeneran al consultarlos
+        entrada_historial = EntradaHistorial(
+            tipo_circuito=tipo_circuito,
+            tipo_carga=tipo_carga,
+            valor_potencia=valor_potencia,
+            unidad_potencia=unidad_potencia,
+            corriente=corriente,
+            corriente_para_proteccion=corriente_para_proteccion,
+            corriente_interruptor=interruptor_info['capacidad'],
+            voltaje=voltaje,
+            calibre=calibre_recomendado,
+            material=material,
+            longitud=longitud,
+            num_conductores=num_conductores,
+            canalizacion=canalizacion,
+            z=z_individual,
+            factor_potencia=factor_potencia,
+            tipo_equipo=tipo_equipo,
+            caida_v=caida_v,
+            caida_p=caida_p,
+            ampacidad_calibre=ampacidad_calibre,
+            corriente_por_conductor_final=corriente_por_conductor_final,
+            temp_conductor=temp_conductor,
+            fuente_tabla=fuente_tabla,
+            tipo_instalacion=tipo_instalacion,
+            calibre_tierra=calibre_tierra,
+            eficiencia=float(self.eficiencia_var.get()) if hasattr(self, 'eficiencia_var') else 0.90
+        )
         
         self.historial.append(entrada_historial)
-        self.actualizar_historial_completo()
+        self.agregar_entrada_panel(entrada_historial)
 
     def actualizar_historial_completo(self):
+        """Dibuja el panel con las últimas entradas (al iniciar y después de limpiar el historial)."""
         self.historial_text.config(state='normal')
         self.historial_text.delete('1.0', tk.END)
+        for etiqueta in self.historial_text.tag_names():
+            if etiqueta.startswith('entrada_'):
+                self.historial_text.tag_delete(etiqueta)
+        
+        self.historial_text.insert('1.0', "HISTORIAL DE CÁLCULOS RECIENTES\n" + "=" * 50 + "\n\n")
+        # Las entradas nuevas se insertan en esta marca, arriba de las anteriores
+        self.historial_text.mark_set('entradas', 'end-1c')
+        self.historial_text.mark_gravity('entradas', 'left')
+        self._entradas_panel = deque()
+        
+        total = len(self.historial)
+        for numero, entrada in enumerate(self.historial[-6:], max(total - 6, 0) + 1):
+            self._insertar_entrada_panel(numero, entrada)
+        self._actualizar_anteriores_panel()
+        self._panel_historial_listo = True
         
-        historial_texto = "HISTORIAL DE CÁLCULOS RECIENTES\n"
-        historial_texto += "=" * 50 + "\n\n"
+        self.historial_text.config(state='disabled')
+        self.historial_text.see('1.0')
+
+    def agregar_entrada_panel(self, entrada):
+        """Agrega solo la entrada nueva al panel y retira la más antigua si hay más de 6."""
+        if not self._panel_historial_listo:
+            self.actualizar_historial_completo()
+            return
+        self.historial_text.config(state='normal')
+        self._insertar_entrada_panel(len(self.historial), entrada)
+        self._actualizar_anteriores_panel()
+        self.historial_text.config(state='disabled')
+        self.historial_text.see('1.0')
+
+    def _insertar_entrada_panel(self, numero, entrada):
+        etiqueta = f"entrada_{numero}"
+        self.historial_text.insert('entradas', self.texto_entrada_historial(numero, entrada), etiqueta)
+        self._entradas_panel.appendleft(etiqueta)
+        while len(self._entradas_panel) > 6:
+            antigua = self._entradas_panel.pop()
+            inicio, fin = self.historial_text.tag_ranges(antigua)
+            self.historial_text.delete(inicio, fin)
+            self.historial_text.tag_delete(antigua)
+
+    def _actualizar_anteriores_panel(self):
+        rango = self.historial_text.tag_ranges('anteriores')
+        if rango:
+            self.historial_text.delete(*rango)
+        if len(self.historial) > 6:
+            self.historial_text.insert(tk.END, f"... y {len(self.historial) - 6} cálculos anteriores\n", 'anteriores')
+
+    def texto_entrada_historial(self, numero, entrada):
+        """Texto de una entrada del panel de historial."""
+        texto = f"#{numero} - {entrada['timestamp']} - {entrada['tipo_equipo'].upper()}\n"
+        texto += "-" * 40 + "\n"
         
-        for i, entrada in enumerate(reversed(self.historial[-6:]), 1):
-            historial_texto += f"#{len(self.historial) - i + 1} - {entrada['timestamp']} - {entrada['tipo_equipo'].upper()}\n"
-            historial_texto += "-" * 40 + "\n"
-            
-            # Identificar tipo de carga
-            tipo_carga_hist = entrada.get('tipo_carga', 'derivado')
-            tipo_carga_icon = "🏭" if tipo_carga_hist == "alimentador" else "🔌"
-            
-            historial_texto += f"{tipo_carga_icon} TIPO: {tipo_carga_hist.upper()}\n"
-            historial_texto += f"🎯 SOLUCIÓN: {entrada['calibre']} AWG, "
-            
-            try:
-                if isinstance(entrada['interruptor_info'], dict):
-                    capacidad_interruptor = entrada['interruptor_info']['capacidad']
-                else:
-                    capacidad_interruptor = entrada.get('corriente_interruptor', 'N/A')
-            except:
-                capacidad_interruptor = 'N/A'
-                
-            historial_texto += f"{capacidad_interruptor}A, Tierra: {entrada.get('calibre_tierra', 'N/A')} AWG\n"
-            historial_texto += f"📊 DATOS: {entrada['corriente']:.1f}A → {entrada['corriente_para_proteccion']:.1f}A → INT: {capacidad_interruptor}A\n"
-            
-            # Límite correcto según tipo de carga
-            limite = 2 if tipo_carga_hist == 'alimentador' else 3
-            normativa = "Art. 215-2" if tipo_carga_hist == 'alimentador' else "Art. 210-19"
-            
-            historial_texto += f"🔧 CALIBRE: Basado en corriente del interruptor ({capacidad_interruptor}A), {entrada['caida_p']:.1f}%"
-            
-            if entrada['caida_p'] <= limite:
-                historial_texto += f" ✅ CUMPLE (máx {limite}% {normativa})\n"
-            else:
-                historial_texto += f" ❌ EXCEDE {limite}% ({normativa})\n"
-            
-            historial_texto += f"⚡ ENTRADA: {entrada['valor_potencia']} {entrada['unidad_potencia']}, {entrada['voltaje']}V, {entrada['longitud']}m\n"
-            
-            if entrada.get('es_charola', False):
-                historial_texto += f"🔧 CHAROLA portacables\n"
-            else:
-                historial_texto += f"🔧 CONDUIT {entrada['canalizacion']}\n"
-            
-            # Mostrar factor de demanda si aplica
-            if tipo_carga_hist == 'alimentador':
-                historial_texto += f"📈 Factor demanda aplicado para {tipo_carga_hist}\n"
-            
-            if entrada['mensaje_advertencia'] and ("ERROR" in entrada['mensaje_advertencia'] or "ADVERTENCIA" in entrada['mensaje_advertencia']):
-                historial_texto += f"⚠️ {entrada['mensaje_advertencia']}\n"
-            
-            historial_texto += "\n"
+        # Identificar tipo de carga
+        tipo_carga_hist = entrada.get('tipo_carga', 'derivado')
+        tipo_carga_icon = "🏭" if tipo_carga_hist == "alimentador" else "🔌"
         
-        if len(self.historial) > 6:
-            historial_texto += f"... y {len(self.historial) - 6} cálculos anteriores\n\n"
+        texto += f"{tipo_carga_icon} TIPO: {tipo_carga_hist.upper()}\n"
+        texto += f"🎯 SOLUCIÓN: {entrada['calibre']} AWG, "
         
-        # Referencias técnicas condensadas
-        historial_texto += "REFERENCIAS RÁPIDAS NOM-001-SEDE-2012:\n"
-        historial_texto += "=" * 50 + "\n\n"
+        try:
+            if isinstance(entrada['interruptor_info'], dict):
+                capacidad_interruptor = entrada['interruptor_info']['capacidad']
+            else:
+                capacidad_interruptor = entrada.get('corriente_interruptor', 'N/A')
+        except:
+            capacidad_interruptor = 'N/A'
+            
+        texto += f"{capacidad_interruptor}A, Tierra: {entrada.get('calibre_tierra', 'N/A')} AWG\n"
+        texto += f"📊 DATOS: {entrada['corriente']:.1f}A → {entrada['corriente_para_proteccion']:.1f}A → INT: {capacidad_interruptor}A\n"
         
+        # Límite correcto según tipo de carga
+        limite = REGISTRO.limites_caida.get(tipo_carga_hist, REGISTRO.limites_caida['derivado'])
+        normativa = "Art. 215-2" if tipo_carga_hist == 'alimentador' else "Art. 210-19"
         
-        historial_texto += "🔥 TABLA 250-122 - TIERRA FÍSICA:\n"
-        historial_texto += "15-20A→12-14AWG | 30-60A→10AWG | 100A→8AWG\n"
-        historial_texto += "200A→6AWG | 300A→4AWG | 400A→3AWG\n\n"
+        texto += f"🔧 CALIBRE: Basado en corriente del interruptor ({capacidad_interruptor}A), {entrada['caida_p']:.1f}%"
         
-        historial_texto += "⚡ FACTORES DE SEGURIDAD:\n"
-        historial_texto += "• MOTORES: 1.25× (Art. 430-22)\n"
-        historial_texto += "• TRANSFORMADORES: 1.25× (Art. 450-3)\n"
-        historial_texto += "• CAPACITORES: 1.35× (Art. 460-8)\n"
-        historial_texto += "• GENERADORES: 1.15× (Art. 445-5)\n\n"
+        if entrada['caida_p'] <= limite:
+            texto += f" ✅ CUMPLE (máx {limite}% {normativa})\n"
+        else:
+            texto += f" ❌ EXCEDE {limite}% ({normativa})\n"
         
-        historial_texto += "📋 FACTORES DE PROTECCIÓN:\n"
-        historial_texto += "• MOTORES ≤30A: 2.5× (Tipo D)\n"
-        historial_texto += "• MOTORES >30A: 1.75× (Tipo C)\n"
-        historial_texto += "• TRANSFORMADORES ≤9A: 1.67×\n"
-        historial_texto += "• TRANSFORMADORES >9A: 1.25×\n\n"
+        texto += f"⚡ ENTRADA: {entrada['valor_potencia']} {entrada['unidad_potencia']}, {entrada['voltaje']}V, {entrada['longitud']}m\n"
         
-        historial_texto += "📏 LÍMITES DE CAÍDA DE TENSIÓN:\n"
-        historial_texto += "• Circuitos derivados: 3% máx (Art. 210-19 FPN 4)\n"
-        historial_texto += "• Alimentadores: 2% máx (Art. 215-2 FPN 2)\n\n"
+        if entrada.get('es_charola', False):
+            texto += f"🔧 CHAROLA portacables\n"
+        else:
+            texto += f"🔧 CONDUIT {entrada['canalizacion']}\n"
         
-        historial_texto += "📈 FACTORES DE DEMANDA (Art. 220-11):\n"
-        historial_texto += "• Alimentadores - Motores: 0.75\n"
-        historial_texto += "• Alimentadores - Transformadores: 0.85\n" 
-        historial_texto += "• Alimentadores - Cargas generales: 0.80\n"
-        historial_texto += "• Circuitos derivados: 1.0 (sin factor)\n\n"
+        # Mostrar factor de demanda si aplica
+        if tipo_carga_hist == 'alimentador':
+            texto += f"📈 Factor demanda aplicado para {tipo_carga_hist}\n"
         
-        historial_texto += "🔧 TABLAS IMPLEMENTADAS:\n"
-        historial_texto += "• 310-15(b)(16): Conduit (estándar)\n"
-        historial_texto += "• 310-15(b)(20): Charola portacables\n"
-        historial_texto += "• 250-122: Conductor tierra física\n"
+        if entrada['mensaje_advertencia'] and ("ERROR" in entrada['mensaje_advertencia'] or "ADVERTENCIA" in entrada['mensaje_advertencia']):
+            texto += f"⚠️ {entrada['mensaje_advertencia']}\n"
         
-        self.historial_text.insert('1.0', historial_texto)
-        self.historial_text.config(state='disabled')
-        self.historial_text.see('1.0')
+        texto += "\n"
+        return texto
+
+    def mostrar_referencias_rapidas(self):
+        """Bloque fijo de referencias NOM-001-SEDE-2012 (se dibuja una sola vez)."""
+        texto = "REFERENCIAS RÁPIDAS NOM-001-SEDE-2012:\n"
+        texto += "=" * 50 + "\n\n"
+        
+        
+        texto += "🔥 TABLA 250-122 - TIERRA FÍSICA:\n"
+        texto += "15-20A→12-14AWG | 30-60A→10AWG | 100A→8AWG\n"
+        texto += "200A→6AWG | 300A→4AWG | 400A→3AWG\n\n"
+        
+        texto += "⚡ FACTORES DE SEGURIDAD:\n"
+        texto += "• MOTORES: 1.25× (Art. 430-22)\n"
+        texto += "• TRANSFORMADORES: 1.25× (Art. 450-3)\n"
+        texto += "• CAPACITORES: 1.35× (Art. 460-8)\n"
+        texto += "• GENERADORES: 1.15× (Art. 445-5)\n\n"
+        
+        texto += "📋 FACTORES DE PROTECCIÓN:\n"
+        texto += "• MOTORES ≤30A: 2.5× (Tipo D)\n"
+        texto += "• MOTORES >30A: 1.75× (Tipo C)\n"
+        texto += "• TRANSFORMADORES ≤9A: 1.67×\n"
+        texto += "• TRANSFORMADORES >9A: 1.25×\n\n"
+        
+        texto += "📏 LÍMITES DE CAÍDA DE TENSIÓN:\n"
+        texto += "• Circuitos derivados: 3% máx (Art. 210-19 FPN 4)\n"
+        texto += "• Alimentadores: 2% máx (Art. 215-2 FPN 2)\n\n"
+        
+        texto += "📈 FACTORES DE DEMANDA (Art. 220-11):\n"
+        texto += "• Alimentadores - Motores: 0.75\n"
+        texto += "• Alimentadores - Transformadores: 0.85\n" 
+        texto += "• Alimentadores - Cargas generales: 0.80\n"
+        texto += "• Circuitos derivados: 1.0 (sin factor)\n\n"
+        
+        texto += "🔧 TABLAS IMPLEMENTADAS:\n"
+        texto += "• 310-15(b)(16): Conduit (estándar)\n"
+        texto += "• 310-15(b)(20): Charola portacables\n"
+        texto += "• 250-122: Conductor tierra física\n"
+        
+        self.referencias_text.config(state='normal')
+        self.referencias_text.insert('1.0', texto)
+        self.referencias_text.config(state='disabled')
 
     def limpiar_campos(self):
         self.potencia_var.set("")
@@ -1457,6 +1058,40 @@ Presione 'CALCULAR' para experimentar la metodología mejorada."""
         
         messagebox.showinfo("Configuración para Charola", info_msg)
 
+    def consultar_longitud_maxima(self):
+        """Muestra la longitud máxima por calibre para la corriente y los datos del formulario."""
+        try:
+            voltaje = float(self.voltaje_var.get())
+            num_conductores = int(self.num_conductores_var.get() or 1)
+        except ValueError:
+            messagebox.showerror("Error", "Indique la tensión nominal y los conductores por fase.")
+            return
+
+        corriente_inicial = self.historial[-1]['corriente'] if self.historial else None
+        corriente = simpledialog.askfloat("Longitud máxima", "Corriente del circuito (A):",
+                                          initialvalue=corriente_inicial, minvalue=0.1, parent=self.root)
+        if corriente is None:
+            return
+
+        tipo_circuito = self.tipo_circuito_var.get()
+        tipo_carga = self.tipo_carga_var.get()
+        canalizacion = self.canalizacion_var.get()
+        material = self.material_var.get()
+        limite = REGISTRO.limites_caida.get(tipo_carga, REGISTRO.limites_caida["derivado"])
+
+        try:
+            longitudes = tabla_longitud_maxima(limite).por_calibre(corriente, voltaje, tipo_circuito, canalizacion,
+                                                                   material, num_conductores)
+        except motor_calculo.ErrorCalculo as e:
+            messagebox.showerror("Error", str(e))
+            return
+
+        lineas = [f"{calibre:>6} AWG/kcmil   {metros:>10.1f} m" for calibre, metros in longitudes.items()]
+        encabezado = (f"LONGITUD MÁXIMA PARA CAÍDA ≤ {limite}%\n"
+                      f"{corriente:.2f} A • {voltaje:g} V • {tipo_circuito} • {material} • {canalizacion} • "
+                      f"{num_conductores} conductor(es) por fase\n\n")
+        messagebox.showinfo("Longitud máxima", encabezado + "\n".join(lineas))
+
     def exportar_a_pdf(self):
         try:
             # Verificar que hay cálculos
@@ -1492,6 +1127,10 @@ Presione 'CALCULAR' para experimentar la metodología mejorada."""
     def cerrar_aplicacion(self, event=None):
         """Cierra la aplicación de forma segura."""
         if messagebox.askokcancel("Salir", "¿Está seguro que desea cerrar la aplicación?"):
+            if hasattr(self.calcular_circuito, "cerrar"):
+                self.calcular_circuito.cerrar()
+            if hasattr(self.historial, "almacen"):
+                self.historial.almacen.cerrar()
             self.root.quit()
 
     def mostrar_acerca_de(self):
@@ -1525,6 +1164,7 @@ NORMATIVAS APLICADAS:
         
     def limpiar_historial(self):
         self.historial.clear()
+        self._panel_historial_listo = False
         self.historial_text.config(state='normal')
         self.historial_text.delete('1.0', tk.END)
         self.historial_text.insert('1.0', """Historial limpiado.
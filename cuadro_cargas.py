@@ -0,0 +1,271 @@
+# CUADRO_CARGAS.PY - LECTURA Y CÁLCULO DE CUADROS DE CARGAS POR FILAS
+#
+# Convierte filas de un cuadro de cargas (diccionarios columna → valor, como los
+# de csv.DictReader) en DatosCircuito, las pasa por motor_calculo y produce las
+# filas de salida una por una, de modo que la memoria no depende del tamaño
+# del archivo.
+
+import csv
+import json
+import re
+import unicodedata
+from collections import deque
+from dataclasses import fields
+from functools import lru_cache
+
+from cache_calculo import CacheCalculos
+from motor_calculo import DatosCircuito, ErrorCalculo, calcular_circuito, entrada_historial
+
+# Columnas de entrada: nombres de los campos de DatosCircuito
+CAMPOS_OBLIGATORIOS = ("valor_potencia", "voltaje", "longitud")
+CONVERSIONES = {
+    "voltaje": float,
+    "longitud": float,
+    "factor_potencia": float,
+    "num_conductores": int,
+    "eficiencia": float,
+}
+COLUMNAS_ENTRADA = tuple(campo.name for campo in fields(DatosCircuito))
+
+# Encabezados habituales en los cuadros de cargas de clientes (ya normalizados)
+ALIAS_COLUMNAS = {
+    "potencia": "valor_potencia", "carga": "valor_potencia", "valor": "valor_potencia",
+    "unidad": "unidad_potencia", "unidades": "unidad_potencia",
+    "tension": "voltaje", "tension_nominal": "voltaje", "v": "voltaje",
+    "distancia": "longitud", "longitud_del_circuito": "longitud",
+    "fases": "tipo_circuito", "sistema": "tipo_circuito", "tipo_de_circuito": "tipo_circuito",
+    "tipo_de_carga": "tipo_carga",
+    "equipo": "tipo_equipo", "tipo_de_equipo": "tipo_equipo",
+    "fp": "factor_potencia", "cos_phi": "factor_potencia", "factor_de_potencia": "factor_potencia",
+    "conductor": "material", "material_del_conductor": "material",
+    "conductores_por_fase": "num_conductores", "hilos_por_fase": "num_conductores",
+    "instalacion": "canalizacion", "tipo_de_instalacion": "canalizacion",
+    "temperatura": "temp_conductor", "temperatura_del_conductor": "temp_conductor",
+}
+
+# Valores equivalentes por columna (claves normalizadas)
+ALIAS_VALORES = {
+    "tipo_circuito": {"monofasico": "monofasico", "1f": "monofasico", "1": "monofasico",
+                      "trifasico": "trifasico", "3f": "trifasico", "3": "trifasico"},
+    "tipo_carga": {"derivado": "derivado", "circuitoderivado": "derivado", "alimentador": "alimentador"},
+    "tipo_equipo": {"motor": "Motor", "transformador": "Transformador", "potencia": "Potencia",
+                    "interruptor": "Interruptor", "capacitor": "Capacitor", "generador": "Generador"},
+    "unidad_potencia": {"w": "W", "kw": "kW", "kva": "kVA", "a": "A", "hp": "HP", "kvar": "kVAR"},
+    "material": {"cobre": "cobre", "cu": "cobre", "aluminio": "aluminio", "al": "aluminio"},
+    "canalizacion": {"pvc": "PVC", "acero": "Acero", "charola": "Charola"},
+}
+
+
+def _normalizar(texto):
+    texto = unicodedata.normalize("NFKD", str(texto)).encode("ascii", "ignore").decode("ascii")
+    return texto.strip().lower()
+
+
+@lru_cache(maxsize=1024)
+def normalizar_columna(nombre):
+    """Nombre de campo de DatosCircuito para un encabezado (sin acentos, unidades ni mayúsculas)."""
+    clave = re.sub(r"\s*\(.*?\)", "", _normalizar(nombre))
+    clave = re.sub(r"[\s\-]+", "_", clave.strip())
+    return ALIAS_COLUMNAS.get(clave, clave)
+
+
+def normalizar_valor(campo, valor):
+    """Convierte variantes de escritura ("Trifásico", "Cu", "75") al valor que usa el formulario."""
+    if campo == "temp_conductor" or campo in ALIAS_VALORES:
+        return _normalizar_valor_texto(campo, str(valor))
+    return valor
+
+
+@lru_cache(maxsize=4096)
+def _normalizar_valor_texto(campo, valor):
+    if campo == "temp_conductor":
+        grados = re.match(r"\s*(\d+)", valor)
+        return f"{grados.group(1)} °C" if grados else valor
+    return ALIAS_VALORES[campo].get(re.sub(r"[\s\-_]+", "", _normalizar(valor)), valor)
+
+
+# Columnas agregadas a cada fila de salida
+COLUMNAS_RESULTADO = (
+    "corriente", "corriente_para_proteccion", "interruptor", "calibre", "conductores_por_fase",
+    "ampacidad_calibre", "z", "caida_v", "caida_p", "limite_caida", "cumple_caida",
+    "calibre_tierra", "fuente_tabla", "mensaje_advertencia", "error",
+)
+
+
+def datos_desde_fila(fila):
+    """Construye un DatosCircuito desde una fila; las columnas vacías toman el valor por defecto."""
+    valores = {}
+    for columna, valor in fila.items():
+        if columna is None:
+            continue
+        campo = normalizar_columna(columna)
+        if campo not in COLUMNAS_ENTRADA or valor is None or str(valor).strip() == "":
+            continue
+        valor = normalizar_valor(campo, valor.strip() if isinstance(valor, str) else valor)
+        valores[campo] = CONVERSIONES[campo](valor) if campo in CONVERSIONES else str(valor)
+
+    faltantes = [campo for campo in CAMPOS_OBLIGATORIOS if campo not in valores]
+    if faltantes:
+        raise ErrorCalculo(f"Faltan datos obligatorios: {', '.join(faltantes)}")
+    return DatosCircuito(**valores)
+
+
+def describir_error(e):
+    """Mensaje de error con el mismo texto que muestra Calculos.calcular."""
+    if isinstance(e, ErrorCalculo):
+        return str(e)
+    if isinstance(e, ValueError):
+        return f"Error en valores ingresados: {e}"
+    return f"Error en el cálculo: {e}"
+
+
+def fila_resultado(fila, resultado, error=""):
+    """Fila de salida: columnas de entrada más las columnas de COLUMNAS_RESULTADO."""
+    salida = dict(fila)
+    if resultado is None:
+        salida.update({columna: "" for columna in COLUMNAS_RESULTADO})
+    else:
+        salida.update({
+            "corriente": resultado.corriente,
+            "corriente_para_proteccion": resultado.corriente_para_proteccion,
+            "interruptor": resultado.interruptor_info['capacidad'],
+            "calibre": resultado.calibre,
+            "conductores_por_fase": resultado.datos.num_conductores,
+            "ampacidad_calibre": resultado.ampacidad_calibre,
+            "z": resultado.z_individual,
+            "caida_v": resultado.caida_v,
+            "caida_p": resultado.caida_p,
+            "limite_caida": resultado.limite_caida,
+            "cumple_caida": resultado.cumple_caida,
+            "calibre_tierra": resultado.calibre_tierra,
+            "fuente_tabla": resultado.fuente_tabla,
+            "mensaje_advertencia": resultado.mensaje_advertencia,
+        })
+    salida["error"] = error
+    return salida
+
+
+def procesar_filas(filas, funcion_calculo=calcular_circuito, procesos=1, tamano_bloque=2000,
+                   convertir=datos_desde_fila):
+    """Calcula cada fila del cuadro; genera (fila, resultado, error) en el orden de entrada.
+
+    convertir transforma cada fila en DatosCircuito. Con procesos > 1 el cálculo
+    se reparte con lote_paralelo.calcular_en_paralelo.
+    """
+    if procesos > 1:
+        yield from _procesar_filas_en_paralelo(filas, funcion_calculo, procesos, tamano_bloque, convertir)
+        return
+
+    cache = CacheCalculos(funcion_calculo=funcion_calculo)
+    for fila in filas:
+        try:
+            yield fila, cache.calcular(convertir(fila)), ""
+        except Exception as e:
+            yield fila, None, describir_error(e)
+
+
+def _procesar_filas_en_paralelo(filas, funcion_calculo, procesos, tamano_bloque, convertir):
+    from lote_paralelo import calcular_en_paralelo
+
+    # Filas leídas y aún no entregadas; las que no se pudieron convertir esperan su turno aquí
+    en_espera = deque()
+
+    def datos_validos():
+        for fila in filas:
+            try:
+                datos = convertir(fila)
+            except Exception as e:
+                en_espera.append((fila, describir_error(e)))
+                continue
+            en_espera.append((fila, ""))
+            yield datos
+
+    for _, resultado, error in calcular_en_paralelo(datos_validos(), tamano_bloque, procesos, funcion_calculo):
+        while en_espera[0][1]:
+            fila, error_fila = en_espera.popleft()
+            yield fila, None, error_fila
+        fila, _ = en_espera.popleft()
+        yield fila, resultado, error
+    while en_espera:
+        fila, error = en_espera.popleft()
+        yield fila, None, error
+
+
+def escribir_resultados_csv(filas, columnas, salida, funcion_calculo=calcular_circuito, procesos=1,
+                            tamano_bloque=2000, delimitador=",", al_calcular=None):
+    """Calcula las filas y escribe el resultado CSV conforme avanza; devuelve (filas, errores).
+
+    al_calcular, si se indica, recibe (fila, resultado, error) de cada circuito.
+    """
+    columnas = list(columnas)
+    escritor = csv.DictWriter(salida, columnas + [c for c in COLUMNAS_RESULTADO if c not in columnas],
+                              delimiter=delimitador, extrasaction="ignore")
+    escritor.writeheader()
+
+    total = errores = 0
+    for fila, resultado, error in procesar_filas(filas, funcion_calculo, procesos, tamano_bloque):
+        escritor.writerow(fila_resultado(fila, resultado, error))
+        if al_calcular is not None:
+            al_calcular(fila, resultado, error)
+        total += 1
+        errores += bool(error)
+    return total, errores
+
+
+def calcular_csv(entrada, salida, funcion_calculo=calcular_circuito, procesos=1, tamano_bloque=2000,
+                 delimitador=","):
+    """Lee un cuadro de cargas CSV y escribe el resultado fila por fila; devuelve (filas, errores)."""
+    lector = csv.DictReader(entrada, delimiter=delimitador)
+    return escribir_resultados_csv(lector, lector.fieldnames or [], salida, funcion_calculo, procesos,
+                                   tamano_bloque, delimitador)
+
+
+def datos_desde_json(linea):
+    """DatosCircuito desde una línea JSON con un objeto por circuito."""
+    return _datos_desde_objeto(json.loads(linea))
+
+
+def _datos_desde_objeto(objeto):
+    if not isinstance(objeto, dict):
+        raise ErrorCalculo("Cada línea debe contener un objeto JSON con los datos del circuito.")
+    return datos_desde_fila(objeto)
+
+
+def _leer_linea_json(numero, linea):
+    """(número, objeto, error de lectura): cada línea se interpreta una sola vez."""
+    try:
+        return numero, json.loads(linea), None
+    except ValueError as e:
+        return numero, None, e
+
+
+def _datos_desde_linea(leida):
+    _, objeto, error = leida
+    if error is not None:
+        raise error
+    return _datos_desde_objeto(objeto)
+
+
+def calcular_jsonl(entrada, salida, funcion_calculo=calcular_circuito, procesos=1, tamano_bloque=2000):
+    """Un circuito por línea JSON; escribe por línea el registro de entrada_historial.
+
+    Las claves de entrada que no son datos del circuito (por ejemplo un
+    identificador) se copian a la salida. Las líneas no válidas producen
+    {"linea": n, "error": mensaje}. Devuelve (líneas, errores).
+    """
+    lineas = (_leer_linea_json(numero, linea) for numero, linea in enumerate(entrada, 1) if linea.strip())
+    total = errores = 0
+    for (numero, objeto, _), resultado, error in procesar_filas(lineas, funcion_calculo, procesos, tamano_bloque,
+                                                                _datos_desde_linea):
+        total += 1
+        if error:
+            errores += 1
+            registro = {'linea': numero, 'error': error}
+        else:
+            registro = entrada_historial(resultado)
+        if isinstance(objeto, dict):
+            for clave, valor in objeto.items():
+                if normalizar_columna(clave) not in COLUMNAS_ENTRADA:
+                    registro.setdefault(clave, valor)
+        salida.write(json.dumps(registro, ensure_ascii=False) + "\n")
+    return total, errores
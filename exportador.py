@@ -5,6 +5,8 @@ from tkinter import filedialog, messagebox, ttk
 from datetime import datetime
 import os
 import locale
+from tablas_nom import REGISTRO
+from almacen_historial import resumen_historial
 
 # Configurar locale para fechas en español
 try:
@@ -483,26 +485,17 @@ class ExportadorPDF:
         
         # Resumen ejecutivo
         story.append(Paragraph("RESUMEN EJECUTIVO", section_style))
-        story.append(Paragraph(f"Total de cálculos realizados: {len(self.historial)}", normal_style))
-        
-        # Estadísticas del proyecto
-        equipos = set()
-        tipos_carga = set()
-        cumplimiento = {'cumple': 0, 'no_cumple': 0}
-        
-        for calculo in self.historial:
-            equipos.add(calculo.get('tipo_equipo', 'N/A'))
-            tipos_carga.add(calculo.get('tipo_carga', 'derivado'))
-            
-            limite = 2 if calculo.get('tipo_carga') == 'alimentador' else 3
-            if calculo.get('caida_p', 0) <= limite:
-                cumplimiento['cumple'] += 1
-            else:
-                cumplimiento['no_cumple'] += 1
-        
-        story.append(Paragraph(f"Equipos analizados: {', '.join(sorted(equipos))}", normal_style))
-        story.append(Paragraph(f"Tipos de circuitos: {', '.join(sorted(tipos_carga)).upper()}", normal_style))
-        story.append(Paragraph(f"Cumplimiento normativo: {cumplimiento['cumple']} de {len(self.historial)} cálculos cumplen con los límites establecidos", normal_style))
+        # Estadísticas del proyecto: conteos mantenidos por el historial o consulta agrupada del almacén
+        resumen = resumen_historial(self.historial)
+        story.append(Paragraph(f"Total de cálculos realizados: {resumen.total}", normal_style))
+        
+        story.append(Paragraph(f"Equipos analizados: {', '.join(sorted(resumen.equipos))}", normal_style))
+        story.append(Paragraph(f"Tipos de circuitos: {', '.join(sorted(resumen.tipos_carga)).upper()}", normal_style))
+        story.append(Paragraph(f"Cumplimiento normativo: {resumen.cumple} de {resumen.total} cálculos cumplen con los límites establecidos", normal_style))
+        for limite, conteo in sorted(resumen.cumplimiento.items()):
+            story.append(Paragraph(f"Límite de caída de tensión {limite:g}%: {conteo['cumple']} de {conteo['cumple'] + conteo['no_cumple']} cumplen", normal_style))
+        calibres = ', '.join(f"{calibre} AWG ({cantidad})" for calibre, cantidad in resumen.calibres.most_common())
+        story.append(Paragraph(f"Calibres utilizados: {calibres}", normal_style))
         story.append(Spacer(1, 20))
         
         # OBJETIVO Y ALCANCE
@@ -708,7 +701,7 @@ class ExportadorPDF:
             
             # Evaluación normativa
             tipo_carga = calculo.get('tipo_carga', 'derivado')
-            limite = 2 if tipo_carga == 'alimentador' else 3
+            limite = REGISTRO.limites_caida.get(tipo_carga, REGISTRO.limites_caida['derivado'])
             normativa = "Art. 215-2" if tipo_carga == 'alimentador' else "Art. 210-19"
             cumple = "✓ CUMPLE" if calculo.get('caida_p', 0) <= limite else "✗ EXCEDE"
             
@@ -788,7 +781,7 @@ class ExportadorPDF:
         story.append(Paragraph("CONCLUSIONES:", bold_style))
         conclusiones_text = f"""Con base en los cálculos realizados y presentados en este documento, se concluye que:
 
-1. Se analizaron un total de {len(self.historial)} circuitos eléctricos, de los cuales {cumplimiento['cumple']} cumplen con los límites normativos de caída de tensión establecidos.
+1. Se analizaron un total de {resumen.total} circuitos eléctricos, de los cuales {resumen.cumple} cumplen con los límites normativos de caída de tensión establecidos.
 
 2. La metodología aplicada garantiza el cumplimiento de la NOM-001-SEDE-2012 en todos sus aspectos técnicos relevantes.
 
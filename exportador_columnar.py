@@ -0,0 +1,261 @@
+# EXPORTADOR_COLUMNAR.PY - EXPORTACIÓN DE RESULTADOS A PARQUET / ARROW IPC
+#
+# Escribe los resultados de cálculos por lotes en formato columnar, por lotes
+# de registros (record batches), para analizarlos con pandas o polars. Las
+# columnas de texto repetitivo (calibre, canalización, tipo de equipo, ...) se
+# guardan con codificación de diccionario.
+
+import inspect
+import math
+
+from cuadro_cargas import COLUMNAS_ENTRADA, datos_desde_fila, normalizar_columna, procesar_filas
+from motor_calculo import calcular_circuito
+
+# Importar pyarrow para escribir Parquet y Arrow IPC
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Columnas exportadas: (nombre, tipo) con tipo "diccionario", "real", "entero", "logico" o "texto"
+COLUMNAS = (
+    ("escenario", "diccionario"),
+    ("tipo_equipo", "diccionario"),
+    ("valor_potencia", "real"),
+    ("unidad_potencia", "diccionario"),
+    ("voltaje", "real"),
+    ("longitud", "real"),
+    ("tipo_circuito", "diccionario"),
+    ("tipo_carga", "diccionario"),
+    ("factor_potencia", "real"),
+    ("material", "diccionario"),
+    ("canalizacion", "diccionario"),
+    ("temp_conductor", "diccionario"),
+    ("eficiencia", "real"),
+    ("corriente", "real"),
+    ("corriente_para_proteccion", "real"),
+    ("interruptor", "real"),
+    ("calibre", "diccionario"),
+    ("num_conductores", "entero"),
+    ("ampacidad_calibre", "real"),
+    ("z", "real"),
+    ("caida_v", "real"),
+    ("caida_p", "real"),
+    ("limite_caida", "real"),
+    ("cumple_caida", "logico"),
+    ("margen_seguridad", "real"),
+    ("calibre_tierra", "diccionario"),
+    ("fuente_tabla", "diccionario"),
+    ("error", "texto"),
+)
+
+FORMATOS = {".parquet": "parquet", ".pq": "parquet", ".arrow": "arrow", ".feather": "arrow", ".ipc": "arrow"}
+
+
+def formato_por_extension(ruta):
+    """'parquet' o 'arrow' según la extensión del archivo; None si no es columnar."""
+    ruta = str(ruta).lower()
+    for extension, formato in FORMATOS.items():
+        if ruta.endswith(extension):
+            return formato
+    return None
+
+
+def _real(valor):
+    try:
+        valor = float(valor)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(valor) else valor
+
+
+class EscritorColumnar:
+    """Escribe resultados en Parquet o Arrow IPC por lotes de 'tamano_lote' filas.
+
+    Los diccionarios de cada columna crecen conforme aparecen valores nuevos;
+    en Arrow IPC se emiten como deltas, por lo que el archivo es válido para
+    cualquier lector de Arrow.
+    """
+
+    def __init__(self, ruta, formato=None, tamano_lote=65536, escenario=None, columnas_extra=()):
+        if not PYARROW_AVAILABLE:
+            raise ImportError("Para exportar a Parquet o Arrow se requiere la biblioteca 'pyarrow'.\n\n"
+                              "Instale con: pip install pyarrow")
+
+        self.formato = formato or formato_por_extension(ruta) or "parquet"
+        if self.formato not in ("parquet", "arrow"):
+            raise ValueError(f"Formato columnar no soportado: {self.formato}")
+        self.tamano_lote = tamano_lote
+        self.escenario = escenario
+        self.columnas = COLUMNAS + tuple((nombre, "texto") for nombre in columnas_extra
+                                         if nombre not in dict(COLUMNAS))
+        tipos = {
+            "diccionario": pa.dictionary(pa.int32(), pa.string()),
+            "real": pa.float64(),
+            "entero": pa.int16(),
+            "logico": pa.bool_(),
+            "texto": pa.string(),
+        }
+        self.esquema = pa.schema([(nombre, tipos[tipo]) for nombre, tipo in self.columnas])
+        self._nombres_base = set(dict(COLUMNAS))
+        self._diccionarios = {nombre: {} for nombre, tipo in self.columnas if tipo == "diccionario"}
+        self._pendientes = {nombre: [] for nombre, _ in self.columnas}
+        self.filas_escritas = 0
+
+        if self.formato == "parquet":
+            self._escritor = pq.ParquetWriter(ruta, self.esquema)
+        else:
+            opciones = pa_ipc.IpcWriteOptions(compression="zstd", emit_dictionary_deltas=True)
+            self._escritor = pa_ipc.new_file(ruta, self.esquema, options=opciones)
+
+    def _arreglo(self, nombre, tipo, valores):
+        if tipo == "diccionario":
+            diccionario = self._diccionarios[nombre]
+            # Códigos por valor distinto del lote; los valores nuevos amplían el diccionario
+            codigos = {}
+            for valor in set(valores):
+                if valor is None or valor == "":
+                    codigos[valor] = None
+                    continue
+                texto = str(valor)
+                if texto not in diccionario:
+                    diccionario[texto] = len(diccionario)
+                codigos[valor] = diccionario[texto]
+            return pa.DictionaryArray.from_arrays(pa.array([codigos[valor] for valor in valores], pa.int32()),
+                                                  pa.array(list(diccionario), pa.string()))
+        if tipo == "real":
+            if getattr(valores, "dtype", None) is not None and valores.dtype.kind == "f":
+                return pa.array(valores, pa.float64(), from_pandas=True)
+            return pa.array([_real(valor) for valor in valores], pa.float64())
+        if tipo == "entero":
+            return pa.array([None if valor is None else int(valor) for valor in valores], pa.int16())
+        if tipo == "logico":
+            return pa.array([None if valor is None else bool(valor) for valor in valores], pa.bool_())
+        return pa.array([None if valor is None or valor == "" else str(valor) for valor in valores], pa.string())
+
+    def escribir_columnas(self, columnas):
+        """Escribe un lote dado como diccionario columna → secuencia (faltantes quedan nulas)."""
+        filas = max((len(valores) for valores in columnas.values()), default=0)
+        if not filas:
+            return
+        if self.escenario is not None and "escenario" not in columnas:
+            columnas = dict(columnas, escenario=[self.escenario] * filas)
+        arreglos = [self._arreglo(nombre, tipo, columnas.get(nombre, [None] * filas))
+                    for nombre, tipo in self.columnas]
+        self._escritor.write_batch(pa.record_batch(arreglos, schema=self.esquema))
+        self.filas_escritas += filas
+
+    def agregar(self, datos, resultado, error="", extras=None):
+        """Agrega un circuito (DatosCircuito, ResultadoCalculo o None, error) al lote en curso."""
+        fila = self._pendientes
+        if resultado is not None:
+            datos = resultado.datos
+        for campo in COLUMNAS_ENTRADA:
+            fila[campo].append(getattr(datos, campo) if datos is not None else None)
+        if resultado is not None:
+            valores = {
+                "corriente": resultado.corriente,
+                "corriente_para_proteccion": resultado.corriente_para_proteccion,
+                "interruptor": resultado.interruptor_info['capacidad'],
+                "calibre": resultado.calibre,
+                "ampacidad_calibre": resultado.ampacidad_calibre,
+                "z": resultado.z_individual,
+                "caida_v": resultado.caida_v,
+                "caida_p": resultado.caida_p,
+                "limite_caida": resultado.limite_caida,
+                "cumple_caida": resultado.cumple_caida,
+                "margen_seguridad": resultado.margen_seguridad,
+                "calibre_tierra": resultado.calibre_tierra,
+                "fuente_tabla": resultado.fuente_tabla,
+            }
+        else:
+            valores = {}
+        valores["escenario"] = self.escenario
+        valores["error"] = error or None
+        extras = extras or {}
+        for nombre, _ in self.columnas:
+            if nombre in COLUMNAS_ENTRADA:
+                continue
+            if nombre in self._nombres_base:
+                fila[nombre].append(valores.get(nombre))
+            else:
+                fila[nombre].append(extras.get(nombre))
+        if len(fila["error"]) >= self.tamano_lote:
+            self.vaciar()
+
+    def vaciar(self):
+        """Escribe las filas acumuladas con agregar()."""
+        if self._pendientes["error"]:
+            self.escribir_columnas(self._pendientes)
+            self._pendientes = {nombre: [] for nombre, _ in self.columnas}
+
+    def cerrar(self):
+        self.vaciar()
+        self._escritor.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        self.cerrar()
+
+
+def exportar_lote(ruta, columnas_entrada, resultado, formato=None, escenario=None, tamano_lote=65536):
+    """Exporta la salida de calculo_lote.calcular_lote junto con sus columnas de entrada.
+
+    Las columnas de entrada omitidas toman el valor por defecto de calcular_lote.
+    """
+    from calculo_lote import calcular_lote
+
+    columnas = {nombre: parametro.default for nombre, parametro in inspect.signature(calcular_lote).parameters.items()
+                if parametro.default is not inspect.Parameter.empty}
+    columnas.update(columnas_entrada)
+    columnas["valor_potencia"] = columnas.pop("valor", None)
+    columnas["unidad_potencia"] = columnas.pop("unidad", None)
+    columnas.update(resultado)
+    filas = len(resultado["error"])
+    columnas = {nombre: _columna_lista(valor, filas) for nombre, valor in columnas.items()
+                if nombre in dict(COLUMNAS) and valor is not None}
+
+    with EscritorColumnar(ruta, formato, tamano_lote, escenario) as escritor:
+        for inicio in range(0, filas, tamano_lote):
+            escritor.escribir_columnas({nombre: valores[inicio:inicio + tamano_lote]
+                                        for nombre, valores in columnas.items()})
+        return escritor.filas_escritas
+
+
+def _columna_lista(valor, filas):
+    if isinstance(valor, (str, int, float)):
+        return [valor] * filas
+    if getattr(valor, "dtype", None) is not None and valor.dtype.kind == "f":
+        return valor
+    return valor.tolist() if hasattr(valor, "tolist") else list(valor)
+
+
+def escribir_resultados_columnar(filas, columnas, ruta, funcion_calculo=calcular_circuito, procesos=1,
+                                 tamano_bloque=2000, formato=None, escenario=None, al_calcular=None):
+    """Calcula un cuadro de cargas fila por fila y lo escribe en Parquet o Arrow; devuelve (filas, errores).
+
+    Las columnas del cuadro que no son datos del circuito (identificador,
+    tablero, ...) se conservan como texto. al_calcular, si se indica, recibe
+    (fila, resultado, error) de cada circuito.
+    """
+    extras = [c for c in columnas if normalizar_columna(c) not in COLUMNAS_ENTRADA]
+    total = errores = 0
+    with EscritorColumnar(ruta, formato, escenario=escenario, columnas_extra=extras) as escritor:
+        for fila, resultado, error in procesar_filas(filas, funcion_calculo, procesos, tamano_bloque):
+            datos = None
+            if resultado is None:
+                try:
+                    datos = datos_desde_fila(fila)
+                except Exception:
+                    pass
+            escritor.agregar(datos, resultado, error, fila)
+            if al_calcular is not None:
+                al_calcular(fila, resultado, error)
+            total += 1
+            errores += bool(error)
+    return total, errores
@@ -1,36 +1,98 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-from exportador import exportar_resultado_pdf
+from almacen_historial import AlmacenHistorial, invertir_orden
+
+
+# Columnas de la tabla → columnas del almacén por las que se ordena (las de su índice)
+COLUMNAS_TABLA = {
+    "proyecto": ("proyecto", "fecha"),
+    "usuario": ("usuario", "fecha"),
+    "fecha": ("fecha",),
+    "voltaje": ("voltaje",),
+    "interruptor": ("corriente_interruptor",),
+    "calibre": ("calibre",),
+}
+
+
+def _valores_tabla(fila):
+    """Valores de la tabla para una fila del almacén de historial."""
+    return (fila["proyecto"], fila["usuario"], fila["fecha"], f"{fila['voltaje']:g}V",
+            f"{fila['corriente_interruptor']:g}A", fila["calibre"])
 
-# Simulador de datos
-datos_simulados = [
-    {"proyecto": "Carga Motor 1", "usuario": "admin", "fecha": "2024-05-12", "voltaje": "440V", "interruptor": "100A", "calibre": "3/0"},
-    {"proyecto": "Transformador A", "usuario": "admin", "fecha": "2024-05-11", "voltaje": "220V", "interruptor": "60A", "calibre": "2/0"},
-    {"proyecto": "Panel Oficina", "usuario": "ariadna", "fecha": "2024-05-10", "voltaje": "127V", "interruptor": "40A", "calibre": "6 AWG"},
-]
 
 class HistorialVentana:
-    def __init__(self, master):
+    def __init__(self, master, almacen=None):
         self.ventana = tk.Toplevel(master)
         self.ventana.title("Historial de Proyectos")
-        self.ventana.geometry("700x400")
+        self.ventana.geometry("700x460")
+        # Almacén compartido con calculosint; si se abre aquí, se cierra con la ventana
+        self._almacen_propio = almacen is None
+        self.almacen = almacen if almacen is not None else AlmacenHistorial()
+        self.ventana.protocol("WM_DELETE_WINDOW", self.cerrar)
+        self.filas_visibles = 10
+        self.orden_columna = "fecha"
+        self.descendente = True
+        self.filtros = {}
+        self.total = 0
+        self.desplazamiento = 0
+        self.filas = []
+        self._busqueda_pendiente = None
         self._crear_widgets()
 
+    def cerrar(self):
+        if self._busqueda_pendiente is not None:
+            self.ventana.after_cancel(self._busqueda_pendiente)
+        if self._almacen_propio:
+            self.almacen.cerrar()
+        self.ventana.destroy()
+
     def _crear_widgets(self):
         ttk.Label(self.ventana, text="Cargas Guardadas", font=("Segoe UI", 14, "bold")).pack(pady=10)
 
-        columnas = ("proyecto", "usuario", "fecha", "voltaje", "interruptor", "calibre")
+        # Búsqueda de texto (índice FTS del almacén): proyecto, cliente, equipo, calibre, advertencias y notas
+        frame_busqueda = ttk.Frame(self.ventana)
+        frame_busqueda.pack(pady=(0, 5))
+        self.busqueda_var = tk.StringVar()
+        ttk.Label(frame_busqueda, text="Buscar:").pack(side="left")
+        entrada_busqueda = ttk.Entry(frame_busqueda, textvariable=self.busqueda_var, width=48)
+        entrada_busqueda.pack(side="left", padx=2)
+        entrada_busqueda.bind("<KeyRelease>", self._programar_busqueda)
+        entrada_busqueda.bind("<Return>", lambda evento: self.aplicar_filtros())
 
-        self.tabla = ttk.Treeview(self.ventana, columns=columnas, show="headings", height=10)
-        for col in columnas:
-            self.tabla.heading(col, text=col.capitalize())
+        # Filtros (consultas con índice por proyecto y usuario)
+        frame_filtros = ttk.Frame(self.ventana)
+        frame_filtros.pack(pady=(0, 5))
+        self.proyecto_var = tk.StringVar()
+        self.usuario_var = tk.StringVar()
+        ttk.Label(frame_filtros, text="Proyecto:").pack(side="left")
+        entrada_proyecto = ttk.Entry(frame_filtros, textvariable=self.proyecto_var, width=18)
+        entrada_proyecto.pack(side="left", padx=(2, 10))
+        ttk.Label(frame_filtros, text="Usuario:").pack(side="left")
+        entrada_usuario = ttk.Entry(frame_filtros, textvariable=self.usuario_var, width=12)
+        entrada_usuario.pack(side="left", padx=(2, 10))
+        ttk.Button(frame_filtros, text="Filtrar", command=self.aplicar_filtros).pack(side="left")
+        entrada_proyecto.bind("<Return>", lambda evento: self.aplicar_filtros())
+        entrada_usuario.bind("<Return>", lambda evento: self.aplicar_filtros())
+
+        # Tabla virtual: solo contiene las filas visibles; la barra recorre el total del almacén
+        frame_tabla = ttk.Frame(self.ventana)
+        frame_tabla.pack(pady=5)
+        self.tabla = ttk.Treeview(frame_tabla, columns=tuple(COLUMNAS_TABLA), show="headings", height=self.filas_visibles)
+        for col in COLUMNAS_TABLA:
+            self.tabla.heading(col, text=col.capitalize(), command=lambda col=col: self.ordenar_por(col))
             self.tabla.column(col, width=100, anchor="center")
-        self.tabla.pack(pady=10)
+        self.tabla.pack(side="left")
+        self.barra = ttk.Scrollbar(frame_tabla, orient="vertical", command=self._desplazar)
+        self.barra.pack(side="right", fill="y")
+
+        self.tabla.bind("<MouseWheel>", lambda evento: self._desplazar("scroll", -1 if evento.delta > 0 else 1, "units"))
+        self.tabla.bind("<Button-4>", lambda evento: self._desplazar("scroll", -1, "units"))
+        self.tabla.bind("<Button-5>", lambda evento: self._desplazar("scroll", 1, "units"))
+        self.tabla.bind("<Prior>", lambda evento: self._desplazar("scroll", -1, "pages"))
+        self.tabla.bind("<Next>", lambda evento: self._desplazar("scroll", 1, "pages"))
 
-        for row in datos_simulados:
-            self.tabla.insert("", "end", values=(
-                row["proyecto"], row["usuario"], row["fecha"], row["voltaje"], row["interruptor"], row["calibre"]
-            ))
+        self.estado = ttk.Label(self.ventana, text="")
+        self.estado.pack()
 
         # Botones
         frame_botones = ttk.Frame(self.ventana)
@@ -39,6 +101,84 @@ class HistorialVentana:
         ttk.Button(frame_botones, text="Ver Detalles", command=self.ver_detalles).pack(side="left", padx=10)
         ttk.Button(frame_botones, text="Exportar a PDF", command=self.exportar_pdf).pack(side="left", padx=10)
 
+        self.aplicar_filtros()
+
+    def aplicar_filtros(self):
+        """Cuenta los cálculos que cumplen los filtros y muestra la primera página."""
+        self._busqueda_pendiente = None
+        self.filtros = {
+            'proyecto': self.proyecto_var.get().strip() or None,
+            'usuario': self.usuario_var.get().strip() or None,
+            'texto': self.busqueda_var.get().strip() or None,
+        }
+        self.total = self.almacen.contar(**self.filtros)
+        self.estado.config(text=f"{self.total} cálculos")
+        self._mostrar_pagina(0)
+
+    def _programar_busqueda(self, evento=None):
+        """Busca mientras se escribe, cuando la escritura se detiene un momento."""
+        if self._busqueda_pendiente is not None:
+            self.ventana.after_cancel(self._busqueda_pendiente)
+        self._busqueda_pendiente = self.ventana.after(200, self.aplicar_filtros)
+
+    def ordenar_por(self, columna):
+        """Ordena por la columna; un segundo clic invierte el orden."""
+        descendente = not self.descendente if columna == self.orden_columna else False
+        self.orden_columna, self.descendente = columna, descendente
+        self._mostrar_pagina(0)
+
+    def _orden_sql(self):
+        direccion = "DESC" if self.descendente else "ASC"
+        return ", ".join(f"{columna} {direccion}" for columna in COLUMNAS_TABLA[self.orden_columna] + ("id",))
+
+    def _mostrar_pagina(self, desplazamiento):
+        """Consulta y muestra solo las filas visibles a partir de 'desplazamiento' (saltos de la barra)."""
+        desplazamiento = max(0, min(desplazamiento, self.total - self.filas_visibles))
+        orden = self._orden_sql()
+        restantes = self.total - desplazamiento - self.filas_visibles
+        if restantes < desplazamiento:
+            # Cerca del final se lee desde el final: se saltan menos filas
+            filas = self.almacen.consultar(self.filas_visibles, max(0, restantes), invertir_orden(orden),
+                                           **self.filtros)[::-1]
+        else:
+            filas = self.almacen.consultar(self.filas_visibles, desplazamiento, orden, **self.filtros)
+        self._mostrar_filas(filas, desplazamiento)
+
+    def _mostrar_filas(self, filas, desplazamiento):
+        self.filas = filas
+        self.desplazamiento = desplazamiento
+        self.tabla.delete(*self.tabla.get_children())
+        for fila in filas:
+            self.tabla.insert("", "end", iid=str(fila["id"]), values=_valores_tabla(fila))
+        if self.total:
+            self.barra.set(desplazamiento / self.total, min(desplazamiento + self.filas_visibles, self.total) / self.total)
+        else:
+            self.barra.set(0, 1)
+
+    def _desplazar(self, accion, cantidad, unidad=None):
+        """Comando de la barra de desplazamiento (moveto / scroll) y de la rueda del ratón.
+
+        Los pasos de la rueda y de página leen solo las filas nuevas a partir de la primera o
+        la última visible (paginación por clave); moveto salta a una posición absoluta.
+        """
+        if accion == "moveto":
+            self._mostrar_pagina(int(float(cantidad) * self.total))
+            return "break"
+        paso = int(cantidad) * (self.filas_visibles if unidad == "pages" else 1)
+        if not self.filas or abs(paso) > self.filas_visibles:
+            self._mostrar_pagina(self.desplazamiento + paso)
+        elif paso > 0:
+            nuevas = self.almacen.consultar(paso, orden=self._orden_sql(), despues=self.filas[-1], **self.filtros)
+            if nuevas:
+                filas = self.filas + nuevas
+                inicio = max(0, len(filas) - self.filas_visibles)
+                self._mostrar_filas(filas[inicio:], self.desplazamiento + inicio)
+        elif paso < 0:
+            nuevas = self.almacen.consultar(-paso, orden=self._orden_sql(), antes=self.filas[0], **self.filtros)
+            if nuevas:
+                self._mostrar_filas((nuevas + self.filas)[:self.filas_visibles], max(0, self.desplazamiento - len(nuevas)))
+        return "break"
+
     def ver_detalles(self):
         seleccionado = self.tabla.selection()
         if seleccionado:
@@ -71,6 +211,7 @@ class HistorialVentana:
 
             if ruta_pdf:
                 try:
+                    from exportador import exportar_resultado_pdf
                     exportar_resultado_pdf(
                         resultados=datos_proyecto,
                         nombre_archivo=ruta_pdf,
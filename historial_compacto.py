@@ -0,0 +1,173 @@
+# HISTORIAL_COMPACTO.PY - REGISTROS COMPACTOS DEL HISTORIAL DE CÁLCULOS
+#
+# Cada entrada del historial guarda solo los valores numéricos y los códigos de
+# texto corto (calibre, material, canalización, ...) en __slots__; los textos
+# largos (fórmulas, advertencias, datos del interruptor) se generan al pedirlos
+# con las mismas funciones de motor_calculo. La entrada se comporta como un
+# diccionario de solo lectura con las mismas claves que el historial original,
+# por lo que ExportadorPDF y Calculos.actualizar_historial_completo la usan sin
+# cambios (entrada['calibre'], entrada.get('caida_p', 0), dict(entrada), ...).
+
+import sys
+from collections.abc import Mapping
+from datetime import datetime
+
+from motor_calculo import (calcular_corriente_por_equipo, mensaje_margen, obtener_factor_demanda,
+                           obtener_factor_proteccion, seleccionar_interruptor, textos_caida)
+
+# Claves del historial en el orden de Calculos.agregar_historial_completo
+CLAVES = (
+    'timestamp', 'tipo_circuito', 'tipo_carga', 'valor_potencia', 'unidad_potencia', 'corriente',
+    'corriente_para_proteccion', 'corriente_interruptor', 'voltaje', 'calibre', 'material', 'longitud',
+    'num_conductores', 'canalizacion', 'z', 'factor_potencia', 'tipo_equipo', 'formula_corriente',
+    'formula_caida', 'calculo_caida', 'caida_v', 'caida_p', 'ampacidad_calibre', 'corriente_por_conductor_final',
+    'mensaje_advertencia', 'temp_conductor', 'factor_aplicado_texto', 'interruptor_info', 'fuente_tabla',
+    'tipo_instalacion', 'es_charola', 'calibre_tierra',
+)
+_CLAVES = frozenset(CLAVES)
+
+# Campos de texto con pocos valores distintos: se internan para que todas las entradas compartan el objeto
+_CODIGOS = ('tipo_circuito', 'tipo_carga', 'unidad_potencia', 'calibre', 'material', 'canalizacion', 'tipo_equipo',
+            'temp_conductor', 'fuente_tabla', 'tipo_instalacion', 'calibre_tierra')
+
+
+def _segundos(timestamp):
+    horas, minutos, segundos = (int(parte) for parte in timestamp.split(":"))
+    return horas * 3600 + minutos * 60 + segundos
+
+
+class EntradaHistorial(Mapping):
+    """Cálculo del historial: valores y códigos en __slots__, textos generados bajo demanda."""
+
+    __slots__ = ('segundos', 'tipo_circuito', 'tipo_carga', 'valor_potencia', 'unidad_potencia', 'corriente',
+                 'corriente_para_proteccion', 'corriente_interruptor', 'voltaje', 'calibre', 'material', 'longitud',
+                 'num_conductores', 'canalizacion', 'z', 'factor_potencia', 'tipo_equipo', 'eficiencia', 'caida_v',
+                 'caida_p', 'ampacidad_calibre', 'corriente_por_conductor_final', 'temp_conductor', 'fuente_tabla',
+                 'tipo_instalacion', 'calibre_tierra')
+
+    def __init__(self, tipo_circuito, tipo_carga, valor_potencia, unidad_potencia, corriente,
+                 corriente_para_proteccion, corriente_interruptor, voltaje, calibre, material, longitud,
+                 num_conductores, canalizacion, z, factor_potencia, tipo_equipo, caida_v, caida_p,
+                 ampacidad_calibre, corriente_por_conductor_final, temp_conductor, fuente_tabla, tipo_instalacion,
+                 calibre_tierra, eficiencia=0.90, timestamp=None):
+        self.segundos = _segundos(timestamp or datetime.now().strftime("%H:%M:%S"))
+        self.tipo_circuito = tipo_circuito
+        self.tipo_carga = tipo_carga
+        self.valor_potencia = valor_potencia
+        self.unidad_potencia = unidad_potencia
+        self.corriente = corriente
+        self.corriente_para_proteccion = corriente_para_proteccion
+        self.corriente_interruptor = corriente_interruptor
+        self.voltaje = voltaje
+        self.calibre = calibre
+        self.material = material
+        self.longitud = longitud
+        self.num_conductores = num_conductores
+        self.canalizacion = canalizacion
+        self.z = z
+        self.factor_potencia = factor_potencia
+        self.tipo_equipo = tipo_equipo
+        self.eficiencia = eficiencia
+        self.caida_v = caida_v
+        self.caida_p = caida_p
+        self.ampacidad_calibre = ampacidad_calibre
+        self.corriente_por_conductor_final = corriente_por_conductor_final
+        self.temp_conductor = temp_conductor
+        self.fuente_tabla = fuente_tabla
+        self.tipo_instalacion = tipo_instalacion
+        self.calibre_tierra = calibre_tierra
+        for campo in _CODIGOS:
+            valor = getattr(self, campo)
+            if isinstance(valor, str):
+                setattr(self, campo, sys.intern(valor))
+
+    @classmethod
+    def desde_resultado(cls, resultado, timestamp=None):
+        """Entrada del historial para un ResultadoCalculo de motor_calculo."""
+        datos = resultado.datos
+        return cls(
+            tipo_circuito=datos.tipo_circuito,
+            tipo_carga=datos.tipo_carga,
+            valor_potencia=datos.valor_potencia,
+            unidad_potencia=datos.unidad_potencia,
+            corriente=resultado.corriente,
+            corriente_para_proteccion=resultado.corriente_para_proteccion,
+            corriente_interruptor=resultado.interruptor_info['capacidad'],
+            voltaje=datos.voltaje,
+            calibre=resultado.calibre,
+            material=datos.material,
+            longitud=datos.longitud,
+            num_conductores=datos.num_conductores,
+            canalizacion=datos.canalizacion,
+            z=resultado.z_individual,
+            factor_potencia=resultado.factor_potencia,
+            tipo_equipo=datos.tipo_equipo,
+            caida_v=resultado.caida_v,
+            caida_p=resultado.caida_p,
+            ampacidad_calibre=resultado.ampacidad_calibre,
+            corriente_por_conductor_final=resultado.corriente_por_conductor_final,
+            temp_conductor=datos.temp_conductor,
+            fuente_tabla=resultado.fuente_tabla,
+            tipo_instalacion=resultado.tipo_instalacion,
+            calibre_tierra=resultado.calibre_tierra,
+            eficiencia=datos.eficiencia,
+            timestamp=timestamp,
+        )
+
+    # Campos derivados (se generan en cada consulta, no se guardan)
+
+    @property
+    def timestamp(self):
+        horas, resto = divmod(self.segundos, 3600)
+        return f"{horas:02d}:{resto // 60:02d}:{resto % 60:02d}"
+
+    @property
+    def formula_corriente(self):
+        factor_demanda = obtener_factor_demanda(self.tipo_carga, self.tipo_equipo)
+        return calcular_corriente_por_equipo(self.tipo_equipo, self.valor_potencia, self.unidad_potencia,
+                                             self.voltaje, self.tipo_circuito, self.factor_potencia,
+                                             self.eficiencia, factor_demanda)[1]
+
+    @property
+    def formula_caida(self):
+        return textos_caida(self.tipo_circuito, self.z, self.corriente, self.longitud, self.num_conductores)[0]
+
+    @property
+    def calculo_caida(self):
+        return textos_caida(self.tipo_circuito, self.z, self.corriente, self.longitud, self.num_conductores)[1]
+
+    @property
+    def mensaje_advertencia(self):
+        margen = ((self.ampacidad_calibre - self.corriente_por_conductor_final)
+                  / self.corriente_por_conductor_final) * 100
+        return mensaje_margen(self.corriente_por_conductor_final, self.ampacidad_calibre, margen)
+
+    @property
+    def factor_aplicado_texto(self):
+        return obtener_factor_proteccion(self.tipo_equipo)[1]
+
+    @property
+    def interruptor_info(self):
+        return seleccionar_interruptor(self.corriente, self.tipo_equipo, self.corriente_para_proteccion,
+                                       self.tipo_circuito)
+
+    @property
+    def es_charola(self):
+        return self.canalizacion == "Charola"
+
+    # Interfaz de diccionario de solo lectura
+
+    def __getitem__(self, clave):
+        if clave not in _CLAVES:
+            raise KeyError(clave)
+        return getattr(self, clave)
+
+    def __iter__(self):
+        return iter(CLAVES)
+
+    def __len__(self):
+        return len(CLAVES)
+
+    def __repr__(self):
+        return (f"EntradaHistorial({self.timestamp} {self.tipo_equipo} {self.valor_potencia} {self.unidad_potencia}, "
+                f"{self.calibre} AWG, {self.caida_p:.2f}%)")
@@ -0,0 +1,52 @@
+# IMPORTADOR_EXCEL.PY - LECTURA EN STREAMING DE CUADROS DE CARGAS .XLSX
+#
+# Lee el libro en modo de solo lectura (openpyxl read_only), fila por fila, sin
+# cargarlo completo en memoria. Los encabezados se asocian a los campos de
+# DatosCircuito con cuadro_cargas.normalizar_columna, por lo que acepta tanto
+# los nombres del formulario como los habituales de los clientes
+# ("Potencia", "Tensión (V)", "Longitud (m)", "Fases", ...).
+
+from cuadro_cargas import COLUMNAS_ENTRADA, normalizar_columna
+
+# Importar openpyxl para leer archivos de Excel
+try:
+    from openpyxl import load_workbook
+    OPENPYXL_AVAILABLE = True
+except ImportError:
+    OPENPYXL_AVAILABLE = False
+
+
+def _es_fila_vacia(valores):
+    return all(valor is None or str(valor).strip() == "" for valor in valores)
+
+
+def leer_xlsx(ruta, hoja=None, mapeo_columnas=None):
+    """Genera un diccionario por fila del cuadro de cargas (encabezado → valor).
+
+    La fila de encabezados es la primera que contiene al menos una columna
+    reconocida. mapeo_columnas permite indicar encabezados propios del cliente
+    ({"Carga instalada": "valor_potencia", ...}); las filas vacías se omiten.
+    """
+    if not OPENPYXL_AVAILABLE:
+        raise ImportError("Para importar archivos de Excel se requiere la biblioteca 'openpyxl'.\n\n"
+                          "Instale con: pip install openpyxl")
+
+    mapeo_columnas = mapeo_columnas or {}
+    libro = load_workbook(ruta, read_only=True, data_only=True)
+    try:
+        hoja_activa = libro[hoja] if hoja else libro.active
+        encabezados = None
+        for valores in hoja_activa.iter_rows(values_only=True):
+            if encabezados is None:
+                nombres = ["" if valor is None else str(valor).strip() for valor in valores]
+                reconocidas = [n for n in nombres
+                               if n and mapeo_columnas.get(n, normalizar_columna(n)) in COLUMNAS_ENTRADA]
+                if reconocidas:
+                    encabezados = [mapeo_columnas.get(n, n) for n in nombres]
+                continue
+            if _es_fila_vacia(valores):
+                continue
+            yield {encabezado: valor for encabezado, valor in zip(encabezados, valores) if encabezado}
+    finally:
+        libro.close()
+
@@ -0,0 +1,197 @@
+# LINEA_COMANDOS.PY - MODO POR LOTES SIN INTERFAZ GRÁFICA
+#
+# Uso:
+#   python -m calculosint batch cargas.csv -o resultados.csv
+#   python -m calculosint batch cargas.xlsx --hoja "Cuadro" -o resultados.csv
+#   python -m calculosint batch cargas.csv -o resultados.parquet --escenario base
+#   python -m calculosint jsonl < circuitos.jsonl > resultados.jsonl
+#   python -m calculosint watch cargas.xlsx -o resultados.csv --resumen resumen.json
+#   python -m calculosint batch cargas.csv -o resultados.csv --cache
+#   python -m calculosint batch cargas.csv -o resultados.csv --historial --proyecto "Planta 2"
+#
+# Los subcomandos batch y jsonl leen y escriben fila por fila, por lo que la
+# memoria no depende del tamaño del cuadro de cargas. watch recalcula la salida
+# cada vez que se guarda el cuadro de cargas, solo para los circuitos que cambiaron.
+
+import argparse
+import getpass
+import sys
+from contextlib import ExitStack
+from functools import partial
+from itertools import chain
+
+from motor_calculo import calcular_circuito, dimensionar_por_caida
+
+
+def _funcion_calculo(argumentos):
+    # Sin fórmulas explicativas: los textos que pida la salida se generan al consultarlos
+    funcion_calculo = partial(calcular_circuito, explicar=False)
+    if argumentos.ajustar_caida:
+        funcion_calculo = partial(dimensionar_por_caida, max_conductores=argumentos.max_conductores,
+                                  explicar=False)
+    if argumentos.cache is not None:
+        from cache_disco import CacheDisco
+
+        return CacheDisco(argumentos.cache or None, funcion_calculo=funcion_calculo)
+    return funcion_calculo
+
+
+def _cerrar_funcion_calculo(funcion_calculo):
+    if hasattr(funcion_calculo, "cerrar"):
+        funcion_calculo.cerrar()
+
+
+def _abrir_salida(ruta):
+    if ruta in (None, "-"):
+        return sys.stdout
+    return open(ruta, "w", encoding="utf-8", newline="")
+
+
+def _leer_entrada(argumentos, pila):
+    """Filas y encabezados del cuadro de cargas (CSV o Excel), leídos en streaming."""
+    if argumentos.entrada.lower().endswith((".xlsx", ".xlsm")):
+        from importador_excel import leer_xlsx
+
+        filas = leer_xlsx(argumentos.entrada, argumentos.hoja)
+        primera = next(filas, None)
+        if primera is None:
+            return iter(()), []
+        return chain([primera], filas), list(primera)
+
+    import csv
+
+    entrada = pila.enter_context(open(argumentos.entrada, encoding="utf-8-sig", newline=""))
+    lector = csv.DictReader(entrada, delimiter=argumentos.delimitador)
+    return lector, list(lector.fieldnames or [])
+
+
+def _registrador_historial(argumentos, pila):
+    """RegistradorLote del almacén de historial si se pidió --historial; None si no."""
+    if argumentos.historial is None:
+        return None
+    from almacen_historial import AlmacenHistorial, RegistradorLote
+
+    almacen = pila.enter_context(AlmacenHistorial(argumentos.historial or None))
+    registrador = RegistradorLote(almacen, argumentos.proyecto, argumentos.usuario or getpass.getuser(),
+                                  cliente=argumentos.cliente)
+    pila.callback(registrador.vaciar)
+    return registrador
+
+
+def comando_batch(argumentos):
+    from cuadro_cargas import escribir_resultados_csv
+    from exportador_columnar import escribir_resultados_columnar, formato_por_extension
+
+    funcion_calculo = _funcion_calculo(argumentos)
+    with ExitStack() as pila:
+        pila.callback(_cerrar_funcion_calculo, funcion_calculo)
+        registrador = _registrador_historial(argumentos, pila)
+        filas, columnas = _leer_entrada(argumentos, pila)
+        formato = formato_por_extension(argumentos.salida) if argumentos.salida else None
+        if formato:
+            total, errores = escribir_resultados_columnar(filas, columnas, argumentos.salida, funcion_calculo,
+                                                          argumentos.procesos, argumentos.bloque, formato,
+                                                          argumentos.escenario, registrador)
+        else:
+            salida = _abrir_salida(argumentos.salida)
+            if salida is not sys.stdout:
+                pila.enter_context(salida)
+            total, errores = escribir_resultados_csv(filas, columnas, salida, funcion_calculo, argumentos.procesos,
+                                                     argumentos.bloque, argumentos.delimitador, registrador)
+
+    print(f"{total} circuitos calculados, {errores} con error.", file=sys.stderr)
+    return 1 if errores else 0
+
+
+def comando_jsonl(argumentos):
+    from cuadro_cargas import calcular_jsonl
+
+    funcion_calculo = _funcion_calculo(argumentos)
+    try:
+        total, errores = calcular_jsonl(sys.stdin, sys.stdout, funcion_calculo, argumentos.procesos,
+                                        argumentos.bloque)
+    finally:
+        _cerrar_funcion_calculo(funcion_calculo)
+    sys.stdout.flush()
+    print(f"{total} circuitos calculados, {errores} con error.", file=sys.stderr)
+    return 1 if errores else 0
+
+
+def comando_watch(argumentos):
+    from vigilancia import VigilanteCuadro
+
+    configuracion = repr((argumentos.ajustar_caida, argumentos.max_conductores))
+    funcion_calculo = _funcion_calculo(argumentos)
+    vigilante = VigilanteCuadro(argumentos.entrada, argumentos.salida, funcion_calculo, configuracion,
+                                argumentos.hoja, argumentos.delimitador, argumentos.resumen, argumentos.procesos)
+
+    def informar(resumen):
+        print(f"{resumen['circuitos']} circuitos, {resumen['recalculados']} recalculados, "
+              f"{resumen['eliminados']} eliminados, {resumen['errores']} con error, "
+              f"{resumen['no_cumplen_caida']} no cumplen la caída de tensión "
+              f"({resumen['segundos']:.2f} s).", file=sys.stderr)
+
+    def informar_fallo(e):
+        print(f"No se pudo leer {argumentos.entrada}: {e}", file=sys.stderr)
+
+    print(f"Vigilando {argumentos.entrada} (Ctrl+C para terminar)...", file=sys.stderr)
+    vigilante.ejecutar(argumentos.intervalo, informar, informar_fallo)
+    _cerrar_funcion_calculo(funcion_calculo)
+    return 0
+
+
+def _agregar_opciones_calculo(subparser):
+    subparser.add_argument("--ajustar-caida", action="store_true",
+                           help="aumentar el calibre hasta cumplir la caída de tensión")
+    subparser.add_argument("--max-conductores", type=int, default=None,
+                           help="con --ajustar-caida, máximo de conductores por fase")
+    subparser.add_argument("--procesos", type=int, default=1, help="procesos de cálculo (por defecto 1)")
+    subparser.add_argument("--bloque", type=int, default=2000, help="circuitos por bloque con --procesos")
+    subparser.add_argument("--cache", nargs="?", const="", default=None, metavar="RUTA",
+                           help="reutilizar resultados guardados en disco entre ejecuciones "
+                                "(por defecto, la misma cache que la interfaz gráfica)")
+
+
+def crear_parser():
+    parser = argparse.ArgumentParser(prog="python -m calculosint",
+                                     description="Cálculos eléctricos NOM-001-SEDE-2012 por lotes.")
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+
+    batch = subparsers.add_parser("batch", help="calcular un cuadro de cargas CSV o Excel")
+    batch.add_argument("entrada", help="archivo CSV o .xlsx con una fila por circuito")
+    batch.add_argument("--hoja", default=None, help="hoja del libro de Excel (por defecto, la activa)")
+    batch.add_argument("-o", "--salida", default=None,
+                       help="archivo de resultados .csv, .parquet o .arrow (por defecto, CSV en la salida estándar)")
+    batch.add_argument("--escenario", default=None, help="nombre del escenario en la salida Parquet/Arrow")
+    batch.add_argument("--delimitador", default=",", help="separador de columnas del CSV")
+    batch.add_argument("--historial", nargs="?", const="", default=None, metavar="RUTA",
+                       help="guardar los cálculos en el historial (por defecto, el de la interfaz gráfica)")
+    batch.add_argument("--proyecto", default="", help="proyecto con el que se guardan en el historial")
+    batch.add_argument("--cliente", default="", help="cliente con el que se guardan en el historial")
+    batch.add_argument("--usuario", default=None, help="usuario con el que se guardan (por defecto, el del sistema)")
+    _agregar_opciones_calculo(batch)
+    batch.set_defaults(funcion=comando_batch)
+
+    jsonl = subparsers.add_parser("jsonl", help="leer circuitos JSON Lines de la entrada estándar")
+    _agregar_opciones_calculo(jsonl)
+    jsonl.set_defaults(funcion=comando_jsonl)
+
+    watch = subparsers.add_parser("watch", help="recalcular un cuadro de cargas cada vez que se guarda")
+    watch.add_argument("entrada", help="archivo CSV o .xlsx con una fila por circuito")
+    watch.add_argument("--hoja", default=None, help="hoja del libro de Excel (por defecto, la activa)")
+    watch.add_argument("-o", "--salida", required=True, help="archivo de resultados .csv, .parquet o .arrow")
+    watch.add_argument("--resumen", default=None, help="archivo JSON con el resumen del último cálculo")
+    watch.add_argument("--intervalo", type=float, default=0.5, help="segundos entre revisiones del archivo")
+    watch.add_argument("--delimitador", default=",", help="separador de columnas del CSV")
+    _agregar_opciones_calculo(watch)
+    watch.set_defaults(funcion=comando_watch)
+    return parser
+
+
+def main(argv=None):
+    argumentos = crear_parser().parse_args(argv)
+    return argumentos.funcion(argumentos)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+# LONGITUD_MAXIMA.PY - TABLA PRECALCULADA DE LONGITUDES MÁXIMAS POR CAÍDA DE TENSIÓN
+#
+# Responde "¿hasta qué longitud puedo llevar este calibre con esta corriente sin
+# exceder el límite de caída?" con una lectura de tabla en lugar de repetir el
+# cálculo completo. Las longitudes se obtienen de las tablas de impedancia NOM:
+#   L_máx = límite/100 × V × 1000 × n / (k × Z × I),  k = 2 (monofásico) o √3 (trifásico)
+# La tabla guarda por calibre la constante límite/100 × V × 1000 / (k × Z); como
+# L_máx es inversa en I, basta dividirla entre la corriente exacta consultada.
+
+import math
+from functools import lru_cache
+
+from motor_calculo import ErrorCalculo, obtener_impedancia, obtener_tabla_impedancias
+from tablas_nom import REGISTRO
+
+# Ejes de la tabla
+VOLTAJES_NORMALIZADOS = (120, 127, 208, 220, 240, 277, 440, 480)
+TIPOS_CIRCUITO = ("monofasico", "trifasico")
+CANALIZACIONES = ("PVC", "Acero", "Charola")
+MATERIALES = ("cobre", "aluminio")
+
+
+class TablaLongitudMaxima:
+    """Longitud máxima (m) por calibre y corriente para un límite de caída dado.
+
+    Guarda por calibre la longitud máxima con 1 A; la de otra corriente es esa
+    constante dividida entre la corriente. Cada combinación (material, canalización, tipo de circuito, voltaje) se
+    calcula la primera vez que se consulta y queda en memoria.
+    """
+
+    __slots__ = ("limite_caida", "_filas")
+
+    def __init__(self, limite_caida=3):
+        self.limite_caida = limite_caida
+        self._filas = {}
+
+    def _fila(self, material, canalizacion, tipo_circuito, voltaje):
+        clave = (material, canalizacion, tipo_circuito, voltaje)
+        fila = self._filas.get(clave)
+        if fila is None:
+            if voltaje not in VOLTAJES_NORMALIZADOS:
+                raise ErrorCalculo(f"Tensión {voltaje:g} V fuera de la tabla de longitudes máximas "
+                                   f"({', '.join(str(v) for v in VOLTAJES_NORMALIZADOS)} V).")
+            tabla_z, _ = obtener_tabla_impedancias(material, canalizacion)
+            k = 2 if tipo_circuito == "monofasico" else math.sqrt(3)
+            constante = self.limite_caida / 100 * voltaje * 1000 / k
+            fila = {calibre: constante / z for calibre, z in tabla_z.items()}
+            self._filas[clave] = fila
+        return fila
+
+    def buscar(self, calibre, corriente, voltaje, tipo_circuito="monofasico", canalizacion="PVC",
+               material="cobre", num_conductores=1):
+        """Longitud máxima en metros del calibre con la corriente indicada."""
+        if not (math.isfinite(corriente) and corriente > 0):
+            raise ErrorCalculo(f"Corriente {corriente} A no válida para la tabla de longitudes máximas: "
+                               f"debe ser mayor que cero.")
+        fila = self._fila(material, canalizacion, tipo_circuito, voltaje)
+        if calibre not in fila:
+            obtener_impedancia(calibre, material, canalizacion)
+        return fila[calibre] / corriente * num_conductores
+
+    def por_calibre(self, corriente, voltaje, tipo_circuito="monofasico", canalizacion="PVC",
+                    material="cobre", num_conductores=1):
+        """Longitud máxima de cada calibre disponible, en el orden de REGISTRO.calibres_ordenados."""
+        fila = self._fila(material, canalizacion, tipo_circuito, voltaje)
+        return {calibre: self.buscar(calibre, corriente, voltaje, tipo_circuito, canalizacion,
+                                     material, num_conductores)
+                for calibre in REGISTRO.calibres_ordenados if calibre in fila}
+
+
+@lru_cache(maxsize=None)
+def tabla_longitud_maxima(limite_caida=3):
+    """Tabla compartida por límite de caída (2 % alimentadores, 3 % derivados)."""
+    return TablaLongitudMaxima(limite_caida)
+
+
+def longitud_maxima(calibre, corriente, voltaje, tipo_circuito="monofasico", canalizacion="PVC",
+                    material="cobre", num_conductores=1, tipo_carga="derivado"):
+    """Longitud máxima (m) con el límite normativo del tipo de carga."""
+    limite = REGISTRO.limites_caida.get(tipo_carga, REGISTRO.limites_caida["derivado"])
+    return tabla_longitud_maxima(limite).buscar(calibre, corriente, voltaje, tipo_circuito, canalizacion,
+                                                material, num_conductores)
@@ -0,0 +1,93 @@
+# LOTE_PARALELO.PY - DIMENSIONAMIENTO DE PROYECTOS GRANDES EN VARIOS PROCESOS
+#
+# Divide el cuadro de cargas en bloques y los calcula en un ProcessPoolExecutor
+# con motor_calculo (la misma lógica que Calculos.calcular). Los resultados se
+# entregan en el orden de entrada conforme terminan los bloques, con un número
+# acotado de bloques en curso para que la memoria no crezca con el proyecto.
+# Cada proceso carga las tablas NOM una sola vez (al importar tablas_nom).
+
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from cache_calculo import CacheCalculos
+from motor_calculo import ErrorCalculo, calcular_circuito
+
+# Estado de cada proceso de trabajo (se asigna en _inicializar_trabajador)
+_cache_trabajador = None
+
+
+def _inicializar_trabajador(funcion_calculo, max_entradas_cache):
+    """Prepara el proceso: tablas NOM cargadas por la importación y cache propia."""
+    global _cache_trabajador
+    _cache_trabajador = CacheCalculos(max_entradas_cache, funcion_calculo)
+
+
+def _calcular_bloque(numero, bloque):
+    """Calcula un bloque de DatosCircuito; devuelve (número, [(resultado, error)], segundos)."""
+    inicio = time.perf_counter()
+    salida = []
+    for datos in bloque:
+        try:
+            salida.append((_cache_trabajador.calcular(datos), ""))
+        except ErrorCalculo as e:
+            salida.append((None, str(e)))
+        except ValueError as e:
+            salida.append((None, f"Error en valores ingresados: {e}"))
+        except Exception as e:
+            salida.append((None, f"Error en el cálculo: {e}"))
+    # Con cache_disco.CacheDisco como función de cálculo, guardar lo calculado en el bloque
+    vaciar = getattr(_cache_trabajador.funcion_calculo, "vaciar", None)
+    if vaciar is not None:
+        vaciar()
+    return numero, salida, time.perf_counter() - inicio
+
+
+def _bloques(datos, tamano_bloque):
+    iterador = iter(datos)
+    while True:
+        bloque = list(islice(iterador, tamano_bloque))
+        if not bloque:
+            return
+        yield bloque
+
+
+def calcular_en_paralelo(datos, tamano_bloque=2000, max_procesos=None, funcion_calculo=calcular_circuito,
+                         al_terminar_bloque=None, max_entradas_cache=4096):
+    """Dimensiona un iterable de DatosCircuito en varios procesos.
+
+    Genera tuplas (datos, resultado, error) en el mismo orden de entrada; si el
+    circuito no es válido, resultado es None y error contiene el mensaje.
+    funcion_calculo debe poder enviarse a otro proceso (función de módulo o
+    functools.partial, por ejemplo partial(dimensionar_por_caida, max_conductores=4)).
+    al_terminar_bloque recibe un diccionario con el rendimiento de cada bloque.
+    """
+    max_procesos = max_procesos or os.cpu_count() or 1
+    max_en_curso = max_procesos * 2
+
+    with ProcessPoolExecutor(max_workers=max_procesos, initializer=_inicializar_trabajador,
+                             initargs=(funcion_calculo, max_entradas_cache)) as ejecutor:
+        pendientes = deque()
+        bloques = _bloques(datos, tamano_bloque)
+        for numero, bloque in enumerate(bloques):
+            pendientes.append((bloque, ejecutor.submit(_calcular_bloque, numero, bloque)))
+            if len(pendientes) >= max_en_curso:
+                yield from _entregar_bloque(pendientes.popleft(), al_terminar_bloque)
+        while pendientes:
+            yield from _entregar_bloque(pendientes.popleft(), al_terminar_bloque)
+
+
+def _entregar_bloque(pendiente, al_terminar_bloque):
+    bloque, futuro = pendiente
+    numero, salida, segundos = futuro.result()
+    if al_terminar_bloque is not None:
+        al_terminar_bloque({
+            'bloque': numero,
+            'circuitos': len(bloque),
+            'segundos': segundos,
+            'circuitos_por_segundo': len(bloque) / segundos if segundos else float('inf'),
+        })
+    for datos, (resultado, error) in zip(bloque, salida):
+        yield datos, resultado, error
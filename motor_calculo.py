@@ -0,0 +1,722 @@
+# MOTOR_CALCULO.PY - MOTOR DE DIMENSIONAMIENTO SIN INTERFAZ GRÁFICA
+#
+# Contiene la misma secuencia de cálculo que Calculos.calcular:
+# corriente → interruptor → calibre → impedancia → caída de tensión → tierra física
+# No importa tkinter, por lo que puede usarse desde scripts, servicios o procesos por lotes.
+
+import math
+from datetime import datetime
+from dataclasses import dataclass, field, replace
+
+from tablas_nom import REGISTRO
+
+
+class ErrorCalculo(ValueError):
+    """Error de datos o de tablas durante el cálculo de un circuito."""
+
+
+# Datos numéricos que deben ser finitos y mayores que cero (ValueError → "Error en valores ingresados: ...")
+MENSAJE_POTENCIA_INVALIDA = "La potencia debe ser un número mayor que cero"
+MENSAJE_VOLTAJE_INVALIDO = "El voltaje debe ser un número mayor que cero"
+
+
+# Tablas NOM-001-SEDE-2012 (registro compartido, ver tablas_nom.py)
+ampacidades_cobre_75 = REGISTRO.ampacidades_cobre_75
+ampacidades_cobre_60 = REGISTRO.ampacidades_cobre_60
+ampacidades_cobre_90 = REGISTRO.ampacidades_cobre_90
+ampacidades_aluminio = REGISTRO.ampacidades_aluminio
+ampacidades_charola_cobre_75 = REGISTRO.ampacidades_charola_cobre_75
+ampacidades_charola_cobre_90 = REGISTRO.ampacidades_charola_cobre_90
+ampacidades_charola_aluminio_75 = REGISTRO.ampacidades_charola_aluminio_75
+ampacidades_charola_aluminio_90 = REGISTRO.ampacidades_charola_aluminio_90
+calibre_tierra_fisica = REGISTRO.calibre_tierra_fisica
+interruptores_comerciales = REGISTRO.interruptores_comerciales
+impedancia_cobre = REGISTRO.impedancia_cobre
+impedancia_aluminio = REGISTRO.impedancia_aluminio
+impedancia_charola_cobre = REGISTRO.impedancia_charola_cobre
+impedancia_charola_aluminio = REGISTRO.impedancia_charola_aluminio
+calibres_ordenados = REGISTRO.calibres_ordenados
+
+
+@dataclass
+class DatosCircuito:
+    """Datos de entrada de un circuito, equivalentes a los campos del formulario."""
+    valor_potencia: str
+    voltaje: float
+    longitud: float
+    tipo_circuito: str = "monofasico"
+    tipo_carga: str = "derivado"
+    tipo_equipo: str = "Motor"
+    unidad_potencia: str = "W"
+    factor_potencia: float = 0.9
+    material: str = "cobre"
+    num_conductores: int = 1
+    canalizacion: str = "PVC"
+    temp_conductor: str = "75 °C"
+    eficiencia: float = 0.90
+
+
+@dataclass
+class ResultadoCalculo:
+    """Resultado completo del dimensionamiento de un circuito."""
+    datos: DatosCircuito
+    factor_potencia: float
+    factor_demanda: float
+    corriente: float
+    formula_corriente: str
+    es_corriente_directa: bool
+    corriente_para_proteccion: float
+    factor_aplicado_texto: str
+    interruptor_info: dict
+    calibre: str
+    ampacidad_calibre: float
+    corriente_por_conductor_final: float
+    fuente_tabla: str
+    tipo_instalacion: str
+    es_charola: bool
+    z_individual: float
+    caida_v: float
+    caida_p: float
+    formula_caida: str
+    calculo_caida: str
+    margen_seguridad: float
+    mensaje_advertencia: str
+    calibre_tierra: str
+    calibre_por_ampacidad: str = None
+    limite_caida: int = field(init=False)
+    cumple_caida: bool = field(init=False)
+
+    def __post_init__(self):
+        if self.calibre_por_ampacidad is None:
+            self.calibre_por_ampacidad = self.calibre
+        self.limite_caida = REGISTRO.limites_caida["alimentador" if self.datos.tipo_carga == "alimentador" else "derivado"]
+        self.cumple_caida = self.caida_p <= self.limite_caida
+
+    def __getattr__(self, nombre):
+        # Solo se llega aquí si el atributo no existe: textos omitidos con explicar=False
+        if nombre not in TEXTOS_EXPLICACION:
+            raise AttributeError(nombre)
+        self.explicar((nombre,))
+        return self.__dict__[nombre]
+
+    def explicar(self, campos=None):
+        """Genera las fórmulas y el mensaje de advertencia a partir de los valores calculados.
+
+        campos limita qué textos de TEXTOS_EXPLICACION se generan (por defecto, todos).
+        """
+        campos = TEXTOS_EXPLICACION if campos is None else campos
+        datos = self.datos
+        if 'formula_corriente' in campos:
+            self.formula_corriente = calcular_corriente_por_equipo(
+                datos.tipo_equipo, datos.valor_potencia, datos.unidad_potencia, datos.voltaje, datos.tipo_circuito,
+                self.factor_potencia, datos.eficiencia, self.factor_demanda
+            )[1]
+        if 'formula_caida' in campos or 'calculo_caida' in campos:
+            self.formula_caida, self.calculo_caida = textos_caida(datos.tipo_circuito, self.z_individual,
+                                                                  self.corriente, datos.longitud,
+                                                                  datos.num_conductores)
+        if 'mensaje_advertencia' in campos:
+            self.mensaje_advertencia = mensaje_margen(self.corriente_por_conductor_final, self.ampacidad_calibre,
+                                                      self.margen_seguridad)
+        return self
+
+
+# Campos de texto de ResultadoCalculo que calcular_circuito(..., explicar=False) genera solo al consultarlos
+TEXTOS_EXPLICACION = frozenset({'formula_corriente', 'formula_caida', 'calculo_caida', 'mensaje_advertencia'})
+
+
+def obtener_factor_demanda(tipo_carga, tipo_equipo):
+    """Obtiene el factor de demanda según el tipo de carga y equipo."""
+    if tipo_carga == "alimentador":
+        # Factores de demanda según Art. 220-11 y Tabla 220-11
+        if tipo_equipo == "Motor":
+            return 0.75  # Factor típico para múltiples motores
+        elif tipo_equipo == "Transformador":
+            return 0.85  # Factor para cargas diversas en alimentadores
+        else:
+            return 0.80  # Factor general para alimentadores
+    else:
+        return 1.0  # Sin factor de demanda para circuitos derivados
+
+
+def obtener_factor_proteccion(tipo_equipo):
+    """Factor normativo de seguridad por tipo de equipo."""
+    if tipo_equipo == "Motor":
+        return 1.25, "1.25 (Art. 430-22 NOM - OBLIGATORIO para motores)"
+    elif tipo_equipo == "Transformador":
+        return 1.25, "1.25 (Art. 450-3 NOM - OBLIGATORIO para transformadores)"
+    elif tipo_equipo == "Capacitor":
+        return 1.35, "1.35 (Art. 460-8 NOM - OBLIGATORIO para capacitores)"
+    elif tipo_equipo == "Generador":
+        return 1.15, "1.15 (Art. 445-5 NOM - OBLIGATORIO para generadores)"
+    else:
+        return 1.25, "1.25 (OBLIGATORIO para cargas generales)"
+
+
+def corriente_por_equipo(tipo_equipo, valor, unidad, voltaje, tipo_circuito, factor_potencia, eficiencia=0.90,
+                         factor_demanda=1.0):
+    """Corriente de calcular_corriente_por_equipo sin armar la fórmula (mismas operaciones y errores)."""
+    if unidad == "A":
+        return float(valor)
+
+    valor = float(valor)
+    usa_factor_potencia = True
+    if tipo_equipo == "Motor":
+        if unidad == "HP":
+            potencia = valor * 746 / eficiencia
+        elif unidad in ["W", "kW"]:
+            potencia = valor * (1000 if unidad == "kW" else 1)
+        else:
+            raise ErrorCalculo("Para motores use W, kW, HP o A como unidad")
+    elif tipo_equipo == "Transformador":
+        if unidad == "kVA":
+            potencia = valor * 1000
+            usa_factor_potencia = False
+        elif unidad in ["W", "kW"]:
+            potencia = valor * (1000 if unidad == "kW" else 1)
+        else:
+            raise ErrorCalculo("Para transformadores use W, kW, kVA o A como unidad")
+    elif tipo_equipo == "Capacitor":
+        if unidad != "kVAR":
+            raise ErrorCalculo("Para capacitores use únicamente kVAR o A como unidad")
+        potencia = valor * 1000
+        usa_factor_potencia = False
+    else:
+        potencia = valor * (1000 if unidad == "kW" else 1)
+
+    if factor_demanda < 1.0:
+        potencia *= factor_demanda
+
+    if tipo_circuito == "monofasico":
+        return potencia / (voltaje * factor_potencia) if usa_factor_potencia else potencia / voltaje
+    if usa_factor_potencia:
+        return potencia / (math.sqrt(3) * voltaje * factor_potencia)
+    return potencia / (math.sqrt(3) * voltaje)
+
+
+def calcular_corriente_por_equipo(tipo_equipo, valor, unidad, voltaje, tipo_circuito, factor_potencia,
+                                  eficiencia=0.90, factor_demanda=1.0, explicar=True):
+    """Corriente del equipo y fórmula explicada; con explicar=False la fórmula es None."""
+    if not explicar:
+        return corriente_por_equipo(tipo_equipo, valor, unidad, voltaje, tipo_circuito, factor_potencia,
+                                    eficiencia, factor_demanda), None
+
+    if unidad == "A":
+        return float(valor), f"Corriente ingresada directamente: {valor} A"
+
+    valor = float(valor)
+
+    if tipo_equipo == "Motor":
+        if unidad == "HP":
+            potencia_mecanica = valor * 746
+            potencia_electrica = potencia_mecanica / eficiencia
+            formula = f"Motor: P_eléctrica = (HP × 746) / η = ({valor} × 746) / {eficiencia} = {potencia_electrica:.0f} W"
+        elif unidad in ["W", "kW"]:
+            potencia_electrica = valor * (1000 if unidad == "kW" else 1)
+            formula = f"Motor: P_eléctrica = {valor} {unidad} = {potencia_electrica:.0f} W"
+        else:
+            raise ErrorCalculo("Para motores use W, kW, HP o A como unidad")
+
+        # Aplicar factor de demanda si es alimentador
+        if factor_demanda < 1.0:
+            potencia_electrica *= factor_demanda
+            formula += f"\nFactor de demanda aplicado: {factor_demanda} (Alimentador)"
+            formula += f"\nP_demanda = {potencia_electrica:.0f} W"
+
+        if tipo_circuito == "monofasico":
+            corriente = potencia_electrica / (voltaje * factor_potencia)
+            formula += f"\nI = P / (V × cos φ) = {potencia_electrica:.0f} / ({voltaje} × {factor_potencia}) = {corriente:.2f} A"
+        else:
+            corriente = potencia_electrica / (math.sqrt(3) * voltaje * factor_potencia)
+            formula += f"\nI = P / (√3 × V × cos φ) = {potencia_electrica:.0f} / (√3 × {voltaje} × {factor_potencia}) = {corriente:.2f} A"
+
+        return corriente, formula
+
+    elif tipo_equipo == "Transformador":
+        if unidad == "kVA":
+            potencia_aparente = valor * 1000
+
+            # Aplicar factor de demanda si es alimentador
+            if factor_demanda < 1.0:
+                potencia_aparente *= factor_demanda
+                formula = f"Transformador: S = {valor} kVA × {factor_demanda} (Factor demanda) = {potencia_aparente:.0f} VA"
+            else:
+                formula = f"Transformador: S = {valor} kVA = {potencia_aparente:.0f} VA"
+
+            if tipo_circuito == "monofasico":
+                corriente = potencia_aparente / voltaje
+                formula += f"\nI = S / V = {potencia_aparente:.0f} / {voltaje} = {corriente:.2f} A"
+            else:
+                corriente = potencia_aparente / (math.sqrt(3) * voltaje)
+                formula += f"\nI = S / (√3 × V) = {potencia_aparente:.0f} / (√3 × {voltaje}) = {corriente:.2f} A"
+        elif unidad in ["W", "kW"]:
+            potencia_activa = valor * (1000 if unidad == "kW" else 1)
+
+            # Aplicar factor de demanda si es alimentador
+            if factor_demanda < 1.0:
+                potencia_activa *= factor_demanda
+                formula = f"Transformador: P = {valor} {unidad} × {factor_demanda} (Factor demanda) = {potencia_activa:.0f} W"
+            else:
+                formula = f"Transformador: P = {valor} {unidad} = {potencia_activa:.0f} W"
+
+            if tipo_circuito == "monofasico":
+                corriente = potencia_activa / (voltaje * factor_potencia)
+                formula += f"\nI = P / (V × cos φ) = {potencia_activa:.0f} / ({voltaje} × {factor_potencia}) = {corriente:.2f} A"
+            else:
+                corriente = potencia_activa / (math.sqrt(3) * voltaje * factor_potencia)
+                formula += f"\nI = P / (√3 × V × cos φ) = {potencia_activa:.0f} / (√3 × {voltaje} × {factor_potencia}) = {corriente:.2f} A"
+        else:
+            raise ErrorCalculo("Para transformadores use W, kW, kVA o A como unidad")
+
+        return corriente, formula
+    elif tipo_equipo == "Capacitor":
+        # IMPLEMENTACIÓN ESPECÍFICA PARA CAPACITORES
+        if unidad == "kVAR":
+            potencia_reactiva = valor * 1000  # Convertir kVAR a VAR
+
+            # Aplicar factor de demanda si es alimentador
+            if factor_demanda < 1.0:
+                potencia_reactiva *= factor_demanda
+                formula = f"Capacitor: Q = {valor} kVAR × {factor_demanda} (Factor demanda) = {potencia_reactiva:.0f} VAR"
+            else:
+                formula = f"Capacitor: Q = {valor} kVAR = {potencia_reactiva:.0f} VAR"
+
+            if tipo_circuito == "monofasico":
+                corriente = potencia_reactiva / voltaje
+                formula += f"\nI = Q / V = {potencia_reactiva:.0f} / {voltaje} = {corriente:.2f} A"
+            else:
+                corriente = potencia_reactiva / (math.sqrt(3) * voltaje)
+                formula += f"\nI = Q / (√3 × V) = {potencia_reactiva:.0f} / (√3 × {voltaje}) = {corriente:.2f} A"
+
+            return corriente, formula
+        else:
+            raise ErrorCalculo("Para capacitores use únicamente kVAR o A como unidad")
+    else:
+        # CARGAS GENÉRICAS (Potencia, Generador, etc.)
+        potencia = valor * (1000 if unidad == "kW" else 1)
+
+        # Aplicar factor de demanda si es alimentador
+        if factor_demanda < 1.0:
+            potencia *= factor_demanda
+            formula = f"Carga: P = {valor} {unidad} × {factor_demanda} (Factor demanda) = {potencia:.0f} W"
+        else:
+            formula = f"Carga: P = {valor} {unidad} = {potencia:.0f} W"
+
+        if tipo_circuito == "monofasico":
+            corriente = potencia / (voltaje * factor_potencia)
+            formula += f"\nI = P / (V × cos φ) = {potencia:.0f} / ({voltaje} × {factor_potencia}) = {corriente:.2f} A"
+        else:
+            corriente = potencia / (math.sqrt(3) * voltaje * factor_potencia)
+            formula += f"\nI = P / (√3 × V × cos φ) = {potencia:.0f} / (√3 × {voltaje} × {factor_potencia}) = {corriente:.2f} A"
+
+        return corriente, formula
+
+
+def obtener_ampacidades_correctas(material, temp_conductor, es_charola=False):
+    """Tabla de ampacidad y fuente normativa según material, temperatura e instalación."""
+    if temp_conductor not in ("60 °C", "75 °C", "90 °C"):
+        # Igual que la selección original: en conduit se toma 90 °C y en charola 75 °C
+        temp_conductor = "60 °C" if es_charola else "90 °C"
+    material = "cobre" if material == "cobre" else "aluminio"
+    return REGISTRO.tablas_ampacidad[(material, temp_conductor, bool(es_charola))]
+
+
+def seleccionar_calibre(corriente_por_conductor, material, temp_conductor="75 °C", es_charola=False):
+    """Búsqueda binaria del calibre: (calibre, ampacidad, excede_tabla, fuente_tabla)."""
+    ampacidades, fuente_tabla = obtener_ampacidades_correctas(material, temp_conductor, es_charola)
+    calibre, ampacidad, excede_tabla = ampacidades.buscar(corriente_por_conductor)
+    return calibre, ampacidad, excede_tabla, fuente_tabla
+
+
+def obtener_tabla_impedancias(material, canalizacion):
+    """Tabla de impedancias y descripción de la instalación según canalización y material."""
+    if canalizacion == "Charola":
+        if material == "cobre":
+            tabla_impedancias = impedancia_charola_cobre
+        else:
+            tabla_impedancias = impedancia_charola_aluminio
+        return tabla_impedancias, "Charola Portacables (Tabla 310-15(b)(20))"
+
+    canalizacion_clave = canalizacion
+    if canalizacion not in ["PVC", "Acero"]:
+        canalizacion_clave = "PVC"
+
+    tablas_material = impedancia_cobre if material == "cobre" else impedancia_aluminio
+    if canalizacion_clave not in tablas_material:
+        raise ErrorCalculo(f"Tipo de canalización '{canalizacion_clave}' no encontrado para {material}.")
+    return tablas_material[canalizacion_clave], f"Conduit {canalizacion_clave} (Tabla 310-15(b)(16))"
+
+
+def obtener_impedancia(calibre, material, canalizacion):
+    """Impedancia (Ω/km) del calibre según canalización y material."""
+    tabla_impedancias, tipo_instalacion = obtener_tabla_impedancias(material, canalizacion)
+
+    if calibre not in tabla_impedancias:
+        if canalizacion == "Charola":
+            raise ErrorCalculo(f"Calibre {calibre} no disponible para charola en Tabla 310-15(b)(20).")
+        canalizacion_clave = canalizacion if canalizacion in ["PVC", "Acero"] else "PVC"
+        raise ErrorCalculo(f"Calibre {calibre} no encontrado para {material.capitalize()} en {canalizacion_clave}.")
+
+    return tabla_impedancias[calibre], tipo_instalacion
+
+
+def seleccionar_tierra_fisica(corriente_interruptor):
+    """Calibre de tierra física según el interruptor (Tabla 250-122)."""
+    return REGISTRO.indice_tierra_fisica.buscar(corriente_interruptor)[0]
+
+
+def recomendar_calibre(corriente, material, num_conductores=1, temp_conductor="75 °C", tipo_equipo="Motor",
+                       es_corriente_interruptor=False, es_charola=False):
+    ampacidades, fuente_tabla = obtener_ampacidades_correctas(material, temp_conductor, es_charola)
+
+    if not es_corriente_interruptor:
+        factor, factor_aplicado = obtener_factor_proteccion(tipo_equipo)
+        corriente_para_calibre = corriente * factor
+    else:
+        factor_aplicado = "N/A (ya considerado en interruptor)"
+        corriente_para_calibre = corriente
+
+    corriente_por_conductor = corriente_para_calibre / num_conductores
+
+    calibre, ampacidad, _ = ampacidades.buscar(corriente_por_conductor)
+    return calibre, ampacidad, corriente_por_conductor, corriente_para_calibre, factor_aplicado, fuente_tabla
+
+
+def seleccionar_interruptor(corriente, tipo_equipo, corriente_para_calibre, tipo_circuito="trifasico"):
+    if tipo_equipo == "Motor":
+        if corriente <= 30:
+            corriente_interruptor = corriente * 2.5
+            tipo_proteccion = "Termomagnético Tipo D"
+            curva_caracteristica = "Tipo D (arranque de motores)"
+            factor_aplicado = "250% de I_motor (Art. 430-52)"
+        else:
+            corriente_interruptor = corriente * 1.75
+            tipo_proteccion = "Termomagnético Tipo C"
+            curva_caracteristica = "Tipo C (motores grandes)"
+            factor_aplicado = "175% de I_motor (Art. 430-52)"
+
+    elif tipo_equipo == "Transformador":
+        if corriente <= 9:
+            corriente_interruptor = corriente * 1.67
+            factor_aplicado = "167% de I_trafo (Art. 450-3)"
+        else:
+            corriente_interruptor = corriente * 1.25
+            factor_aplicado = "125% de I_trafo (Art. 450-3)"
+        tipo_proteccion = "Termomagnético Tipo C"
+        curva_caracteristica = "Tipo C (cargas resistivas)"
+
+    elif tipo_equipo == "Capacitor":
+        corriente_interruptor = corriente * 1.65
+        tipo_proteccion = "Termomagnético Tipo C"
+        curva_caracteristica = "Tipo C (cargas capacitivas)"
+        factor_aplicado = "165% de I_capacitor (Art. 460-8)"
+
+    elif tipo_equipo == "Generador":
+        corriente_interruptor = corriente * 1.15
+        tipo_proteccion = "Termomagnético Tipo C"
+        curva_caracteristica = "Tipo C (fuente de alimentación)"
+        factor_aplicado = "115% de I_generador (Art. 445-4)"
+
+    else:
+        corriente_interruptor = corriente_para_calibre
+        tipo_proteccion = "Termomagnético Tipo C"
+        curva_caracteristica = "Tipo C (uso general)"
+        factor_aplicado = "125% de I_carga (aplicado en calibre)"
+
+    interruptor_seleccionado, sin_interruptor_suficiente = REGISTRO.indice_interruptores.buscar(corriente_interruptor)
+
+    num_polos = "1P" if tipo_circuito == "monofasico" else "3P"
+
+    advertencia_interruptor = ""
+    if sin_interruptor_suficiente:
+        advertencia_interruptor = "⚠️ ADVERTENCIA: No hay interruptor comercial suficiente para la protección requerida"
+    elif tipo_equipo == "Motor" and interruptor_seleccionado > corriente * 3:
+        advertencia_interruptor = "⚠️ NOTA: Verificar coordinación con protección de sobrecarga del motor"
+
+    return {
+        'capacidad': interruptor_seleccionado,
+        'tipo_proteccion': tipo_proteccion,
+        'curva_caracteristica': curva_caracteristica,
+        'num_polos': num_polos,
+        'corriente_proteccion': corriente_interruptor,
+        'factor_aplicado': factor_aplicado,
+        'advertencia': advertencia_interruptor
+    }
+
+
+def textos_caida(tipo_circuito, z_individual, corriente, longitud, num_conductores):
+    """Fórmula y sustitución de la caída de tensión: (formula_caida, calculo_caida)."""
+    if tipo_circuito == "monofasico":
+        return ("Monofásico: ΔV = (2 × Z × I × L / 1000) / n",
+                f"ΔV = (2 × {z_individual} × {corriente:.2f} × {longitud} / 1000) / {num_conductores}")
+    return ("Trifásico: ΔV = (√3 × Z × I × L / 1000) / n",
+            f"ΔV = (√3 × {z_individual} × {corriente:.2f} × {longitud} / 1000) / {num_conductores}")
+
+
+def mensaje_margen(corriente_por_conductor, ampacidad_calibre, margen_seguridad):
+    """Mensaje de advertencia según el margen entre ampacidad y corriente por conductor."""
+    if corriente_por_conductor > ampacidad_calibre:
+        return "❌ ERROR CRÍTICO: El calibre es INSUFICIENTE para la corriente requerida"
+    elif margen_seguridad < 5:
+        return "⚠️ ADVERTENCIA: El calibre está muy cerca del límite de ampacidad"
+    elif margen_seguridad < 15:
+        return "⚠️ PRECAUCIÓN: Margen de seguridad mínimo"
+    return f"✅ CORRECTO: Margen de seguridad del {margen_seguridad:.1f}%"
+
+
+def calcular_circuito(datos, calibre_minimo=None, explicar=True):
+    """Dimensiona un circuito completo y devuelve un ResultadoCalculo.
+
+    Si se indica calibre_minimo y es mayor que el seleccionado por ampacidad, se
+    usa ese calibre (por ejemplo, para cumplir la caída de tensión). Con
+    explicar=False no se arman las fórmulas ni el mensaje de advertencia
+    (TEXTOS_EXPLICACION); se generan la primera vez que se consultan.
+    """
+    if datos.num_conductores < 1:
+        raise ErrorCalculo("El número de conductores por fase debe ser al menos 1")
+    valor_potencia = float(datos.valor_potencia)
+    if not (math.isfinite(valor_potencia) and valor_potencia > 0):
+        raise ValueError(MENSAJE_POTENCIA_INVALIDA)
+    voltaje = float(datos.voltaje)
+    if not (math.isfinite(voltaje) and voltaje > 0):
+        raise ValueError(MENSAJE_VOLTAJE_INVALIDO)
+
+    if datos.unidad_potencia not in ["A", "kVAR"]:
+        factor_potencia = datos.factor_potencia
+        if not (0.1 <= factor_potencia <= 1.0):
+            raise ErrorCalculo("Factor de potencia debe estar entre 0.1 y 1.0")
+    else:
+        factor_potencia = 1.0
+
+    tipo_equipo = datos.tipo_equipo
+    factor_demanda = obtener_factor_demanda(datos.tipo_carga, tipo_equipo)
+
+    corriente, formula_corriente = calcular_corriente_por_equipo(
+        tipo_equipo, datos.valor_potencia, datos.unidad_potencia, datos.voltaje, datos.tipo_circuito,
+        factor_potencia, datos.eficiencia, factor_demanda, explicar
+    )
+
+    # PASO 1: Calcular factor normativo para protección
+    factor_proteccion, factor_aplicado_texto = obtener_factor_proteccion(tipo_equipo)
+    corriente_para_proteccion = corriente * factor_proteccion
+
+    # PASO 2: Seleccionar interruptor basado en corriente con factor
+    interruptor_info = seleccionar_interruptor(corriente, tipo_equipo, corriente_para_proteccion, datos.tipo_circuito)
+
+    # PASO 3: Usar corriente del interruptor para calcular calibre (SIN volver a aplicar factor)
+    corriente_interruptor = interruptor_info['capacidad']
+    corriente_por_conductor_final = corriente_interruptor / datos.num_conductores
+
+    # PASO 4: Seleccionar calibre basado en corriente del interruptor
+    es_charola = datos.canalizacion == "Charola"
+    calibre, ampacidad_calibre, _, _, _, fuente_tabla = recomendar_calibre(
+        corriente=corriente_interruptor,
+        material=datos.material,
+        num_conductores=datos.num_conductores,
+        temp_conductor=datos.temp_conductor,
+        tipo_equipo=tipo_equipo,
+        es_corriente_interruptor=True,
+        es_charola=es_charola
+    )
+    calibre_por_ampacidad = calibre
+
+    if calibre_minimo is not None and REGISTRO.indice_calibre[calibre_minimo] > REGISTRO.indice_calibre[calibre]:
+        ampacidades, _ = obtener_ampacidades_correctas(datos.material, datos.temp_conductor, es_charola)
+        if calibre_minimo not in ampacidades:
+            raise ErrorCalculo(f"Calibre {calibre_minimo} no disponible en {fuente_tabla}.")
+        calibre = calibre_minimo
+        ampacidad_calibre = ampacidades[calibre]
+
+    # PASO 5: Caída de tensión con impedancia según canalización y material
+    z_individual, tipo_instalacion = obtener_impedancia(calibre, datos.material, datos.canalizacion)
+
+    num_conductores = datos.num_conductores
+    longitud = datos.longitud
+    if datos.tipo_circuito == "monofasico":
+        caida_v = (2 * z_individual * corriente * longitud / 1000) / num_conductores
+    else:
+        caida_v = (math.sqrt(3) * z_individual * corriente * longitud / 1000) / num_conductores
+    if explicar:
+        formula_caida, calculo_caida = textos_caida(datos.tipo_circuito, z_individual, corriente, longitud,
+                                                    num_conductores)
+    else:
+        formula_caida = calculo_caida = None
+
+    caida_p = (caida_v / datos.voltaje) * 100
+
+    margen_seguridad = ((ampacidad_calibre - corriente_por_conductor_final) / corriente_por_conductor_final) * 100
+    if explicar:
+        mensaje_advertencia = mensaje_margen(corriente_por_conductor_final, ampacidad_calibre, margen_seguridad)
+    else:
+        mensaje_advertencia = None
+
+    # PASO 6: Tierra física según interruptor (Tabla 250-122)
+    calibre_tierra = seleccionar_tierra_fisica(corriente_interruptor)
+
+    resultado = ResultadoCalculo(
+        datos=datos,
+        factor_potencia=factor_potencia,
+        factor_demanda=factor_demanda,
+        corriente=corriente,
+        formula_corriente=formula_corriente,
+        es_corriente_directa=datos.unidad_potencia == "A",
+        corriente_para_proteccion=corriente_para_proteccion,
+        factor_aplicado_texto=factor_aplicado_texto,
+        interruptor_info=interruptor_info,
+        calibre=calibre,
+        ampacidad_calibre=ampacidad_calibre,
+        corriente_por_conductor_final=corriente_por_conductor_final,
+        fuente_tabla=fuente_tabla,
+        tipo_instalacion=tipo_instalacion,
+        es_charola=es_charola,
+        z_individual=z_individual,
+        caida_v=caida_v,
+        caida_p=caida_p,
+        formula_caida=formula_caida,
+        calculo_caida=calculo_caida,
+        margen_seguridad=margen_seguridad,
+        mensaje_advertencia=mensaje_advertencia,
+        calibre_tierra=calibre_tierra,
+        calibre_por_ampacidad=calibre_por_ampacidad
+    )
+    if not explicar:
+        for campo in TEXTOS_EXPLICACION:
+            del resultado.__dict__[campo]
+    return resultado
+
+
+def entrada_historial(resultado, timestamp=None):
+    """Diccionario del historial con los mismos campos que Calculos.agregar_historial_completo."""
+    datos = resultado.datos
+    return {
+        'timestamp': timestamp or datetime.now().strftime("%H:%M:%S"),
+        'tipo_circuito': datos.tipo_circuito,
+        'tipo_carga': datos.tipo_carga,
+        'valor_potencia': datos.valor_potencia,
+        'unidad_potencia': datos.unidad_potencia,
+        'corriente': resultado.corriente,
+        'corriente_para_proteccion': resultado.corriente_para_proteccion,
+        'corriente_interruptor': resultado.interruptor_info['capacidad'],
+        'voltaje': datos.voltaje,
+        'calibre': resultado.calibre,
+        'material': datos.material,
+        'longitud': datos.longitud,
+        'num_conductores': datos.num_conductores,
+        'canalizacion': datos.canalizacion,
+        'z': resultado.z_individual,
+        'factor_potencia': resultado.factor_potencia,
+        'tipo_equipo': datos.tipo_equipo,
+        'formula_corriente': resultado.formula_corriente,
+        'formula_caida': resultado.formula_caida,
+        'calculo_caida': resultado.calculo_caida,
+        'caida_v': resultado.caida_v,
+        'caida_p': resultado.caida_p,
+        'ampacidad_calibre': resultado.ampacidad_calibre,
+        'corriente_por_conductor_final': resultado.corriente_por_conductor_final,
+        'mensaje_advertencia': resultado.mensaje_advertencia,
+        'temp_conductor': datos.temp_conductor,
+        'factor_aplicado_texto': resultado.factor_aplicado_texto,
+        'interruptor_info': resultado.interruptor_info,
+        'fuente_tabla': resultado.fuente_tabla,
+        'tipo_instalacion': resultado.tipo_instalacion,
+        'es_charola': resultado.es_charola,
+        'calibre_tierra': resultado.calibre_tierra
+    }
+
+
+def aplicar_limite_caida(resultado, limite):
+    """Sustituye el límite normativo de caída del resultado por 'limite' y recalcula cumple_caida."""
+    resultado.limite_caida = limite
+    resultado.cumple_caida = resultado.caida_p <= limite
+    return resultado
+
+
+def dimensionar_por_caida(datos, max_conductores=None, limite_caida=None, explicar=True):
+    """Calibre mínimo que cumple ampacidad y caída de tensión (Art. 215-2 / 210-19).
+
+    Parte del cálculo normal y, si la caída excede el límite, busca por bisección
+    en la tabla de impedancias el primer calibre con Z ≤ Z_máx, donde
+    Z_máx = Z × límite / caída. Con max_conductores también prueba más
+    conductores por fase. Si ninguna combinación cumple, devuelve la de menor
+    caída posible (cumple_caida en False). Los candidatos intermedios se
+    calculan sin textos; explicar se aplica solo al resultado devuelto.
+    """
+    resultado = _dimensionar_por_caida(datos, max_conductores, limite_caida)
+    return resultado.explicar() if explicar else resultado
+
+
+def _dimensionar_por_caida(datos, max_conductores, limite_caida):
+    resultado = calcular_circuito(datos, explicar=False)
+    limite = resultado.limite_caida if limite_caida is None else limite_caida
+    if resultado.caida_p <= limite:
+        return aplicar_limite_caida(resultado, limite)
+
+    tabla_z, _ = obtener_tabla_impedancias(datos.material, datos.canalizacion)
+    ultimo = max(datos.num_conductores, max_conductores or datos.num_conductores)
+
+    for n in range(datos.num_conductores, ultimo + 1):
+        datos_n = datos if n == datos.num_conductores else replace(datos, num_conductores=n)
+        base = resultado if n == datos.num_conductores else calcular_circuito(datos_n, explicar=False)
+        if base.caida_p <= limite:
+            return aplicar_limite_caida(base, limite)
+
+        i = tabla_z.buscar_maxima(base.z_individual * limite / base.caida_p)
+        while i < len(tabla_z):
+            candidato = calcular_circuito(datos_n, calibre_minimo=tabla_z.claves[i], explicar=False)
+            if candidato.caida_p <= limite:
+                return aplicar_limite_caida(candidato, limite)
+            i += 1
+
+    return aplicar_limite_caida(calcular_circuito(datos_n, calibre_minimo=tabla_z.claves[-1], explicar=False),
+                                 limite)
+
+
+def costos_por_calibre(precios=None):
+    """Costo unitario por calibre: precio indicado por el usuario o sección en mm² (Tabla 8)."""
+    return REGISTRO.secciones_conductores if precios is None else precios
+
+
+def optimizar_conductores(datos, max_conductores=4, precios=None, limite_caida=None, explicar=True):
+    """Combinación de conductores por fase (1..max_conductores) y calibre de menor costo.
+
+    El costo es n × costo del calibre, con la sección en mm² o el precio de
+    'precios' (los calibres sin precio no se consideran). La combinación debe
+    cumplir ampacidad, coordinación con el interruptor (n × ampacidad ≥
+    interruptor), caída de tensión y calibre mínimo 1/0 en paralelo
+    (Art. 310-10(h)). Devuelve (resultado, costo); si ninguna cumple, devuelve
+    el resultado de dimensionar_por_caida con max_conductores y costo None.
+    """
+    ampacidades, _ = obtener_ampacidades_correctas(datos.material, datos.temp_conductor,
+                                                   datos.canalizacion == "Charola")
+    tabla_z, _ = obtener_tabla_impedancias(datos.material, datos.canalizacion)
+    costos = costos_por_calibre(precios)
+    indice = REGISTRO.indice_calibre
+    candidatos = [c for c in REGISTRO.calibres_ordenados if c in ampacidades and c in tabla_z and c in costos]
+
+    mejor = None
+    mejor_costo = math.inf
+    costo_minimo = min((costos[c] for c in candidatos), default=math.inf)
+    for n in range(1, max_conductores + 1):
+        # Poda: ni el calibre más barato con n conductores mejora la mejor solución
+        if n * costo_minimo >= mejor_costo:
+            break
+        base = dimensionar_por_caida(replace(datos, num_conductores=n), limite_caida=limite_caida, explicar=False)
+        if not base.cumple_caida or base.ampacidad_calibre < base.corriente_por_conductor_final:
+            continue
+
+        minimo = indice[base.calibre]
+        if n > 1:
+            minimo = max(minimo, indice[REGISTRO.calibre_minimo_paralelo])
+        calibre = min((c for c in candidatos if indice[c] >= minimo), key=costos.__getitem__, default=None)
+        if calibre is not None and n * costos[calibre] < mejor_costo:
+            mejor_costo = n * costos[calibre]
+            mejor = (base.datos, calibre, base.limite_caida)
+
+    if mejor is None:
+        resultado = dimensionar_por_caida(replace(datos, num_conductores=1), max_conductores=max_conductores,
+                                          limite_caida=limite_caida, explicar=explicar)
+        return resultado, None
+
+    datos_n, calibre, limite = mejor
+    resultado = calcular_circuito(datos_n, calibre_minimo=calibre, explicar=explicar)
+    return aplicar_limite_caida(resultado, limite), mejor_costo
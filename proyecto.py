@@ -0,0 +1,163 @@
+# PROYECTO.PY - MODELO DE PROYECTO CON RECÁLCULO INCREMENTAL
+#
+# Guarda, por circuito, una huella del contenido de sus datos de entrada junto
+# con la versión de las tablas NOM y la función y configuración de cálculo. Al
+# actualizar el proyecto solo se recalculan los circuitos nuevos o cuya huella
+# cambió; el resto conserva su resultado. Un cambio en las tablas NOM, en la
+# función de cálculo (incluidos los argumentos de un partial) o en la
+# configuración cambia todas las huellas y recalcula el proyecto completo.
+
+import hashlib
+import json
+from dataclasses import fields
+
+from cache_calculo import clave_circuito, describir_funcion
+from cuadro_cargas import describir_error
+from motor_calculo import DatosCircuito, ResultadoCalculo, aplicar_limite_caida, calcular_circuito
+
+# Campos de ResultadoCalculo que se pasan al constructor. limite_caida y cumple_caida se
+# guardan aparte: el constructor pone el límite normativo, pero dimensionar_por_caida y
+# optimizar_conductores pueden haber aplicado otro
+_CAMPOS_RESULTADO = tuple(campo.name for campo in fields(ResultadoCalculo) if campo.init)
+
+
+class Proyecto:
+    """Circuitos de un proyecto con sus resultados, indexados por identificador."""
+
+    def __init__(self, funcion_calculo=calcular_circuito, configuracion=""):
+        self.funcion_calculo = funcion_calculo
+        self.configuracion = configuracion
+        self.circuitos = {}
+        self.huellas = {}
+        self.resultados = {}
+        self.errores = {}
+
+    def huella(self, datos):
+        """Huella del circuito: datos normalizados + versión de tablas + función y configuración de cálculo."""
+        contenido = repr((describir_funcion(self.funcion_calculo), self.configuracion) + clave_circuito(datos))
+        return hashlib.sha256(contenido.encode("utf-8")).hexdigest()[:16]
+
+    def actualizar(self, circuitos, procesos=1):
+        """Sincroniza el proyecto con {identificador: DatosCircuito} y recalcula solo lo necesario.
+
+        Devuelve un diccionario con las listas 'nuevos', 'modificados' y
+        'eliminados' y el número de circuitos 'sin_cambios'.
+        """
+        circuitos = dict(circuitos)
+        cambios = {'nuevos': [], 'modificados': [], 'eliminados': [], 'sin_cambios': 0}
+        huellas = {}
+        pendientes = []
+        for identificador, datos in circuitos.items():
+            huellas[identificador] = huella = self.huella(datos)
+            anterior = self.huellas.get(identificador)
+            if anterior == huella:
+                cambios['sin_cambios'] += 1
+                continue
+            cambios['nuevos' if identificador not in self.circuitos else 'modificados'].append(identificador)
+            pendientes.append(identificador)
+
+        cambios['eliminados'] = [identificador for identificador in self.circuitos if identificador not in circuitos]
+        for identificador in cambios['eliminados']:
+            self.resultados.pop(identificador, None)
+            self.errores.pop(identificador, None)
+
+        self._recalcular(pendientes, circuitos, procesos)
+        # Conservar el orden de entrada del cuadro de cargas
+        self.circuitos = circuitos
+        self.huellas = huellas
+        self.resultados = {i: self.resultados[i] for i in circuitos if i in self.resultados}
+        self.errores = {i: self.errores[i] for i in circuitos if i in self.errores}
+        return cambios
+
+    def _recalcular(self, identificadores, circuitos, procesos):
+        if procesos > 1 and len(identificadores) > 1:
+            from lote_paralelo import calcular_en_paralelo
+
+            calculados = calcular_en_paralelo((circuitos[i] for i in identificadores),
+                                              max_procesos=procesos, funcion_calculo=self.funcion_calculo)
+            salida = ((i, resultado, error) for i, (_, resultado, error) in zip(identificadores, calculados))
+        else:
+            salida = (self._calcular(i, circuitos[i]) for i in identificadores)
+
+        for identificador, resultado, error in salida:
+            if error:
+                self.resultados.pop(identificador, None)
+                self.errores[identificador] = error
+            else:
+                self.resultados[identificador] = resultado
+                self.errores.pop(identificador, None)
+
+    def _calcular(self, identificador, datos):
+        try:
+            return identificador, self.funcion_calculo(datos), ""
+        except Exception as e:
+            return identificador, None, describir_error(e)
+
+    def __len__(self):
+        return len(self.circuitos)
+
+    def __iter__(self):
+        """Genera (identificador, datos, resultado, error) en el orden del proyecto."""
+        for identificador, datos in self.circuitos.items():
+            yield identificador, datos, self.resultados.get(identificador), self.errores.get(identificador, "")
+
+    def guardar(self, ruta):
+        """Guarda circuitos, huellas y resultados en un archivo JSON."""
+        contenido = {
+            'configuracion': self.configuracion,
+            'circuitos': [
+                {
+                    'id': identificador,
+                    'datos': vars(datos).copy(),
+                    'huella': self.huellas[identificador],
+                    'resultado': resultado_a_dict(resultado),
+                    'error': error,
+                }
+                for identificador, datos, resultado, error in self
+            ],
+        }
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            archivo.write(json.dumps(contenido, ensure_ascii=False))
+
+    @classmethod
+    def cargar(cls, ruta, funcion_calculo=calcular_circuito, configuracion=""):
+        """Carga un proyecto guardado; las huellas de otra versión de tablas se recalcularán al actualizar."""
+        with open(ruta, encoding="utf-8") as archivo:
+            contenido = json.load(archivo)
+        proyecto = cls(funcion_calculo, configuracion)
+        configuracion_igual = contenido.get('configuracion', "") == configuracion
+        for circuito in contenido['circuitos']:
+            identificador = circuito['id']
+            datos = DatosCircuito(**circuito['datos'])
+            proyecto.circuitos[identificador] = datos
+            # Con otra configuración la huella guardada no es válida
+            proyecto.huellas[identificador] = circuito['huella'] if configuracion_igual else None
+            if circuito['resultado'] is not None:
+                proyecto.resultados[identificador] = resultado_desde_dict(circuito['resultado'])
+            if circuito['error']:
+                proyecto.errores[identificador] = circuito['error']
+        return proyecto
+
+
+def resultado_a_dict(resultado):
+    """ResultadoCalculo como diccionario serializable a JSON (None si no hay resultado)."""
+    if resultado is None:
+        return None
+    contenido = {campo: getattr(resultado, campo) for campo in _CAMPOS_RESULTADO}
+    contenido['datos'] = vars(resultado.datos).copy()
+    contenido['limite_caida'] = resultado.limite_caida
+    contenido['cumple_caida'] = resultado.cumple_caida
+    return contenido
+
+
+def resultado_desde_dict(contenido):
+    """Reconstruye un ResultadoCalculo guardado con resultado_a_dict, con su límite de caída."""
+    valores = dict(contenido)
+    valores['datos'] = DatosCircuito(**valores['datos'])
+    limite = valores.pop('limite_caida', None)
+    valores.pop('cumple_caida', None)
+    resultado = ResultadoCalculo(**valores)
+    # Archivos anteriores sin límite guardado: se queda el normativo del constructor
+    if limite is not None:
+        aplicar_limite_caida(resultado, limite)
+    return resultado
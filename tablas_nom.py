@@ -0,0 +1,420 @@
+# TABLAS_NOM.PY - REGISTRO ÚNICO DE TABLAS NOM-001-SEDE-2012
+#
+# Las tablas se definen una sola vez y se compilan al importar el módulo en
+# objetos de solo lectura (claves ordenadas + índice por clave). El mismo
+# registro lo comparten calculosint, motor_calculo, calculo_lote, tuberia y exportador.
+
+import hashlib
+from bisect import bisect_left
+from collections.abc import Mapping
+from types import MappingProxyType
+
+
+# Datos base de las tablas (no modificar en tiempo de ejecución)
+_ampacidades_cobre_75 = {
+    "14": 20, "12": 25, "10": 35, "8": 50, "6": 65,
+    "4": 85, "3": 100, "2": 115, "1": 130,
+    "1/0": 150, "2/0": 175, "3/0": 200, "4/0": 230,
+    "250": 255, "300": 285, "350": 310, "400": 335,
+    "500": 380, "600": 420, "750": 475, "1000": 545,
+    "1250": 590, "1500": 625, "1750": 650, "2000": 665
+}
+
+_ampacidades_cobre_60 = {
+    "14": 15, "12": 20, "10": 30, "8": 40, "6": 55,
+    "4": 70, "3": 85, "2": 95, "1": 110,
+    "1/0": 125, "2/0": 145, "3/0": 165, "4/0": 195,
+    "250": 215, "300": 240, "350": 260, "400": 280,
+    "500": 320, "600": 355, "750": 400, "1000": 455,
+    "1250": 495, "1500": 520, "1750": 545, "2000": 560
+}
+
+_ampacidades_cobre_90 = {
+    "14": 25, "12": 30, "10": 40, "8": 55, "6": 75,
+    "4": 95, "3": 110, "2": 130, "1": 150,
+    "1/0": 170, "2/0": 195, "3/0": 225, "4/0": 260,
+    "250": 290, "300": 320, "350": 350, "400": 380,
+    "500": 430, "600": 475, "750": 535, "1000": 615,
+    "1250": 665, "1500": 700, "1750": 735, "2000": 750
+}
+
+_ampacidades_aluminio = {
+    "12": 20, "10": 25, "8": 30, "6": 40, "4": 55, "3": 65,
+    "2": 75, "1": 85, "1/0": 100, "2/0": 115, "3/0": 130,
+    "4/0": 150, "250": 170, "300": 190, "350": 210,
+    "400": 225, "500": 260, "600": 285, "750": 320, "1000": 375,
+    "1250": 405, "1500": 435, "1750": 455, "2000": 470
+}
+
+_ampacidades_charola_cobre_75 = {
+    "8": 57, "6": 76, "4": 101, "3": 118, "2": 135, "1": 158,
+    "1/0": 183, "2/0": 212, "3/0": 245, "4/0": 287,
+    "250": 320, "300": 359, "350": 397, "400": 430,
+    "500": 496, "600": 553, "700": 610, "750": 638,
+    "800": 660, "900": 704, "1000": 750, "1250": 834,
+    "1500": 909, "1750": 980, "2000": 1042
+}
+
+_ampacidades_charola_cobre_90 = {
+    "8": 66, "6": 89, "4": 117, "3": 138, "2": 158, "1": 185,
+    "1/0": 214, "2/0": 247, "3/0": 287, "4/0": 335,
+    "250": 374, "300": 419, "350": 464, "400": 503,
+    "500": 580, "600": 647, "700": 714, "750": 747,
+    "800": 773, "900": 826, "1000": 877, "1250": 975,
+    "1500": 1063, "1750": 1146, "2000": 1219
+}
+
+_ampacidades_charola_aluminio_75 = {
+    "6": 59, "4": 78, "3": 92, "2": 106, "1": 123,
+    "1/0": 143, "2/0": 165, "3/0": 192, "4/0": 224,
+    "250": 251, "300": 282, "350": 312, "400": 339,
+    "500": 392, "600": 440, "700": 488, "750": 512,
+    "800": 532, "900": 568, "1000": 603, "1250": 669,
+    "1500": 729, "1750": 787, "2000": 837
+}
+
+_ampacidades_charola_aluminio_90 = {
+    "6": 69, "4": 91, "3": 107, "2": 123, "1": 144,
+    "1/0": 167, "2/0": 193, "3/0": 224, "4/0": 262,
+    "250": 292, "300": 328, "350": 364, "400": 395,
+    "500": 458, "600": 514, "700": 570, "750": 598,
+    "800": 622, "900": 664, "1000": 705, "1250": 782,
+    "1500": 852, "1750": 920, "2000": 979
+}
+
+_calibre_tierra_fisica = {
+    15: "14", 20: "12", 30: "10", 40: "10", 60: "10",
+    100: "8", 200: "6", 300: "4", 400: "3", 600: "2",
+    800: "1/0", 1000: "1/0", 1200: "2/0", 1600: "3/0",
+    2000: "4/0", 2500: "250", 3000: "250", 4000: "350",
+    5000: "400", 6000: "500"
+}
+
+_interruptores_comerciales = [
+    15, 20, 25, 30, 40, 50, 60, 70, 80, 90, 100, 110, 125, 150,
+    175, 200, 225, 250, 300, 350, 400, 450, 500, 600, 700, 800,
+    1000, 1200, 1600, 2000, 2500, 3000, 4000, 5000, 6000
+]
+
+_impedancia_cobre = {
+    "PVC": {
+        "14": 8.9, "12": 5.6, "10": 3.6, "8": 2.26, "6": 1.44,
+        "4": 0.95, "3": 0.75, "2": 0.62, "1": 0.52,
+        "1/0": 0.43, "2/0": 0.36, "3/0": 0.29, "4/0": 0.24,
+        "250": 0.217, "300": 0.194, "350": 0.174, "400": 0.161,
+        "500": 0.141, "600": 0.131, "750": 0.118, "1000": 0.105,
+        "1250": 0.094, "1500": 0.087, "1750": 0.082, "2000": 0.079
+    },
+    "Aluminio": {
+        "14": 9.1, "12": 5.7, "10": 3.7, "8": 2.32, "6": 1.48,
+        "4": 0.97, "3": 0.79, "2": 0.64, "1": 0.54,
+        "1/0": 0.44, "2/0": 0.37, "3/0": 0.302, "4/0": 0.256,
+        "250": 0.23, "300": 0.207, "350": 0.19, "400": 0.174,
+        "500": 0.157, "600": 0.144, "750": 0.131, "1000": 0.118,
+        "1250": 0.108, "1500": 0.101, "1750": 0.096, "2000": 0.093
+    },
+    "Acero": {
+        "14": 9.3, "12": 5.9, "10": 3.8, "8": 2.38, "6": 1.52,
+        "4": 1.01, "3": 0.82, "2": 0.68, "1": 0.56,
+        "1/0": 0.46, "2/0": 0.39, "3/0": 0.315, "4/0": 0.268,
+        "250": 0.24, "300": 0.213, "350": 0.197, "400": 0.184,
+        "500": 0.164, "600": 0.154, "750": 0.141, "1000": 0.131,
+        "1250": 0.124, "1500": 0.119, "1750": 0.116, "2000": 0.114
+    }
+}
+
+_impedancia_aluminio = {
+    "PVC": {
+        "12": 5.6, "10": 3.6, "8": 2.26, "6": 1.54,
+        "4": 0.95, "3": 0.82, "2": 0.66, "1": 0.56,
+        "1/0": 0.48, "2/0": 0.40, "3/0": 0.34, "4/0": 0.29,
+        "250": 0.263, "300": 0.239, "350": 0.219, "400": 0.204,
+        "500": 0.183, "600": 0.170, "750": 0.156, "1000": 0.140,
+        "1250": 0.131, "1500": 0.125, "1750": 0.121, "2000": 0.119
+    },
+    "Aluminio": {
+        "12": 5.7, "10": 3.7, "8": 2.32, "6": 1.58,
+        "4": 0.98, "3": 0.85, "2": 0.68, "1": 0.58,
+        "1/0": 0.50, "2/0": 0.42, "3/0": 0.35, "4/0": 0.30,
+        "250": 0.270, "300": 0.245, "350": 0.225, "400": 0.210,
+        "500": 0.188, "600": 0.175, "750": 0.161, "1000": 0.145,
+        "1250": 0.136, "1500": 0.130, "1750": 0.126, "2000": 0.124
+    },
+    "Acero": {
+        "12": 5.9, "10": 3.8, "8": 2.38, "6": 1.62,
+        "4": 1.02, "3": 0.88, "2": 0.72, "1": 0.61,
+        "1/0": 0.53, "2/0": 0.44, "3/0": 0.37, "4/0": 0.32,
+        "250": 0.278, "300": 0.252, "350": 0.232, "400": 0.218,
+        "500": 0.195, "600": 0.185, "750": 0.173, "1000": 0.156,
+        "1250": 0.148, "1500": 0.143, "1750": 0.140, "2000": 0.138
+    }
+}
+
+_impedancia_charola_cobre = {
+    "8": 2.0, "6": 1.3, "4": 0.85, "3": 0.68, "2": 0.56, "1": 0.47,
+    "1/0": 0.39, "2/0": 0.33, "3/0": 0.26, "4/0": 0.22,
+    "250": 0.195, "300": 0.175, "350": 0.157, "400": 0.145,
+    "500": 0.127, "600": 0.118, "700": 0.109, "750": 0.106,
+    "800": 0.103, "900": 0.098, "1000": 0.095, "1250": 0.085,
+    "1500": 0.078, "1750": 0.074, "2000": 0.071
+}
+
+_impedancia_charola_aluminio = {
+    "6": 1.42, "4": 0.88, "3": 0.74, "2": 0.60, "1": 0.51,
+    "1/0": 0.44, "2/0": 0.37, "3/0": 0.31, "4/0": 0.26,
+    "250": 0.238, "300": 0.216, "350": 0.198, "400": 0.185,
+    "500": 0.165, "600": 0.153, "700": 0.141, "750": 0.138,
+    "800": 0.135, "900": 0.129, "1000": 0.126, "1250": 0.115,
+    "1500": 0.108, "1750": 0.103, "2000": 0.100
+}
+
+_calibres_ordenados = [
+    "14", "12", "10", "8", "6", "4", "3", "2", "1",
+    "1/0", "2/0", "3/0", "4/0", "250", "300", "350",
+    "400", "500", "600", "700", "750", "800", "900", "1000", "1250", "1500", "1750", "2000"
+]
+
+# Sección transversal del conductor desnudo (mm²), Tabla 8 del Capítulo 10
+_secciones_conductores = {
+    "14": 2.08, "12": 3.31, "10": 5.26, "8": 8.37, "6": 13.3, "4": 21.2,
+    "3": 26.7, "2": 33.6, "1": 42.4, "1/0": 53.5, "2/0": 67.4, "3/0": 85.0,
+    "4/0": 107.0, "250": 127.0, "300": 152.0, "350": 177.0, "400": 203.0,
+    "500": 253.0, "600": 304.0, "700": 355.0, "750": 380.0, "800": 405.0,
+    "900": 456.0, "1000": 507.0, "1250": 633.0, "1500": 760.0, "1750": 887.0,
+    "2000": 1013.0
+}
+
+# Calibre mínimo para conductores en paralelo (Art. 310-10(h))
+_calibre_minimo_paralelo = "1/0"
+
+# Áreas de conductores por tipo de aislamiento (mm²)
+_areas_conductores = {
+    "THW": {
+        "14": 2.08, "12": 3.31, "10": 5.26, "8": 8.37, "6": 13.3, "4": 21.2,
+        "3": 26.7, "2": 33.6, "1": 42.4, "1/0": 53.5, "2/0": 67.4, 
+        "3/0": 85.0, "4/0": 107.2
+    },
+    "XHHW": {
+        "14": 1.97, "12": 3.12, "10": 5.03, "8": 8.09, "6": 13.0, "4": 21.1,
+        "3": 26.2, "2": 33.3, "1": 42.1, "1/0": 53.0, "2/0": 67.0,
+        "3/0": 85.0, "4/0": 107.0
+    },
+    "THHN": {
+        "14": 1.63, "12": 2.53, "10": 4.18, "8": 6.62, "6": 10.7, "4": 17.2,
+        "3": 21.2, "2": 26.7, "1": 32.7, "1/0": 41.7, "2/0": 52.6,
+        "3/0": 64.2, "4/0": 78.7
+    }
+}
+
+# Tabla de tuberías con áreas totales (mm²)
+_tabla_tuberias = {
+    "EMT": {
+        "1/2": 196, "3/4": 336, "1": 558, "1 1/4": 832, 
+        "1 1/2": 1033, "2": 1809
+    },
+    "PVC": {
+        "1/2": 233, "3/4": 387, "1": 638, "1 1/4": 897, 
+        "1 1/2": 1038, "2": 1632
+    },
+    "IMC": {
+        "1/2": 243, "3/4": 408, "1": 682, "1 1/4": 987, 
+        "1 1/2": 1220, "2": 1990
+    },
+    "RMC": {
+        "1/2": 234, "3/4": 387, "1": 638, "1 1/4": 897, 
+        "1 1/2": 1038, "2": 1632
+    }
+}
+
+# Tipos disponibles
+_aislamientos = ["THW", "XHHW", "THHN"]
+_tipos_tuberia = ["EMT", "PVC", "IMC", "RMC"]
+# Límites de caída de tensión por tipo de carga (Art. 215-2 FPN 2 / Art. 210-19 FPN 4)
+_limites_caida = {"alimentador": 2, "derivado": 3}
+
+
+class TablaNOM(Mapping):
+    """Tabla de solo lectura con claves en orden de la norma e índice O(1) por clave."""
+
+    __slots__ = ('claves', 'valores', 'indice')
+
+    def __init__(self, datos):
+        self.claves = tuple(datos.keys())
+        self.valores = tuple(datos.values())
+        self.indice = MappingProxyType({clave: i for i, clave in enumerate(self.claves)})
+
+    def __getitem__(self, clave):
+        return self.valores[self.indice[clave]]
+
+    def __contains__(self, clave):
+        return clave in self.indice
+
+    def __iter__(self):
+        return iter(self.claves)
+
+    def __len__(self):
+        return len(self.claves)
+
+    def __repr__(self):
+        return f"TablaNOM({dict(zip(self.claves, self.valores))!r})"
+
+
+class TablaAmpacidad(TablaNOM):
+    """Tabla de ampacidades monótona creciente con búsqueda binaria del calibre."""
+
+    __slots__ = ('fuente', 'indice_maximo')
+
+    def __init__(self, datos, fuente):
+        super().__init__(datos)
+        if any(a >= b for a, b in zip(self.valores, self.valores[1:])):
+            raise ValueError(f"Las ampacidades de '{fuente}' no son crecientes")
+        self.fuente = fuente
+        self.indice_maximo = len(self.valores) - 1
+
+    def buscar(self, corriente):
+        """Devuelve (calibre, ampacidad, excede_tabla) para la corriente por conductor.
+
+        El calibre es el primero con ampacidad ≥ corriente; si ninguno alcanza se
+        devuelve el calibre máximo de la tabla con excede_tabla en True.
+        """
+        i = bisect_left(self.valores, corriente)
+        if i > self.indice_maximo:
+            return self.claves[self.indice_maximo], self.valores[self.indice_maximo], True
+        return self.claves[i], self.valores[i], False
+
+
+class TablaImpedancia(TablaNOM):
+    """Tabla de impedancias (Ω/km) decreciente con el calibre, con búsqueda binaria."""
+
+    __slots__ = ('negativos',)
+
+    def __init__(self, datos):
+        super().__init__(datos)
+        if any(a <= b for a, b in zip(self.valores, self.valores[1:])):
+            raise ValueError("Las impedancias deben decrecer con el calibre")
+        # bisect trabaja sobre secuencias crecientes
+        self.negativos = tuple(-z for z in self.valores)
+
+    def buscar_maxima(self, z_maxima):
+        """Índice del primer calibre con impedancia ≤ z_maxima (len(self) si ninguno)."""
+        return bisect_left(self.negativos, -z_maxima)
+
+
+class IndicePuntosQuiebre:
+    """Índice de puntos de quiebre ordenados: primer límite ≥ valor, por bisección.
+
+    Lo usan el cálculo por circuito (buscar) y el cálculo por lotes
+    (np.searchsorted sobre 'limites' y 'valores').
+    """
+
+    __slots__ = ('limites', 'valores', 'valor_excedido')
+
+    def __init__(self, limites, valores, valor_excedido):
+        if any(a >= b for a, b in zip(limites, limites[1:])):
+            raise ValueError("Los puntos de quiebre deben ser estrictamente crecientes")
+        self.limites = tuple(limites)
+        self.valores = tuple(valores)
+        self.valor_excedido = valor_excedido
+
+    def buscar(self, valor):
+        """Devuelve (resultado, excede) para el primer límite ≥ valor."""
+        i = bisect_left(self.limites, valor)
+        if i == len(self.limites):
+            return self.valor_excedido, True
+        return self.valores[i], False
+
+
+def _agrupar(tablas, clase=TablaNOM):
+    return MappingProxyType({nombre: clase(datos) for nombre, datos in tablas.items()})
+
+
+class RegistroNOM:
+    """Conjunto de tablas NOM compiladas. Usar la instancia compartida REGISTRO."""
+
+    def __init__(self):
+        conduit = "Tabla 310-15(b)(16) - Conduit"
+        charola = "Tabla 310-15(b)(20) - Charola"
+        charola_60 = "Tabla 310-15(b)(20) - Charola (60°C no disponible, usando 75°C)"
+        self.ampacidades_cobre_60 = TablaAmpacidad(_ampacidades_cobre_60, conduit)
+        self.ampacidades_cobre_75 = TablaAmpacidad(_ampacidades_cobre_75, conduit)
+        self.ampacidades_cobre_90 = TablaAmpacidad(_ampacidades_cobre_90, conduit)
+        self.ampacidades_aluminio = TablaAmpacidad(_ampacidades_aluminio, conduit)
+        self.ampacidades_charola_cobre_75 = TablaAmpacidad(_ampacidades_charola_cobre_75, charola)
+        self.ampacidades_charola_cobre_90 = TablaAmpacidad(_ampacidades_charola_cobre_90, charola)
+        self.ampacidades_charola_aluminio_75 = TablaAmpacidad(_ampacidades_charola_aluminio_75, charola)
+        self.ampacidades_charola_aluminio_90 = TablaAmpacidad(_ampacidades_charola_aluminio_90, charola)
+
+        # Tabla de ampacidad por (material, temperatura, es_charola) con su fuente normativa.
+        # En charola no hay columna de 60 °C: se usa la de 75 °C (Tabla 310-15(b)(20)).
+        self.tablas_ampacidad = MappingProxyType({
+            ("cobre", "60 °C", False): (self.ampacidades_cobre_60, conduit),
+            ("cobre", "75 °C", False): (self.ampacidades_cobre_75, conduit),
+            ("cobre", "90 °C", False): (self.ampacidades_cobre_90, conduit),
+            ("aluminio", "60 °C", False): (self.ampacidades_aluminio, conduit),
+            ("aluminio", "75 °C", False): (self.ampacidades_aluminio, conduit),
+            ("aluminio", "90 °C", False): (self.ampacidades_aluminio, conduit),
+            ("cobre", "60 °C", True): (self.ampacidades_charola_cobre_75, charola_60),
+            ("cobre", "75 °C", True): (self.ampacidades_charola_cobre_75, charola),
+            ("cobre", "90 °C", True): (self.ampacidades_charola_cobre_90, charola),
+            ("aluminio", "60 °C", True): (self.ampacidades_charola_aluminio_75, charola_60),
+            ("aluminio", "75 °C", True): (self.ampacidades_charola_aluminio_75, charola),
+            ("aluminio", "90 °C", True): (self.ampacidades_charola_aluminio_90, charola),
+        })
+
+        self.impedancia_cobre = _agrupar(_impedancia_cobre, TablaImpedancia)
+        self.impedancia_aluminio = _agrupar(_impedancia_aluminio, TablaImpedancia)
+        self.impedancia_charola_cobre = TablaImpedancia(_impedancia_charola_cobre)
+        self.impedancia_charola_aluminio = TablaImpedancia(_impedancia_charola_aluminio)
+
+        # Tabla 250-122 ordenada por capacidad del interruptor
+        self.calibre_tierra_fisica = TablaNOM(dict(sorted(_calibre_tierra_fisica.items())))
+        self.interruptores_comerciales = tuple(sorted(_interruptores_comerciales))
+
+        # Índices de puntos de quiebre: interruptor comercial y tierra física por interruptor
+        self.indice_interruptores = IndicePuntosQuiebre(
+            self.interruptores_comerciales, self.interruptores_comerciales, self.interruptores_comerciales[-1]
+        )
+        self.indice_tierra_fisica = IndicePuntosQuiebre(
+            self.calibre_tierra_fisica.claves, self.calibre_tierra_fisica.valores, "500"
+        )
+
+        self.calibres_ordenados = tuple(_calibres_ordenados)
+        self.indice_calibre = MappingProxyType({calibre: i for i, calibre in enumerate(self.calibres_ordenados)})
+        self.limites_caida = MappingProxyType(dict(_limites_caida))
+        self.secciones_conductores = TablaNOM(_secciones_conductores)
+        self.calibre_minimo_paralelo = _calibre_minimo_paralelo
+
+        # Tubería (Capítulo 10)
+        self.areas_conductores = _agrupar(_areas_conductores)
+        self.tabla_tuberias = _agrupar(_tabla_tuberias)
+        self.aislamientos = tuple(_aislamientos)
+        self.tipos_tuberia = tuple(_tipos_tuberia)
+
+        self.version = self._calcular_version()
+
+    def _calcular_version(self):
+        """Huella de contenido de todas las tablas del registro; cambia si se modifica cualquier valor.
+
+        Es la clave de invalidación de CacheCalculos, CacheDisco y de las huellas de
+        proyecto.Proyecto: toda tabla que lean motor_calculo, calculo_lote o tuberia debe estar aquí.
+        """
+        contenido = repr([
+            _ampacidades_cobre_60, _ampacidades_cobre_75, _ampacidades_cobre_90, _ampacidades_aluminio,
+            _ampacidades_charola_cobre_75, _ampacidades_charola_cobre_90,
+            _ampacidades_charola_aluminio_75, _ampacidades_charola_aluminio_90,
+            _impedancia_cobre, _impedancia_aluminio, _impedancia_charola_cobre, _impedancia_charola_aluminio,
+            sorted(_calibre_tierra_fisica.items()), _interruptores_comerciales, _calibres_ordenados,
+            _limites_caida, _secciones_conductores, _calibre_minimo_paralelo,
+            _areas_conductores, _tabla_tuberias, _aislamientos, _tipos_tuberia,
+        ])
+        return hashlib.sha256(contenido.encode("utf-8")).hexdigest()[:12]
+
+    def __setattr__(self, nombre, valor):
+        if hasattr(self, 'version'):
+            raise AttributeError("El registro de tablas NOM es de solo lectura")
+        super().__setattr__(nombre, valor)
+
+
+# Registro compartido, construido una sola vez por proceso
+REGISTRO = RegistroNOM()
+VERSION_TABLAS = REGISTRO.version
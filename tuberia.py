@@ -3,50 +3,15 @@ from tkinter import ttk, messagebox, font, filedialog
 import subprocess
 import sys
 from datetime import datetime
+from tablas_nom import REGISTRO
 
-# Diccionarios base actualizados
-# Áreas de conductores por tipo de aislamiento (mm²)
-areas_conductores = {
-    "THW": {
-        "14": 2.08, "12": 3.31, "10": 5.26, "8": 8.37, "6": 13.3, "4": 21.2,
-        "3": 26.7, "2": 33.6, "1": 42.4, "1/0": 53.5, "2/0": 67.4, 
-        "3/0": 85.0, "4/0": 107.2
-    },
-    "XHHW": {
-        "14": 1.97, "12": 3.12, "10": 5.03, "8": 8.09, "6": 13.0, "4": 21.1,
-        "3": 26.2, "2": 33.3, "1": 42.1, "1/0": 53.0, "2/0": 67.0,
-        "3/0": 85.0, "4/0": 107.0
-    },
-    "THHN": {
-        "14": 1.63, "12": 2.53, "10": 4.18, "8": 6.62, "6": 10.7, "4": 17.2,
-        "3": 21.2, "2": 26.7, "1": 32.7, "1/0": 41.7, "2/0": 52.6,
-        "3/0": 64.2, "4/0": 78.7
-    }
-}
-
-# Tabla de tuberías con áreas totales (mm²)
-tabla_tuberias = {
-    "EMT": {
-        "1/2": 196, "3/4": 336, "1": 558, "1 1/4": 832, 
-        "1 1/2": 1033, "2": 1809
-    },
-    "PVC": {
-        "1/2": 233, "3/4": 387, "1": 638, "1 1/4": 897, 
-        "1 1/2": 1038, "2": 1632
-    },
-    "IMC": {
-        "1/2": 243, "3/4": 408, "1": 682, "1 1/4": 987, 
-        "1 1/2": 1220, "2": 1990
-    },
-    "RMC": {
-        "1/2": 234, "3/4": 387, "1": 638, "1 1/4": 897, 
-        "1 1/2": 1038, "2": 1632
-    }
-}
+# Tablas de áreas de conductores (mm²) y tuberías (mm²) del registro NOM compartido
+areas_conductores = REGISTRO.areas_conductores
+tabla_tuberias = REGISTRO.tabla_tuberias
 
 # Tipos disponibles
-aislamientos = ["THW", "XHHW", "THHN"]
-tipos_tuberia = ["EMT", "PVC", "IMC", "RMC"]
+aislamientos = REGISTRO.aislamientos
+tipos_tuberia = REGISTRO.tipos_tuberia
 
 class CalculadoraTuberias:
     def __init__(self, root):
@@ -0,0 +1,180 @@
+# VIGILANCIA.PY - RECÁLCULO AUTOMÁTICO AL GUARDAR EL CUADRO DE CARGAS
+#
+# Revisa periódicamente la fecha de modificación del cuadro de cargas (CSV o
+# Excel). Cuando el archivo cambia, vuelve a leerlo, recalcula solo los
+# circuitos nuevos o modificados (proyecto.Proyecto) y reescribe la salida y el
+# resumen. La salida se escribe en un archivo temporal y se reemplaza al final,
+# para que nunca quede a medio escribir.
+
+import csv
+import json
+import os
+import time
+import zipfile
+from xml.etree.ElementTree import ParseError
+
+from cuadro_cargas import COLUMNAS_ENTRADA, COLUMNAS_RESULTADO, datos_desde_fila, describir_error, fila_resultado, normalizar_columna
+from motor_calculo import calcular_circuito
+from proyecto import Proyecto
+
+# Encabezados que identifican al circuito (si no hay ninguno se usa el número de fila)
+COLUMNAS_IDENTIFICADOR = ("id", "circuito", "clave", "no", "no.", "numero")
+
+# Errores de lectura de un archivo a medio guardar (un .xlsx es un zip que Excel reescribe completo)
+ERRORES_LECTURA = (OSError, ValueError, KeyError, zipfile.BadZipFile, ParseError)
+try:
+    from openpyxl.utils.exceptions import InvalidFileException
+    ERRORES_LECTURA += (InvalidFileException,)
+except ImportError:
+    pass
+
+
+def leer_cuadro(ruta, hoja=None, delimitador=","):
+    """Lee el cuadro de cargas completo: (filas, encabezados)."""
+    if ruta.lower().endswith((".xlsx", ".xlsm")):
+        from importador_excel import leer_xlsx
+
+        filas = list(leer_xlsx(ruta, hoja))
+        return filas, list(filas[0]) if filas else []
+
+    with open(ruta, encoding="utf-8-sig", newline="") as entrada:
+        lector = csv.DictReader(entrada, delimiter=delimitador)
+        return list(lector), list(lector.fieldnames or [])
+
+
+def _identificadores(filas, columnas):
+    columna = next((c for c in columnas if normalizar_columna(c) in COLUMNAS_IDENTIFICADOR), None)
+    vistos = {}
+    for numero, fila in enumerate(filas, 1):
+        identificador = str(fila.get(columna) or "").strip() if columna else ""
+        identificador = identificador or f"fila {numero}"
+        vistos[identificador] = vistos.get(identificador, 0) + 1
+        # Identificadores repetidos: se distinguen por su número de aparición
+        yield identificador if vistos[identificador] == 1 else f"{identificador} ({vistos[identificador]})"
+
+
+class VigilanteCuadro:
+    """Mantiene actualizada la salida de un cuadro de cargas mientras se edita."""
+
+    def __init__(self, entrada, salida, funcion_calculo=calcular_circuito, configuracion="", hoja=None,
+                 delimitador=",", ruta_resumen=None, procesos=1):
+        self.entrada = entrada
+        self.salida = salida
+        self.hoja = hoja
+        self.delimitador = delimitador
+        self.ruta_resumen = ruta_resumen
+        self.procesos = procesos
+        self.proyecto = Proyecto(funcion_calculo, configuracion)
+        self._filas = {}
+        self._errores_lectura = {}
+        self._ultima_modificacion = None
+
+    def recalcular(self):
+        """Lee el cuadro, recalcula los cambios y reescribe la salida; devuelve el resumen."""
+        inicio = time.perf_counter()
+        filas, columnas = leer_cuadro(self.entrada, self.hoja, self.delimitador)
+
+        circuitos = {}
+        anteriores = self._filas
+        self._filas = {}
+        self._errores_lectura = {}
+        for identificador, fila in zip(_identificadores(filas, columnas), filas):
+            self._filas[identificador] = fila
+            datos = self.proyecto.circuitos.get(identificador)
+            # Las filas idénticas a la lectura anterior no se vuelven a convertir
+            if datos is None or anteriores.get(identificador) != fila:
+                try:
+                    datos = datos_desde_fila(fila)
+                except Exception as e:
+                    self._errores_lectura[identificador] = describir_error(e)
+                    continue
+            circuitos[identificador] = datos
+
+        cambios = self.proyecto.actualizar(circuitos, self.procesos)
+        self._escribir_salida(columnas)
+
+        resumen = {
+            'archivo': self.entrada,
+            'circuitos': len(self._filas),
+            'recalculados': len(cambios['nuevos']) + len(cambios['modificados']),
+            'eliminados': len(cambios['eliminados']),
+            'sin_cambios': cambios['sin_cambios'],
+            'errores': len(self.proyecto.errores) + len(self._errores_lectura),
+            'no_cumplen_caida': sum(not r.cumple_caida for r in self.proyecto.resultados.values()),
+            'segundos': time.perf_counter() - inicio,
+        }
+        if self.ruta_resumen:
+            self._reemplazar(self.ruta_resumen, lambda archivo: json.dump(resumen, archivo, ensure_ascii=False, indent=2))
+        return resumen
+
+    def _filas_salida(self):
+        for identificador, fila in self._filas.items():
+            error = self._errores_lectura.get(identificador) or self.proyecto.errores.get(identificador, "")
+            yield fila, self.proyecto.resultados.get(identificador), error
+
+    def _escribir_salida(self, columnas):
+        from exportador_columnar import EscritorColumnar, formato_por_extension
+
+        formato = formato_por_extension(self.salida)
+        if formato:
+            temporal = self.salida + ".tmp"
+            extras = [c for c in columnas if normalizar_columna(c) not in COLUMNAS_ENTRADA]
+            with EscritorColumnar(temporal, formato, columnas_extra=extras) as escritor:
+                for fila, resultado, error in self._filas_salida():
+                    datos = None if resultado is not None else self._datos_o_nada(fila)
+                    escritor.agregar(datos, resultado, error, fila)
+            os.replace(temporal, self.salida)
+            return
+
+        def escribir(archivo):
+            escritor = csv.DictWriter(archivo, columnas + [c for c in COLUMNAS_RESULTADO if c not in columnas],
+                                      delimiter=self.delimitador, extrasaction="ignore")
+            escritor.writeheader()
+            for fila, resultado, error in self._filas_salida():
+                escritor.writerow(fila_resultado(fila, resultado, error))
+
+        self._reemplazar(self.salida, escribir, newline="")
+
+    def _datos_o_nada(self, fila):
+        try:
+            return datos_desde_fila(fila)
+        except Exception:
+            return None
+
+    @staticmethod
+    def _reemplazar(ruta, escribir, newline=None):
+        temporal = ruta + ".tmp"
+        with open(temporal, "w", encoding="utf-8", newline=newline) as archivo:
+            escribir(archivo)
+        os.replace(temporal, ruta)
+
+    def hay_cambios(self):
+        """True si el archivo de entrada se modificó desde la última revisión."""
+        try:
+            estado = os.stat(self.entrada)
+        except FileNotFoundError:
+            return False
+        modificacion = (estado.st_mtime_ns, estado.st_size)
+        if modificacion == self._ultima_modificacion:
+            return False
+        self._ultima_modificacion = modificacion
+        return True
+
+    def ejecutar(self, intervalo=0.5, al_recalcular=None, al_fallar=None):
+        """Revisa el archivo cada 'intervalo' segundos hasta interrumpir con Ctrl+C."""
+        try:
+            while True:
+                if self.hay_cambios():
+                    try:
+                        resumen = self.recalcular()
+                    except ERRORES_LECTURA as e:
+                        # Archivo a medio guardar o bloqueado por la hoja de cálculo: se reintenta
+                        self._ultima_modificacion = None
+                        if al_fallar is not None:
+                            al_fallar(e)
+                    else:
+                        if al_recalcular is not None:
+                            al_recalcular(resumen)
+                time.sleep(intervalo)
+        except KeyboardInterrupt:
+            pass